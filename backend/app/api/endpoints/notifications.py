@@ -1,26 +1,82 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 import logging
 
 from app.api import deps
+from app.core.config import settings
+from app.db.session import SessionLocal
 from app.models.user import User, UserRole
 from app.crud import notification as crud_notification
+from app.crud.student import student as crud_student
 from app.schemas.notification import NotificationCreate, NotificationResponse, NotificationMarkRead
 
 router = APIRouter()
 
 
+def _split_languages(value: Optional[str]) -> List[str]:
+    return [lang.strip() for lang in (value or "").split(",") if lang.strip()]
+
+
+def _resolve_target_languages(db: Session, notification_in: NotificationCreate) -> List[str]:
+    """Request override, then the student's preferred_languages, then the configured default."""
+    if notification_in.target_languages is not None:
+        languages = [lang.strip() for lang in notification_in.target_languages if lang and lang.strip()]
+    else:
+        student = crud_student.get_by_student_id(db, student_id=notification_in.student_id)
+        languages = _split_languages(getattr(student, "preferred_languages", None))
+        if not languages:
+            languages = _split_languages(settings.NOTIFICATION_TRANSLATION_LANGUAGES)
+    # Preserve order, drop duplicates and English (nothing to translate)
+    return [lang for lang in dict.fromkeys(languages) if lang not in ("en", "eng_Latn")]
+
+
+def _pretranslate_notification(notification_id: int, report_summary: str, languages: List[str]) -> None:
+    """Background task: translate a sent report so parents can read it without waiting."""
+    # Imported lazily so the notifications router does not pull in the ML stack at import time
+    from app.api.endpoints.translation import MAX_TRANSLATION_CHARS, translate_plain_text
+
+    # Same limit as /translate
+    report_summary = report_summary[:MAX_TRANSLATION_CHARS]
+    db = SessionLocal()
+    try:
+        for language in languages:
+            try:
+                translated = translate_plain_text(report_summary, language)
+                crud_notification.set_translation_result(
+                    db, notification_id=notification_id, language=language, translated_summary=translated
+                )
+                logging.info(f"Pre-translated notification {notification_id} to {language}")
+            except Exception as e:
+                logging.error(f"Pre-translation of notification {notification_id} to {language} failed: {str(e)}")
+                db.rollback()
+                try:
+                    crud_notification.set_translation_result(
+                        db, notification_id=notification_id, language=language, error=str(e)
+                    )
+                except Exception as store_error:
+                    logging.error(
+                        f"Could not record failed pre-translation of notification {notification_id} "
+                        f"to {language}: {store_error}"
+                    )
+                    db.rollback()
+    finally:
+        db.close()
+
+
 @router.post("/send-report", response_model=NotificationResponse)
 def send_report_to_parent(
     *,
     db: Session = Depends(deps.get_db),
     notification_in: NotificationCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Send an AI analysis report to the student/parent user.
     Only admin, teacher, or therapist can send reports.
+    The report summary is pre-translated in the background into the student's
+    preferred languages (or `target_languages`), so parents get it instantly.
     """
     if current_user.role not in [UserRole.ADMIN, UserRole.TEACHER, UserRole.THERAPIST, "admin", "teacher", "therapist"]:
         raise HTTPException(
@@ -37,7 +93,7 @@ def send_report_to_parent(
             sent_by_role=current_user.role if isinstance(current_user.role, str) else current_user.role.value,
         )
         logging.info(f"Report sent to student {notification_in.student_id} by {current_user.username}")
-        return notification
+
     except Exception as e:
         logging.error(f"Error sending report notification: {str(e)}")
         raise HTTPException(
@@ -45,17 +101,53 @@ def send_report_to_parent(
             detail=f"Failed to send report: {str(e)}"
         )
 
+    # The report is already sent; parents fall back to on-demand translation
+    # if scheduling the pre-translation fails
+    if notification.report_summary and notification.report_summary.strip():
+        try:
+            languages = _resolve_target_languages(db, notification_in)
+            if languages:
+                crud_notification.create_translation_jobs(
+                    db, notification_id=notification.id, languages=languages
+                )
+                background_tasks.add_task(
+                    _pretranslate_notification, notification.id, notification.report_summary, languages
+                )
+        except Exception as e:
+            logging.error(f"Could not schedule pre-translation of notification {notification.id}: {e}")
+            db.rollback()
+    return notification
+
 
 @router.get("/my-notifications", response_model=List[NotificationResponse])
 def get_my_notifications(
+    language: Optional[str] = None,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get all notifications for the current student user.
     The username is the student_id.
+    With `language`, the stored pre-translation (if any) is attached to each
+    notification; translations are never computed in this request.
     """
-    return crud_notification.get_by_student_id(db, student_id=current_user.username)
+    notifications = crud_notification.get_by_student_id(db, student_id=current_user.username)
+    if not language:
+        return notifications
+
+    translations = crud_notification.get_translations(
+        db, notification_ids=[n.id for n in notifications], language=language
+    )
+    results = []
+    for notification in notifications:
+        item = NotificationResponse.model_validate(notification)
+        translation = translations.get(notification.id)
+        if translation is not None:
+            item.translation_language = translation.language
+            item.translation_status = translation.status
+            item.translated_summary = translation.translated_summary
+        results.append(item)
+    return results
 
 
 @router.get("/unread-count")
@@ -1,11 +1,15 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Body
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, PrivateAttr
+import asyncio
+import hashlib
 import os
 import json
 import logging
 import re
+import time
 from datetime import date
 import httpx
 
@@ -17,10 +21,28 @@ from sqlalchemy.orm import Session
 
 from app import crud, schemas
 from app.api import deps
+from app.core import ai_summary_batches, ai_summary_jobs
+from app.core.circuit_breaker import OPEN, CircuitOpenError, llm_breaker
 from app.core.config import settings
+from app.core.http_clients import get_llm_client, llm_async_client, llm_metrics, run_on_app_loop
+from app.db.session import SessionLocal
+from app.ml import note_index
+from app.utils import goal_sections, progress_stats
+from app.utils.goal_sections import THERAPY_SECTIONS, report_goals
+from app.utils.prompt_budget import (
+    PromptItem,
+    assemble_prompt,
+    dedupe_key,
+    prompt_token_budget,
+    recency_rank,
+)
 
 router = APIRouter()
 
+# Part of the AI summary cache key: bump whenever prompt builders or section
+# post-processing change so stale cached analyses are not served.
+AI_SUMMARY_PROMPT_VERSION = "2"
+
 
 class TherapyAISummaryRequest(BaseModel):
     student_id: str  # Changed to str to accept "STU2025001" format
@@ -47,6 +69,51 @@ class TherapyAISummaryResponse(BaseModel):
     recommendations: str
     date_range: dict
 
+    # Sections that fell back to rule-based text (not serialized; such results are not cached)
+    _fallback_sections: List[str] = PrivateAttr(default_factory=list)
+
+
+class AISummaryJobResponse(BaseModel):
+    job_id: str
+    status: str  # queued / running / done / failed
+    # True when the request joined an identical job that was already in flight
+    deduplicated: bool = False
+    attempts: int = 0
+    result: Optional[TherapyAISummaryResponse] = None
+    error: Optional[str] = None
+
+
+class AISummaryBatchRequest(BaseModel):
+    # A class (Student.class_name) and/or explicit student ids ("STU2025001")
+    class_name: Optional[str] = None
+    student_ids: List[str] = []
+    from_date: Optional[date] = None
+    to_date: Optional[date] = None
+    therapy_type: Optional[str] = None
+    model: Optional[str] = "meta-llama/Llama-3.3-70B-Instruct"
+    text_gen_model: Optional[str] = "meta-llama/Llama-3.3-70B-Instruct"
+    max_length: int = 500
+    min_length: int = 100
+    use_text_generation: bool = True
+
+
+class AISummaryBatchItemResponse(BaseModel):
+    student_id: str
+    status: str  # pending / running / done / skipped / failed
+    attempts: int = 0
+    result: Optional[TherapyAISummaryResponse] = None
+    error: Optional[str] = None
+
+
+class AISummaryBatchResponse(BaseModel):
+    batch_id: str
+    class_name: Optional[str] = None
+    status: str  # queued / running / done
+    total: int
+    completed: int  # done or skipped
+    failed: int
+    items: List[AISummaryBatchItemResponse] = []
+
 
 def _get_filtered_reports_for_payload(db: Session, payload: TherapyAISummaryRequest):
     """Resolve student and filter reports by optional date/type filters."""
@@ -56,33 +123,78 @@ def _get_filtered_reports_for_payload(db: Session, payload: TherapyAISummaryRequ
     if not db_student:
         raise HTTPException(status_code=404, detail=f"Student with ID {payload.student_id} not found.")
 
-    reports = crud.therapy_report.get_by_student(db, student_id=db_student.id)
-    if not reports:
-        raise HTTPException(status_code=404, detail="No therapy reports found for student.")
-
-    filtered = []
-    for r in reports:
-        if payload.from_date and r.report_date < payload.from_date:
-            continue
-        if payload.to_date and r.report_date > payload.to_date:
-            continue
-        if payload.therapy_type and (not r.therapy_type or r.therapy_type != payload.therapy_type):
-            continue
-        filtered.append(r)
-
+    filtered = crud.therapy_report.get_for_summary(
+        db,
+        student_id=db_student.id,
+        from_date=payload.from_date,
+        to_date=payload.to_date,
+        therapy_type=payload.therapy_type,
+    )
     if not filtered:
+        if not crud.therapy_report.exists_for_student(db, student_id=db_student.id):
+            raise HTTPException(status_code=404, detail="No therapy reports found for student.")
         raise HTTPException(status_code=404, detail="No therapy reports matched the provided filters.")
-
-    filtered.sort(key=lambda r: r.report_date)
     return db_student, filtered
 
 
+def _summary_cache_key(db_student, reports, payload: TherapyAISummaryRequest) -> str:
+    """Fingerprint of everything an AI analysis depends on."""
+    fingerprint = {
+        "student": db_student.id,
+        "filters": [str(payload.from_date or ""), str(payload.to_date or ""), payload.therapy_type or ""],
+        "model": payload.model or "meta-llama/Llama-3.3-70B-Instruct",
+        "text_gen_model": payload.text_gen_model,
+        "options": [payload.max_length, payload.min_length, payload.use_text_generation],
+        "prompt_version": AI_SUMMARY_PROMPT_VERSION,
+        "reports": sorted([r.id, r.updated_at.isoformat() if r.updated_at else None] for r in reports),
+    }
+    return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _get_cached_summary(db: Session, cache_key: str) -> Optional[TherapyAISummaryResponse]:
+    if settings.AI_SUMMARY_CACHE_TTL_SECONDS <= 0:
+        return None
+    try:
+        cached = crud.ai_summary.get_cached(db, cache_key)
+    except Exception as e:
+        logging.warning(f"AI summary cache lookup failed: {e}")
+        db.rollback()
+        return None
+    if cached is None:
+        return None
+    logging.info(f"AI summary cache hit ({cache_key[:12]})")
+    return TherapyAISummaryResponse(**cached)
+
+
+def _store_cached_summary(db: Session, db_student, cache_key: str, analysis: TherapyAISummaryResponse) -> None:
+    if settings.AI_SUMMARY_CACHE_TTL_SECONDS <= 0:
+        return
+    if analysis._fallback_sections:
+        # Don't pin a degraded result (LLM outage, deadline) for the whole TTL
+        logging.info(f"Not caching AI summary with fallback sections: {', '.join(analysis._fallback_sections)}")
+        return
+    try:
+        crud.ai_summary.store(
+            db,
+            student_id=db_student.id,
+            cache_key=cache_key,
+            response=analysis.model_dump(mode="json"),
+            ttl_seconds=settings.AI_SUMMARY_CACHE_TTL_SECONDS,
+            model=analysis.model,
+            prompt_version=AI_SUMMARY_PROMPT_VERSION,
+        )
+    except Exception as e:
+        logging.warning(f"Could not store AI summary in cache: {e}")
+        db.rollback()
+
+
 
 @router.post("/", response_model=schemas.therapy_report.TherapyReport)
 def create_report(
     *,
     db: Session = Depends(deps.get_db),
     report_in: schemas.therapy_report.TherapyReportCreate,
+    background_tasks: BackgroundTasks,
     current_user: schemas.user.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Create a therapy report for a student."""
@@ -108,6 +220,19 @@ def create_report(
         # Create the report
         report = crud.therapy_report.create(db, obj_in=report_in)
         logging.info(f"Successfully created therapy report for student {report_in.student_id}")
+        # Cached AI summaries for this student no longer reflect their reports
+        # (stale entries also miss on the report-set fingerprint, so a failure here is not fatal)
+        try:
+            crud.ai_summary.invalidate_student(db, student_id=report.student_id)
+        except Exception as e:
+            logging.warning(f"Could not invalidate cached AI summaries for student {report.student_id}: {e}")
+            db.rollback()
+        try:
+            crud.therapy_progress.record_report(db, report)
+        except Exception as e:
+            logging.warning(f"Could not update progress stats for student {report.student_id}: {e}")
+            db.rollback()
+        background_tasks.add_task(_index_report_notes, report.id)
         return report
     except Exception as e:
         logging.error(f"Error creating therapy report: {str(e)}")
@@ -128,6 +253,25 @@ def list_reports_for_student(
     return crud.therapy_report.get_by_student(db, student_id=student_id)
 
 
+@router.get("/student/{student_id}/progress-stats")
+def get_progress_stats_for_student(
+    student_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: schemas.user.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Stored progress metrics and rated-level timeline per therapy type (null = all types), for dashboards."""
+    return [
+        {
+            "therapy_type": row.therapy_type or None,
+            "improvement_metrics": progress_stats.improvement_metrics(row),
+            "progress_journey": progress_stats.progress_journey(row),
+            "level_timeline": row.level_timeline,
+            "updated_at": row.updated_at,
+        }
+        for row in crud.therapy_progress.get_for_student(db, student_id)
+    ]
+
+
 @router.post("/summary/ai/test", response_model=TherapyAISummaryResponse)
 def ai_summarize_reports_test(
     payload: TherapyAISummaryRequest = Body(...),
@@ -142,7 +286,12 @@ def ai_summarize_reports_test(
         raise HTTPException(status_code=503, detail="HUGGINGFACE_API_TOKEN environment variable not set on server.")
 
     db_student, filtered = _get_filtered_reports_for_payload(db, payload)
+    cache_key = _summary_cache_key(db_student, filtered, payload)
+    cached = _get_cached_summary(db, cache_key)
+    if cached is not None:
+        return cached
     analysis = _generate_comprehensive_analysis(filtered, db_student, payload)
+    _store_cached_summary(db, db_student, cache_key, analysis)
     return analysis
 
 
@@ -171,9 +320,14 @@ def ai_summarize_reports(
     print(f"{'='*60}\n")
 
     db_student, filtered = _get_filtered_reports_for_payload(db, payload)
+    cache_key = _summary_cache_key(db_student, filtered, payload)
+    cached = _get_cached_summary(db, cache_key)
+    if cached is not None:
+        return cached
     
     # Generate comprehensive analysis based on actual data
     analysis = _generate_comprehensive_analysis(filtered, db_student, payload)
+    _store_cached_summary(db, db_student, cache_key, analysis)
     return analysis
 
 
@@ -188,43 +342,110 @@ def ai_summarize_reports_stream(
         raise HTTPException(status_code=503, detail="HUGGINGFACE_API_TOKEN environment variable not set on server.")
 
     db_student, filtered = _get_filtered_reports_for_payload(db, payload)
+    cache_key = _summary_cache_key(db_student, filtered, payload)
+    cached = _get_cached_summary(db, cache_key)
 
     def event_stream():
+        if cached is not None:
+            cached_payload = cached.model_dump(mode="json")
+            yield f"event: summary\ndata: {json.dumps({'chunk': cached.summary})}\n\n"
+            yield f"event: complete\ndata: {json.dumps(cached_payload)}\n\n"
+            return
         try:
             # `client` is kept for backward-compat function signatures.
             # We now call HF Router directly in `_run_model_completion`.
             client = None
+            deadline_at = time.monotonic() + settings.AI_REQUEST_DEADLINE_SECONDS
             model_name = payload.model or "meta-llama/Llama-3.3-70B-Instruct"
-            main_summary_prompt = _build_main_summary_prompt_with_fewshot(filtered, db_student)
+            rolling = None
+            if _rolling_summary_applies(payload):
+                rolling = _prepare_rolling_summary(db_student, filtered, payload, model_name)
+            if rolling and rolling["summary"]:
+                # Nothing new since the checkpoint
+                main_summary_prompt = None
+                cached_main_summary = rolling["summary"]
+            else:
+                main_summary_prompt = (
+                    rolling["prompt"] if rolling
+                    else _build_main_summary_prompt_with_fewshot(filtered, db_student, prompt_token_budget(model_name))
+                )
+                summary_key = _section_cache_key(main_summary_prompt, model_name, 2000, 0.25)
+                cached_main_summary = _load_cached_sections([summary_key]).get(summary_key)
+            if cached_main_summary is not None:
+                summary_chunks = iter([cached_main_summary])
+            else:
+                summary_chunks = _stream_model_completion(
+                    client=client,
+                    prompt=main_summary_prompt,
+                    model=model_name,
+                    max_tokens=2000,
+                    temperature=0.25,
+                    deadline_at=deadline_at,
+                )
 
             streamed_summary_parts = []
-            for chunk in _stream_model_completion(
-                client=client,
-                prompt=main_summary_prompt,
-                model=model_name,
-                max_tokens=2000,
-                temperature=0.25,
-            ):
-                if not chunk:
-                    continue
-                streamed_summary_parts.append(chunk)
-                yield f"event: summary\ndata: {json.dumps({'chunk': chunk})}\n\n"
-
-            main_summary = "".join(streamed_summary_parts).strip()
+            stream_interrupted = False
+            summary_fell_back = False
+            try:
+                for chunk in summary_chunks:
+                    if not chunk:
+                        continue
+                    streamed_summary_parts.append(chunk)
+                    yield f"event: summary\ndata: {json.dumps({'chunk': chunk})}\n\n"
+            except Exception as stream_error:
+                # The client already shows a partial summary; replace it with a complete one
+                logging.warning(f"Summary stream interrupted after {len(streamed_summary_parts)} chunks: {stream_error}")
+                stream_interrupted = True
+
+            if stream_interrupted:
+                try:
+                    main_summary = _extract_generated_text(_run_model_completion(
+                        client=client,
+                        prompt=main_summary_prompt,
+                        model=model_name,
+                        max_tokens=2000,
+                        temperature=0.25,
+                        deadline_at=deadline_at,
+                    ))
+                except Exception as e:
+                    logging.warning(f"Non-streaming retry failed, using structured fallback: {e}")
+                    main_summary = _build_structured_summary_fallback(filtered, db_student)
+                    summary_fell_back = True
+                if not _is_low_quality_summary(main_summary):
+                    yield f"event: summary_replace\ndata: {json.dumps({'summary': main_summary})}\n\n"
+            else:
+                main_summary = "".join(streamed_summary_parts).strip()
             if _is_low_quality_summary(main_summary):
                 logging.warning("Streamed main summary quality check failed; using structured fallback formatter")
                 main_summary = _build_structured_summary_fallback(filtered, db_student)
+                summary_fell_back = True
                 yield f"event: summary_replace\ndata: {json.dumps({'summary': main_summary})}\n\n"
+            elif main_summary_prompt is not None:
+                if cached_main_summary is None:
+                    _store_cached_section("summary", summary_key, model_name, main_summary)
+                if rolling:
+                    _save_rolling_summary(rolling["checkpoint"], main_summary, model_name)
 
             analysis = _generate_comprehensive_analysis(
                 filtered,
                 db_student,
                 payload,
                 precomputed_main_summary=main_summary,
+                deadline_at=deadline_at,
             )
+            if summary_fell_back:
+                analysis._fallback_sections.append("summary")
+            if getattr(main_summary_prompt, "truncated", False):
+                analysis.truncated = True
 
             analysis_payload = analysis.dict() if hasattr(analysis, "dict") else analysis
             yield f"event: complete\ndata: {json.dumps(analysis_payload)}\n\n"
+
+            cache_db = SessionLocal()
+            try:
+                _store_cached_summary(cache_db, db_student, cache_key, analysis)
+            finally:
+                cache_db.close()
         except Exception as e:
             logging.exception("AI summary stream failed")
             yield f"event: error\ndata: {json.dumps({'message': str(e)})}\n\n"
@@ -240,12 +461,207 @@ def ai_summarize_reports_stream(
     )
 
 
-def _generate_comprehensive_analysis(reports, student, payload, precomputed_main_summary: Optional[str] = None):
-    """Generate a comprehensive AI-powered analysis based on actual therapy report data."""
-    client = None
-    
+def _job_response(job, deduplicated=False) -> AISummaryJobResponse:
+    return AISummaryJobResponse(
+        job_id=job.id,
+        status=job.status,
+        deduplicated=deduplicated,
+        attempts=job.attempts or 0,
+        result=job.result if job.status == "done" else None,
+        error=job.error,
+    )
+
+
+def _load_job_snapshot(job_id: str) -> Optional[dict]:
+    db = SessionLocal()
+    try:
+        job = crud.ai_summary.get_job(db, job_id)
+        return _job_response(job).model_dump(mode="json") if job else None
+    finally:
+        db.close()
+
+
+@router.post("/summary/ai/jobs", response_model=AISummaryJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_ai_summary_job(
+    payload: TherapyAISummaryRequest = Body(...),
+    db: Session = Depends(deps.get_db),
+    current_user: schemas.user.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Queue an AI analysis and return its job id immediately.
+
+    Identical requests (same student, filters, reports and model) that are
+    already queued or running return that job instead of starting another one.
+    Poll GET /summary/ai/jobs/{job_id} or subscribe to /summary/ai/jobs/{job_id}/events.
+    """
+    if not settings.HUGGINGFACE_API_TOKEN:
+        raise HTTPException(status_code=503, detail="HUGGINGFACE_API_TOKEN environment variable not set on server.")
+
+    db_student, filtered = _get_filtered_reports_for_payload(db, payload)
+    cache_key = _summary_cache_key(db_student, filtered, payload)
+    cached = _get_cached_summary(db, cache_key)
+    job, created = crud.ai_summary.create_job(
+        db,
+        student_id=db_student.id,
+        cache_key=cache_key,
+        request=payload.model_dump(mode="json"),
+        requested_by_user_id=current_user.id,
+        status="done" if cached is not None else "queued",
+        result=cached.model_dump(mode="json") if cached is not None else None,
+    )
+    if created and job.status == "queued":
+        ai_summary_jobs.enqueue(job.id)
+    return _job_response(job, deduplicated=not created)
+
+
+@router.get("/summary/ai/jobs/{job_id}", response_model=AISummaryJobResponse)
+def get_ai_summary_job(
+    job_id: str,
+    db: Session = Depends(deps.get_db),
+    current_user: schemas.user.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Status of an AI analysis job; `result` is set once it is done."""
+    job = crud.ai_summary.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="AI summary job not found.")
+    return _job_response(job)
+
+
+@router.get("/summary/ai/jobs/{job_id}/events")
+def ai_summary_job_events(
+    job_id: str,
+    db: Session = Depends(deps.get_db),
+    current_user: schemas.user.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """SSE feed for a job: `status` on every change, then `complete` (analysis) or `error`."""
+    if not crud.ai_summary.get_job(db, job_id):
+        raise HTTPException(status_code=404, detail="AI summary job not found.")
+
+    async def event_stream():
+        last_status = None
+        idle_polls = 0
+        while True:
+            snapshot = await run_in_threadpool(_load_job_snapshot, job_id)
+            if snapshot is None:
+                yield f"event: error\ndata: {json.dumps({'message': 'AI summary job not found.'})}\n\n"
+                return
+            if snapshot["status"] != last_status:
+                last_status = snapshot["status"]
+                idle_polls = 0
+                yield f"event: status\ndata: {json.dumps({'status': last_status, 'attempts': snapshot['attempts']})}\n\n"
+            if last_status == "done":
+                yield f"event: complete\ndata: {json.dumps(snapshot['result'])}\n\n"
+                return
+            if last_status == "failed":
+                yield f"event: error\ndata: {json.dumps({'message': snapshot['error'] or 'AI summary job failed'})}\n\n"
+                return
+            idle_polls += 1
+            if idle_polls * settings.AI_SUMMARY_JOB_POLL_SECONDS >= 15:
+                # Comment line keeps proxies from closing an idle stream
+                idle_polls = 0
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(settings.AI_SUMMARY_JOB_POLL_SECONDS)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+def _batch_response(db: Session, batch, include_results: bool = False) -> AISummaryBatchResponse:
+    return AISummaryBatchResponse(
+        batch_id=batch.id,
+        class_name=batch.class_name,
+        status=batch.status,
+        total=batch.total,
+        completed=batch.completed,
+        failed=batch.failed,
+        items=[
+            AISummaryBatchItemResponse(
+                student_id=item.student_code,
+                status=item.status,
+                attempts=item.attempts or 0,
+                result=item.result if include_results and item.status == "done" else None,
+                error=item.error,
+            )
+            for item in crud.ai_summary.get_batch_items(db, batch.id)
+        ],
+    )
+
+
+@router.post("/summary/ai/batches", response_model=AISummaryBatchResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_ai_summary_batch(
+    payload: AISummaryBatchRequest = Body(...),
+    db: Session = Depends(deps.get_db),
+    current_user: schemas.user.User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """Queue AI analyses for a whole class (and/or listed students) over one date range (admin only).
+
+    Students are generated in the background with bounded concurrency and a
+    rate limit on router calls; poll GET /summary/ai/batches/{batch_id}.
+    """
+    if not settings.HUGGINGFACE_API_TOKEN:
+        raise HTTPException(status_code=503, detail="HUGGINGFACE_API_TOKEN environment variable not set on server.")
+    if not payload.class_name and not payload.student_ids:
+        raise HTTPException(status_code=400, detail="Provide class_name or student_ids.")
+
+    students, missing = ai_summary_batches.resolve_students(
+        db, class_name=payload.class_name, student_codes=payload.student_ids
+    )
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Students not found: {', '.join(missing)}")
+    if not students:
+        raise HTTPException(status_code=404, detail=f"No students found in class {payload.class_name}.")
+
+    batch = crud.ai_summary.create_batch(
+        db,
+        students=students,
+        request=payload.model_dump(mode="json", exclude={"class_name", "student_ids"}),
+        class_name=payload.class_name,
+        requested_by_user_id=current_user.id,
+    )
+    ai_summary_batches.start_batch(batch.id)
+    return _batch_response(db, batch)
+
+
+@router.get("/summary/ai/batches/{batch_id}", response_model=AISummaryBatchResponse)
+def get_ai_summary_batch(
+    batch_id: str,
+    include_results: bool = False,
+    db: Session = Depends(deps.get_db),
+    current_user: schemas.user.User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """Progress of a batch with per-student status; `include_results=true` adds the finished analyses."""
+    batch = crud.ai_summary.get_batch(db, batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="AI summary batch not found.")
+    return _batch_response(db, batch, include_results=include_results)
+
+
+@router.get("/summary/ai/metrics")
+def ai_summary_http_metrics(
+    current_user: schemas.user.User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """Connection-pool counters for the LLM HTTP clients and the circuit breaker state (admin only)."""
+    return {**llm_metrics(), "circuit_breaker": llm_breaker.snapshot()}
+
+
+def _generate_comprehensive_analysis(
+    reports, student, payload, precomputed_main_summary: Optional[str] = None, deadline_at: Optional[float] = None
+):
+    """Generate a comprehensive AI-powered analysis based on actual therapy report data.
+
+    LLM calls stop at `deadline_at` (`time.monotonic()`; default AI_REQUEST_DEADLINE_SECONDS
+    from now) and while the LLM circuit breaker is open; those sections use the baseline.
+    """
+    if deadline_at is None:
+        deadline_at = time.monotonic() + settings.AI_REQUEST_DEADLINE_SECONDS
     # Calculate real improvement metrics from actual data
-    improvement_metrics = _calculate_improvement_metrics(reports)
+    improvement_metrics = _calculate_improvement_metrics(reports, _stored_progress_stats(student, reports, payload))
     
     # Date range info
     date_range = {
@@ -263,81 +679,99 @@ def _generate_comprehensive_analysis(reports, student, payload, precomputed_main
     baseline = _generate_fallback_analysis(reports, student, payload, improvement_metrics, date_range)
 
     model_name = payload.model or "meta-llama/Llama-3.3-70B-Instruct"
+    rolling = None
+    if not precomputed_main_summary and _rolling_summary_applies(payload):
+        rolling = _prepare_rolling_summary(student, reports, payload, model_name)
+        if rolling["summary"]:
+            precomputed_main_summary = rolling["summary"]
+    section_specs = _build_section_specs(
+        reports,
+        student,
+        start_reports,
+        end_reports,
+        improvement_metrics,
+        not precomputed_main_summary,
+        main_summary_prompt=rolling["prompt"] if rolling else None,
+        model_name=model_name,
+    )
+    # Honest truncation flag: did any prompt used for this analysis leave report content out?
+    truncated = any(getattr(spec[0], "truncated", False) for spec in section_specs.values())
+    section_keys = {
+        name: _section_cache_key(prompt, model_name, max_tokens, temperature)
+        for name, (prompt, max_tokens, temperature, _) in section_specs.items()
+    }
+    # Sections whose rendered prompt is unchanged (e.g. the start-date analysis
+    # after a new session is added) are reused; only the rest hit the LLM.
+    cached_outputs = _load_cached_sections(list(section_keys.values()))
+    sections = {name: cached_outputs[key] for name, key in section_keys.items() if key in cached_outputs}
+    pending_specs = {name: spec for name, spec in section_specs.items() if name not in sections}
+    if sections:
+        logging.info(f"Reusing cached AI sections: {', '.join(sections)}")
+
+    if pending_specs:
+        # All sections are independent LLM calls: run them concurrently, each with its
+        # own deadline, so the request takes about as long as the slowest section.
+        generated = run_on_app_loop(_generate_sections_concurrently, pending_specs, model_name, deadline_at)
+        sections.update(generated)
+        for name, text in generated.items():
+            if isinstance(text, BaseException) or (name == "summary" and _is_low_quality_summary(text)):
+                continue
+            _store_cached_section(name, section_keys[name], model_name, text)
+    summary_text = sections.get("summary")
+    if rolling and rolling["prompt"] and isinstance(summary_text, str) and not _is_low_quality_summary(summary_text):
+        _save_rolling_summary(rolling["checkpoint"], summary_text, model_name)
+
+    fallback_sections = []
 
     # 1. Brief Overview - AI analyzes all reports for general progress
-    try:
-        overview_prompt = _build_overview_prompt_with_fewshot(reports, student)
-        overview_result = _run_model_completion(
-            client=client,
-            prompt=overview_prompt,
-            model=model_name,
-            max_tokens=300,
-            temperature=0.7
-        )
-        brief_overview = _extract_generated_text(overview_result)
-    except Exception as e:
-        logging.warning(f"Brief overview generation failed, using baseline: {e}")
+    brief_overview = sections["brief_overview"]
+    if isinstance(brief_overview, BaseException):
+        fallback_sections.append("brief_overview")
+        logging.warning(f"Brief overview generation failed, using baseline: {_describe_section_error(brief_overview)}")
         brief_overview = baseline.brief_overview
 
     # 2. Start Date Analysis - AI analyzes initial reports
-    try:
-        start_prompt = _build_start_analysis_prompt_with_fewshot(start_reports, student)
-        start_result = _run_model_completion(
-            client=client,
-            prompt=start_prompt,
-            model=model_name,
-            max_tokens=350,
-            temperature=0.7
-        )
-        start_analysis = _extract_generated_text(start_result)
-    except Exception as e:
-        logging.warning(f"Start-date analysis generation failed, using baseline: {e}")
+    start_analysis = sections["start_date_analysis"]
+    if isinstance(start_analysis, BaseException):
+        fallback_sections.append("start_date_analysis")
+        logging.warning(f"Start-date analysis generation failed, using baseline: {_describe_section_error(start_analysis)}")
         start_analysis = baseline.start_date_analysis
 
-    # 3. Current Status Analysis - Enhanced with text generation for detailed insights
-    end_analysis = _generate_enhanced_current_status_llama(client, end_reports, student, payload)
+    # 3. Current Status Analysis - recent sessions only
+    end_analysis = sections["end_date_analysis"]
+    if isinstance(end_analysis, BaseException):
+        fallback_sections.append("end_date_analysis")
+        logging.warning(f"Llama current status failed: {_describe_section_error(end_analysis)}, using fallback")
+        end_analysis = _build_basic_current_status(end_reports, student)
 
     # 4. Recommendations - AI generates based on progress patterns
-    try:
-        recommendations_prompt = _build_recommendations_prompt_with_fewshot(reports, improvement_metrics, student)
-        rec_result = _run_model_completion(
-            client=client,
-            prompt=recommendations_prompt,
-            model=model_name,
-            max_tokens=400,
-            temperature=0.7
-        )
-        recommendations = _extract_generated_text(rec_result)
-    except Exception as e:
-        logging.warning(f"Recommendations generation failed, using baseline: {e}")
+    recommendations = sections["recommendations"]
+    if isinstance(recommendations, BaseException):
+        fallback_sections.append("recommendations")
+        logging.warning(f"Recommendations generation failed, using baseline: {_describe_section_error(recommendations)}")
         recommendations = baseline.recommendations
 
     # 5. Main Summary - AI analyzes all report content
     if precomputed_main_summary:
         main_summary = precomputed_main_summary
     else:
-        try:
-            main_summary_prompt = _build_main_summary_prompt_with_fewshot(reports, student)
-            main_result = _run_model_completion(
-                client=client,
-                prompt=main_summary_prompt,
-                model=model_name,
-                max_tokens=2000,  # Large enough for detailed clinical paragraphs per section
-                temperature=0.25  # Low temperature for faithful, data-grounded output
+        main_summary = sections["summary"]
+        if isinstance(main_summary, BaseException):
+            fallback_sections.append("summary")
+            logging.warning(
+                f"Main summary generation failed, using structured report-based fallback: {_describe_section_error(main_summary)}"
             )
-            main_summary = _extract_generated_text(main_result)
-            if _is_low_quality_summary(main_summary):
-                logging.warning("Main summary quality check failed; using structured fallback formatter")
-                main_summary = _build_structured_summary_fallback(reports, student)
-        except Exception as e:
-            logging.warning(f"Main summary generation failed, using structured report-based fallback: {e}")
+            main_summary = _build_structured_summary_fallback(reports, student)
+        elif _is_low_quality_summary(main_summary):
+            fallback_sections.append("summary")
+            logging.warning("Main summary quality check failed; using structured fallback formatter")
             main_summary = _build_structured_summary_fallback(reports, student)
     
-    return TherapyAISummaryResponse(
+    response = TherapyAISummaryResponse(
         student_id=payload.student_id,
         model=payload.model or "meta-llama/Llama-3.3-70B-Instruct",
         used_reports=len(reports),
-        truncated=False,
+        truncated=truncated,
         summary=main_summary,
         brief_overview=brief_overview,
         start_date_analysis=start_analysis,
@@ -346,6 +780,240 @@ def _generate_comprehensive_analysis(reports, student, payload, precomputed_main
         recommendations=recommendations,
         date_range=date_range
     )
+    response._fallback_sections = fallback_sections
+    return response
+
+
+def _describe_section_error(error):
+    if isinstance(error, asyncio.TimeoutError):
+        return "deadline exceeded"
+    if isinstance(error, CircuitOpenError):
+        return "LLM circuit breaker open"
+    return error
+
+
+def _build_section_specs(
+    reports,
+    student,
+    start_reports,
+    end_reports,
+    improvement_metrics,
+    include_main_summary=True,
+    main_summary_prompt=None,
+    model_name=None,
+):
+    """Rendered prompt and generation settings per AI section.
+
+    Prompts are filled up to the model's token budget (`prompt.truncated` tells
+    whether report content was left out). `main_summary_prompt` replaces the
+    full-history main summary prompt (rolling summary updates). Returns
+    {section name: (prompt, max_tokens, temperature, deadline seconds)}.
+    """
+    section_deadline = settings.AI_SECTION_DEADLINE_SECONDS
+    budget = prompt_token_budget(model_name)
+    specs = {
+        "brief_overview": (_build_overview_prompt_with_fewshot(reports, student, budget), 300, 0.7, section_deadline),
+        "start_date_analysis": (
+            _build_start_analysis_prompt_with_fewshot(start_reports, student, budget), 350, 0.7, section_deadline
+        ),
+        "end_date_analysis": (
+            _build_current_status_prompt_with_fewshot(end_reports, student, budget), 350, 0.3, section_deadline
+        ),
+        "recommendations": (
+            _build_recommendations_prompt_with_fewshot(reports, improvement_metrics, student, budget), 400, 0.7,
+            section_deadline,
+        ),
+    }
+    if include_main_summary:
+        # Large enough for detailed clinical paragraphs per section; low temperature
+        # for faithful, data-grounded output
+        specs["summary"] = (
+            main_summary_prompt or _build_main_summary_prompt_with_fewshot(reports, student, budget), 2000, 0.25,
+            settings.AI_MAIN_SUMMARY_DEADLINE_SECONDS,
+        )
+    return specs
+
+
+async def _generate_sections_concurrently(section_specs, model_name, deadline_at=None):
+    """Run the independent AI section calls concurrently.
+
+    `section_specs` is the output of `_build_section_specs` (or a subset of it).
+    Returns {section name: generated text or the exception that section raised};
+    a section that misses its deadline (or the request's `deadline_at`) yields
+    `asyncio.TimeoutError`. If the LLM circuit breaker opens meanwhile, the
+    sections still waiting are abandoned with `CircuitOpenError`.
+    """
+    async def generate(http_client, prompt, max_tokens, temperature, deadline):
+        remaining = _remaining_seconds(deadline_at)
+        if remaining is not None:
+            if remaining < 1:
+                raise asyncio.TimeoutError("AI summary request deadline exceeded")
+            deadline = min(deadline, remaining)
+        with llm_breaker.guard():
+            result = await asyncio.wait_for(
+                _run_model_completion_async(http_client, prompt, model_name, max_tokens, temperature),
+                timeout=deadline,
+            )
+        return _extract_generated_text(result)
+
+    async with llm_async_client() as http_client:
+        tasks = {
+            name: asyncio.ensure_future(generate(http_client, *spec)) for name, spec in section_specs.items()
+        }
+        pending = set(tasks.values())
+        while pending:
+            _, pending = await asyncio.wait(pending, timeout=0.5)
+            if pending and llm_breaker.state == OPEN:
+                logging.warning(f"LLM circuit opened; abandoning {len(pending)} pending AI section(s)")
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                break
+    return {
+        name: CircuitOpenError("LLM circuit opened while waiting") if task.cancelled()
+        else (task.exception() or task.result())
+        for name, task in tasks.items()
+    }
+
+
+def _section_cache_key(prompt, model, max_tokens, temperature) -> str:
+    material = json.dumps([model, max_tokens, temperature, prompt], ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _load_cached_sections(prompt_hashes) -> dict:
+    if settings.AI_SECTION_CACHE_TTL_SECONDS <= 0 or not prompt_hashes:
+        return {}
+    db = SessionLocal()
+    try:
+        return crud.ai_summary.get_sections(db, prompt_hashes)
+    except Exception as e:
+        logging.warning(f"AI section cache lookup failed: {e}")
+        return {}
+    finally:
+        db.close()
+
+
+def _store_cached_section(section, prompt_hash, model, output) -> None:
+    if settings.AI_SECTION_CACHE_TTL_SECONDS <= 0 or not output:
+        return
+    db = SessionLocal()
+    try:
+        crud.ai_summary.store_section(
+            db,
+            prompt_hash=prompt_hash,
+            section=section,
+            output=output,
+            ttl_seconds=settings.AI_SECTION_CACHE_TTL_SECONDS,
+            model=model,
+        )
+    except Exception as e:
+        logging.warning(f"Could not store AI section {section} in cache: {e}")
+    finally:
+        db.close()
+
+
+def _cached_model_completion(section, client, prompt, model, max_tokens, temperature):
+    """`_run_model_completion` + `_extract_generated_text`, memoized per rendered prompt."""
+    prompt_hash = _section_cache_key(prompt, model, max_tokens, temperature)
+    cached = _load_cached_sections([prompt_hash]).get(prompt_hash)
+    if cached is not None:
+        return cached
+    result = _run_model_completion(
+        client=client,
+        prompt=prompt,
+        model=model,
+        max_tokens=max_tokens,
+        temperature=temperature,
+    )
+    text = _extract_generated_text(result)
+    _store_cached_section(section, prompt_hash, model, text)
+    return text
+
+
+def _rolling_summary_applies(payload) -> bool:
+    """Rolling summaries cover a student's whole history, so date-windowed requests don't use them."""
+    return settings.AI_ROLLING_SUMMARY_ENABLED and not payload.from_date and not payload.to_date
+
+
+def _prepare_rolling_summary(student, reports, payload, model_name):
+    """Plan the main summary from the student's rolling checkpoint.
+
+    Returns {"summary", "prompt", "checkpoint"}: `summary` is the stored text when
+    no report was added or edited since the checkpoint (no LLM call needed);
+    otherwise `prompt` folds only the new reports into the previous summary, or
+    covers the full history when there is no usable checkpoint. `checkpoint` is
+    handed to `_save_rolling_summary` once the model output is accepted.
+    """
+    therapy_type = payload.therapy_type or ""
+    db = SessionLocal()
+    try:
+        entry = crud.ai_summary.get_rolling(db, student.id, therapy_type)
+    except Exception as e:
+        logging.warning(f"Rolling summary lookup failed: {e}")
+        entry = None
+    finally:
+        db.close()
+
+    updated_ats = [r.updated_at for r in reports if r.updated_at]
+    checkpoint = {
+        "student_id": student.id,
+        "therapy_type": therapy_type,
+        "last_report_id": max(r.id for r in reports),
+        "report_count": len(reports),
+        "last_report_updated_at": max(updated_ats) if updated_ats else None,
+    }
+    budget = prompt_token_budget(model_name)
+
+    def full_history():
+        # Only built when the checkpoint can't be used
+        return {
+            "summary": None,
+            "prompt": _build_main_summary_prompt_with_fewshot(reports, student, budget),
+            "checkpoint": checkpoint,
+        }
+
+    if entry is None or entry.model != model_name or entry.prompt_version != AI_SUMMARY_PROMPT_VERSION:
+        return full_history()
+
+    folded = [r for r in reports if r.id <= entry.last_report_id]
+    new_reports = [r for r in reports if r.id > entry.last_report_id]
+    edited = entry.last_report_updated_at is not None and any(
+        r.updated_at and r.updated_at > entry.last_report_updated_at for r in folded
+    )
+    if len(folded) != entry.report_count or edited:
+        logging.info(f"Rolling summary for student {student.id} is stale (reports edited or removed); rebuilding")
+        return full_history()
+    if not new_reports:
+        return {"summary": entry.summary, "prompt": None, "checkpoint": checkpoint}
+    if len(new_reports) > settings.AI_ROLLING_SUMMARY_MAX_NEW_REPORTS:
+        return full_history()
+
+    logging.info(
+        f"Rolling summary for student {student.id}: folding {len(new_reports)} new report(s) "
+        f"into a summary of {entry.report_count}"
+    )
+    return {
+        "summary": None,
+        "prompt": _build_rolling_update_prompt(entry.summary, new_reports, student, len(reports), budget),
+        "checkpoint": checkpoint,
+    }
+
+
+def _save_rolling_summary(checkpoint, summary, model_name) -> None:
+    db = SessionLocal()
+    try:
+        crud.ai_summary.save_rolling(
+            db,
+            summary=summary,
+            model=model_name,
+            prompt_version=AI_SUMMARY_PROMPT_VERSION,
+            **checkpoint,
+        )
+    except Exception as e:
+        logging.warning(f"Could not save rolling summary checkpoint: {e}")
+    finally:
+        db.close()
 
 
 def _extract_summary_text(result):
@@ -394,13 +1062,8 @@ def _extract_generated_text(result):
     return str(result)[:1000]
 
 
-def _run_model_completion(client, prompt, model, max_tokens, temperature):
-    """Run chat completion via Hugging Face Router (OpenAI-compatible endpoint).
-
-    Why: `huggingface_hub` <=0.24.x still targets `api-inference.huggingface.co` for model calls,
-    which now returns 410 Gone. The router endpoint is the supported replacement.
-    """
-
+def _router_chat_request(prompt, model, max_tokens, temperature, stream=False):
+    """Build (url, headers, body) for an HF Router chat completion."""
     base = getattr(settings, "HUGGINGFACE_BASE_URL", "https://router.huggingface.co") or "https://router.huggingface.co"
     base = base.rstrip("/")
     if base.endswith("/v1"):
@@ -418,29 +1081,107 @@ def _run_model_completion(client, prompt, model, max_tokens, temperature):
         "messages": [{"role": "user", "content": prompt}],
         "max_tokens": max_tokens,
         "temperature": temperature,
-        "stream": False,
+        "stream": stream,
     }
+    return url, headers, body
+
+
+def _run_model_completion(client, prompt, model, max_tokens, temperature, deadline_at=None):
+    """Run chat completion via Hugging Face Router (OpenAI-compatible endpoint).
+
+    Why: `huggingface_hub` <=0.24.x still targets `api-inference.huggingface.co` for model calls,
+    which now returns 410 Gone. The router endpoint is the supported replacement.
 
-    # Keep timeouts bounded so API failures degrade gracefully to fallbacks.
-    timeout = httpx.Timeout(60.0, connect=10.0)
-    with httpx.Client(timeout=timeout) as http_client:
-        resp = http_client.post(url, headers=headers, json=body)
+    Raises `CircuitOpenError` without calling the router while the LLM circuit
+    breaker is open, and `asyncio.TimeoutError` once `deadline_at` (monotonic)
+    has passed.
+    """
+    url, headers, body = _router_chat_request(prompt, model, max_tokens, temperature)
+    timeout = _deadline_timeout(deadline_at)
+
+    # Pooled keep-alive client; bounded timeouts (LLM_TIMEOUT_SECONDS) so API
+    # failures degrade gracefully to fallbacks.
+    with llm_breaker.guard():
+        resp = get_llm_client().post(url, headers=headers, json=body, **timeout)
         resp.raise_for_status()
         return resp.json()
 
 
-def _stream_model_completion(client, prompt, model, max_tokens, temperature):
-    """Yield text chunks for progressive UI updates.
+def _remaining_seconds(deadline_at):
+    """Seconds left before a request deadline (`time.monotonic()` based); None without one."""
+    return None if deadline_at is None else deadline_at - time.monotonic()
+
+
+def _deadline_timeout(deadline_at) -> dict:
+    """httpx `timeout=` override that keeps a call within the request deadline."""
+    remaining = _remaining_seconds(deadline_at)
+    if remaining is None:
+        return {}
+    if remaining < 1:
+        raise asyncio.TimeoutError("AI summary request deadline exceeded")
+    return {"timeout": httpx.Timeout(
+        min(settings.LLM_TIMEOUT_SECONDS, remaining),
+        connect=min(settings.LLM_CONNECT_TIMEOUT_SECONDS, remaining),
+    )}
+
+
+async def _run_model_completion_async(http_client, prompt, model, max_tokens, temperature):
+    """Async variant of `_run_model_completion` on a shared `httpx.AsyncClient`."""
+    url, headers, body = _router_chat_request(prompt, model, max_tokens, temperature)
+    resp = await http_client.post(url, headers=headers, json=body)
+    resp.raise_for_status()
+    return resp.json()
 
-    Router streaming is possible, but to keep things robust and dependency-free,
-    we do a single completion request and chunk the result.
+
+def _stream_model_completion(client, prompt, model, max_tokens, temperature, deadline_at=None):
+    """Yield text deltas as the router generates them (`stream: true`, SSE).
+
+    If the streaming request fails before the first delta, falls back to a single
+    non-streaming completion delivered in small chunks. Errors after the first
+    delta are raised to the caller, which already holds the partial text. The
+    circuit breaker judges the stream by its time to first token.
     """
+    url, headers, body = _router_chat_request(prompt, model, max_tokens, temperature, stream=True)
+    timeout = _deadline_timeout(deadline_at)
+    started = time.monotonic()
+    received_any = False
+    try:
+        with llm_breaker.guard() as call, get_llm_client().stream("POST", url, headers=headers, json=body, **timeout) as resp:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                if not line or not line.startswith("data:"):
+                    continue  # blank separators, ": keep-alive" comments, event: lines
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                except ValueError:
+                    continue
+                if isinstance(chunk, dict) and chunk.get("error"):
+                    raise RuntimeError(f"Router stream error: {chunk['error']}")
+                text = _extract_stream_chunk_text(chunk)
+                if text:
+                    if not received_any:
+                        call.responded()
+                        logging.info(f"AI summary time-to-first-token: {time.monotonic() - started:.2f}s")
+                        received_any = True
+                    yield text
+        return
+    except (CircuitOpenError, asyncio.TimeoutError):
+        raise
+    except Exception as e:
+        if received_any:
+            raise
+        logging.warning(f"Streaming completion failed before first token, using non-streaming request: {e}")
+
     result = _run_model_completion(
         client=client,
         prompt=prompt,
         model=model,
         max_tokens=max_tokens,
         temperature=temperature,
+        deadline_at=deadline_at,
     )
     full_text = _extract_generated_text(result)
     for piece in _chunk_text_for_streaming(full_text):
@@ -506,44 +1247,6 @@ def _build_structured_summary_fallback(reports, student):
     """Build a section-based clinical summary from report content when AI main summary fails."""
     therapy_label = reports[0].therapy_type if reports and reports[0].therapy_type else "Therapy"
 
-    therapy_sections = {
-        "Speech Therapy": [
-            "Receptive Language Skills (Comprehension)",
-            "Expressive Language Skills",
-            "Oral Motor & Oral Placement Therapy (OPT) Goals",
-            "Pragmatic Language Skills (Social Communication)",
-            "Narrative Skills",
-        ],
-        "Behavioral Therapy": [
-            "Behavior Regulation & Self-Control",
-            "Attention, Compliance & Task Engagement",
-            "Emotional Regulation Skills",
-            "Social Behavior & Interaction Skills",
-            "Adaptive Behavior & Functional Skills",
-        ],
-        "Cognitive Therapy": [
-            "Attention & Concentration Skills",
-            "Memory & Recall Skills",
-            "Problem Solving & Reasoning Skills",
-            "Executive Functioning Skills",
-            "Cognitive Flexibility & Processing Skills",
-        ],
-        "Occupational Therapy": [
-            "Fine Motor Skills",
-            "Sensory Processing & Integration",
-            "Visual-Motor Integration Skills",
-            "Activities of Daily Living (ADL)",
-            "Handwriting & Pre-Academic Skills",
-        ],
-        "Physical Therapy": [
-            "Gross Motor Skills",
-            "Balance & Postural Control",
-            "Strength & Endurance",
-            "Coordination & Motor Planning",
-            "Functional Mobility Skills",
-        ],
-    }
-
     def _clean_text(text):
         if not text:
             return ""
@@ -581,7 +1284,7 @@ def _build_structured_summary_fallback(reports, student):
 
         return sentence_1
 
-    ordered_titles = therapy_sections.get(therapy_label, [])
+    ordered_titles = THERAPY_SECTIONS.get(therapy_label, [])
     extracted_titles = _extract_section_titles(reports)
     if not ordered_titles:
         ordered_titles = extracted_titles
@@ -675,7 +1378,7 @@ def _build_overview_prompt(reports, student):
         prompt += f"Progress Level: {report.progress_level or 'Not rated'}\n"
         if report.progress_notes:
             prompt += f"Detailed Notes: {report.progress_notes}\n"
-        goals_text = _goals_to_readable_text(report.goals_achieved)
+        goals_text = _goals_to_readable_text(report)
         if goals_text:
             prompt += f"Goals/Observations: {goals_text}\n"
     
@@ -702,7 +1405,7 @@ def _build_start_analysis_prompt(start_reports, student):
         
         if report.progress_notes:
             prompt += f"Assessment Notes: {report.progress_notes}\n"
-        goals_text = _goals_to_readable_text(report.goals_achieved)
+        goals_text = _goals_to_readable_text(report)
         if goals_text:
             prompt += f"Goals/Observations: {goals_text}\n"
     
@@ -789,7 +1492,7 @@ def _build_current_status_context(end_reports, student):
         if report.progress_notes:
             context += f"  Progress Notes: {report.progress_notes}\n"
         
-        goals_text = _goals_to_readable_text(report.goals_achieved)
+        goals_text = _goals_to_readable_text(report)
         if goals_text:
             context += f"  Observations: {goals_text}\n"
         
@@ -876,7 +1579,7 @@ def _build_end_analysis_prompt(end_reports, student):
         
         if report.progress_notes:
             prompt += f"Current Assessment Notes: {report.progress_notes}\n"
-        goals_text = _goals_to_readable_text(report.goals_achieved)
+        goals_text = _goals_to_readable_text(report)
         if goals_text:
             prompt += f"Recent Observations: {goals_text}\n"
     
@@ -907,7 +1610,7 @@ def _build_recommendations_prompt(reports, metrics, student):
         prompt += f"Progress Level: {report.progress_level}\n"
         if report.progress_notes:
             prompt += f"Session Notes: {report.progress_notes}\n"
-        goals_text = _goals_to_readable_text(report.goals_achieved)
+        goals_text = _goals_to_readable_text(report)
         if goals_text:
             prompt += f"Observations: {goals_text}\n"
     
@@ -948,7 +1651,7 @@ def _build_main_summary_prompt(reports, student):
         if report.progress_notes:
             notes = report.progress_notes[:300] + "..." if len(report.progress_notes) > 300 else report.progress_notes
             prompt += f"Notes: {notes}\n"
-        goals_text = _goals_to_readable_text(report.goals_achieved, 300)
+        goals_text = _goals_to_readable_text(report, 300)
         if goals_text:
             prompt += f"Goals/Observations: {goals_text}\n"
     
@@ -964,114 +1667,35 @@ def _build_main_summary_prompt(reports, student):
     return prompt
 
 
-def _calculate_improvement_metrics(reports):
-    """Calculate quantitative improvement metrics from actual report data."""
-    from collections import Counter
-    
+def _calculate_improvement_metrics(reports, stats=None):
+    """Quantitative improvement metrics; `stats` are stored progress stats covering exactly `reports`."""
     if not reports:
         return {"error": "No reports available for analysis"}
-    
-    # Analyze progress levels over time
-    progress_levels = [r.progress_level for r in reports if r.progress_level]
-    progress_counter = Counter(progress_levels)
-    
-    # Therapy type analysis  
-    therapy_types = [r.therapy_type for r in reports if r.therapy_type]
-    therapy_counter = Counter(therapy_types)
-    
-    # Calculate actual session frequency
-    if len(reports) > 1:
-        dates = [r.report_date for r in reports]
-        dates.sort()
-        total_days = (dates[-1] - dates[0]).days
-        avg_frequency = total_days / (len(reports) - 1) if len(reports) > 1 else 0
-        frequency_desc = f"{avg_frequency:.1f} days between sessions"
-    else:
-        frequency_desc = "Single session only"
-    
-    # Analyze actual improvement trend
-    improvement_trend = _analyze_actual_improvement_trend(reports)
-    
-    # Calculate consistency from actual data
-    consistency = _calculate_actual_consistency(reports)
-    
-    return {
-        "total_sessions": len(reports),
-        "therapy_types_count": len(therapy_counter),
-        "most_common_therapy": therapy_counter.most_common(1)[0] if therapy_counter else ("None", 0),
-        "progress_distribution": dict(progress_counter),
-        "session_frequency": frequency_desc,
-        "consistency_score": consistency,
-        "improvement_trend": improvement_trend,
-        "date_span_days": (reports[-1].report_date - reports[0].report_date).days if len(reports) > 1 else 0
-    }
-
-
-def _analyze_actual_improvement_trend(reports):
-    """Analyze improvement trend from actual progress level data."""
-    if len(reports) < 2:
-        return "Insufficient data for trend analysis"
-    
-    # Map progress levels to numbers for calculation
-    level_map = {
-        "Poor": 1, "Below Average": 2, "Average": 3, 
-        "Good": 4, "Very Good": 5, "Excellent": 6
-    }
-    
-    # Get numerical scores for reports with progress levels
-    scores = []
-    for report in reports:
-        if report.progress_level and report.progress_level in level_map:
-            scores.append(level_map[report.progress_level])
-    
-    if len(scores) < 2:
-        return "No progress levels available for comparison"
-    
-    # Calculate actual trend
-    start_avg = sum(scores[:len(scores)//3]) / len(scores[:len(scores)//3]) if len(scores) >= 3 else scores[0]
-    end_avg = sum(scores[-len(scores)//3:]) / len(scores[-len(scores)//3:]) if len(scores) >= 3 else scores[-1]
-    
-    improvement = end_avg - start_avg
-    
-    if improvement > 1.5:
-        return "Significant improvement demonstrated"
-    elif improvement > 0.5:
-        return "Moderate improvement shown"
-    elif improvement > 0:
-        return "Slight improvement noted"
-    elif improvement == 0:
-        return "Stable performance maintained"
-    else:
-        return "Performance decline noted - needs attention"
+    return progress_stats.improvement_metrics(stats or progress_stats.from_reports(reports))
 
 
-def _calculate_actual_consistency(reports):
-    """Calculate therapy consistency from actual attendance data."""
-    if len(reports) < 3:
-        return "Need more sessions for consistency analysis"
-    
-    dates = [r.report_date for r in reports]
-    dates.sort()
-    
-    # Calculate intervals between sessions
-    intervals = [(dates[i+1] - dates[i]).days for i in range(len(dates)-1)]
-    
-    if not intervals:
-        return "Cannot calculate consistency"
-    
-    avg_interval = sum(intervals) / len(intervals)
-    
-    # Calculate standard deviation
-    variance = sum((x - avg_interval) ** 2 for x in intervals) / len(intervals)
-    std_dev = variance ** 0.5
-    
-    # Consistency scoring based on actual data
-    if std_dev <= 3:
-        return "Highly consistent attendance"
-    elif std_dev <= 7:
-        return "Moderately consistent attendance" 
-    else:
-        return "Variable attendance pattern"
+def _stored_progress_stats(student, reports, payload):
+    """
+    The student's materialized progress stats when the request covers their whole
+    history (no date filter). Rows that no longer match the reports (edited, or
+    reports predating the table) are rebuilt; None means compute from `reports`.
+    """
+    if payload.from_date or payload.to_date:
+        return None
+    therapy_type = payload.therapy_type or progress_stats.ALL_THERAPY_TYPES
+    db = SessionLocal()
+    try:
+        stats = crud.therapy_progress.get(db, student.id, therapy_type)
+        if stats is None or not progress_stats.covers(stats, reports):
+            rows = crud.therapy_progress.rebuild_for_student(db, student.id)
+            stats = next((row for row in rows if row.therapy_type == therapy_type), None)
+        return stats if stats is not None and progress_stats.covers(stats, reports) else None
+    except Exception as e:
+        logging.warning(f"Progress stats lookup failed: {e}")
+        db.rollback()
+        return None
+    finally:
+        db.close()
 
 
 def _extract_student_strengths(reports):
@@ -1135,40 +1759,7 @@ def _analyze_therapy_evolution(reports):
 
 def _analyze_progress_journey(reports):
     """Analyze the progress level journey over time."""
-    if not reports:
-        return "No progress data available"
-    
-    progress_levels = []
-    for report in reports:
-        if report.progress_level:
-            progress_levels.append(report.progress_level)
-    
-    if not progress_levels:
-        return "No progress levels recorded"
-    
-    if len(progress_levels) == 1:
-        return f"Single assessment: {progress_levels[0]}"
-    
-    # Map progress levels to numbers for trend analysis
-    level_map = {"Poor": 1, "Below Average": 2, "Average": 3, "Good": 4, "Very Good": 5, "Excellent": 6}
-    
-    numeric_levels = []
-    for level in progress_levels:
-        if level in level_map:
-            numeric_levels.append(level_map[level])
-    
-    if len(numeric_levels) >= 2:
-        start_avg = sum(numeric_levels[:2]) / 2 if len(numeric_levels) >= 2 else numeric_levels[0]
-        end_avg = sum(numeric_levels[-2:]) / 2 if len(numeric_levels) >= 2 else numeric_levels[-1]
-        
-        if end_avg > start_avg + 0.5:
-            return f"Improving journey: from {progress_levels[0]} to {progress_levels[-1]}"
-        elif end_avg < start_avg - 0.5:
-            return f"Declining trend: from {progress_levels[0]} to {progress_levels[-1]}"
-        else:
-            return f"Stable performance: maintained around {progress_levels[-1]} level"
-    
-    return f"Progress tracked from {progress_levels[0]} to {progress_levels[-1]}"
+    return progress_stats.progress_journey(progress_stats.from_reports(reports))
 
 
 def _generate_fallback_analysis(reports, student, payload, metrics, date_range):
@@ -1244,50 +1835,63 @@ def _generate_fallback_analysis(reports, student, payload, metrics, date_range):
 # HELPER: Extract readable notes text from goals_achieved
 # ============================================================================
 
-def _goals_to_readable_text(goals_achieved, max_length=500):
-    """Convert goals_achieved (dict or JSON string) into readable text for prompts.
+def _goals_to_readable_text(report, max_length=500):
+    """Convert a report's goals_achieved into readable text for prompts.
     Returns a string like 'Behavioral Management: notes here; Emotional Regulation: notes here'
     instead of dumping raw dict/JSON."""
-    parsed = _parse_goals_achieved(goals_achieved)
-    if parsed is None:
-        if isinstance(goals_achieved, str) and goals_achieved.strip():
-            return goals_achieved.strip()[:max_length]
-        return ""
-    
-    parts = []
-    for key, value in parsed.items():
-        if isinstance(value, dict):
-            label = value.get('label', key)
-            notes = value.get('notes', '').strip()
-            if notes:
-                parts.append(f"{label}: {notes}")
-        elif isinstance(value, str) and value.strip():
-            parts.append(f"{key}: {value.strip()}")
-    
-    if not parts:
-        return ""
-    return "; ".join(parts)[:max_length]
+    return report_goals(report).readable_text()[:max_length]
 
 
-# ============================================================================
-# HELPER: Parse goals_achieved (may be JSON string or dict)
-# ============================================================================
+def _note_retrieval_index(reports):
+    """The student's note index for retrieval, or None when retrieval is off or fails."""
+    if not settings.AI_NOTE_RETRIEVAL_ENABLED or not reports:
+        return None
+    try:
+        return note_index.get_index(reports[0].student_id, reports)
+    except Exception as e:
+        logging.warning(f"Note index unavailable, sending notes by recency: {e}")
+        return None
+
+
+def _select_section_notes(index, reports, notes):
+    """
+    Pick the notes of one section to send to the model.
 
-def _parse_goals_achieved(goals_achieved):
-    """Parse goals_achieved field which may be a JSON string, dict, or None.
-    Returns a dict or None."""
-    if goals_achieved is None:
+    `notes` are (report position, note, goal key) tuples. The notes of the first
+    and latest report are always kept; of the rest, the top AI_NOTE_RETRIEVAL_TOP_K
+    by maximal marginal relevance (representative of the section, unlike each
+    other). Returns {note index: MMR position, None for first/latest}, or None
+    to send every note.
+    """
+    top_k = settings.AI_NOTE_RETRIEVAL_TOP_K
+    if index is None or len(notes) <= top_k + 2:
         return None
-    if isinstance(goals_achieved, dict):
-        return goals_achieved
-    if isinstance(goals_achieved, str):
-        try:
-            parsed = json.loads(goals_achieved)
-            if isinstance(parsed, dict):
-                return parsed
-        except (json.JSONDecodeError, TypeError):
-            logging.warning(f"Could not parse goals_achieved JSON string: {goals_achieved[:100]}")
-    return None
+    last = len(reports) - 1
+    anchors = [i for i, (r_pos, _, _) in enumerate(notes) if r_pos in (0, last)]
+    candidates = [i for i, (r_pos, _, _) in enumerate(notes) if r_pos not in (0, last)]
+    try:
+        vectors = index.vectors_for([(reports[notes[i][0]].id, notes[i][2], notes[i][1]) for i in candidates])
+        picked = note_index.mmr_order(vectors, top_k, settings.AI_NOTE_MMR_LAMBDA)
+    except Exception as e:
+        logging.warning(f"Note retrieval failed, sending notes by recency: {e}")
+        return None
+    selected = {i: None for i in anchors}
+    selected.update({candidates[p]: pos for pos, p in enumerate(picked)})
+    return selected
+
+
+def _index_report_notes(report_id: int):
+    """Add a new report's notes to its student's note index (background task)."""
+    db = SessionLocal()
+    try:
+        report = crud.therapy_report.get(db, id=report_id)
+        if report is not None:
+            note_index.update_for_report(report)
+    except Exception as e:
+        logging.warning(f"Could not index notes of report {report_id}: {e}")
+    finally:
+        db.close()
+
 
 # ============================================================================
 # FEW-SHOT PROMPT BUILDERS WITH PROFESSIONAL EXAMPLES
@@ -1295,64 +1899,20 @@ def _parse_goals_achieved(goals_achieved):
 
 def _extract_section_titles(reports):
     """Extract unique section titles from therapy reports' goals_achieved field."""
-    section_titles = set()
-    
-    for report in reports:
-        if report.goals_achieved:
-            parsed = _parse_goals_achieved(report.goals_achieved)
-            if isinstance(parsed, dict):
-                # Get section labels from the parsed dict values
-                for key, value in parsed.items():
-                    if isinstance(value, dict) and value.get('label'):
-                        section_titles.add(value['label'])
-                    else:
-                        section_titles.add(key)
-            elif isinstance(report.goals_achieved, str):
-                # Fallback: try to parse common section patterns from raw text
-                import re
-                matches = re.findall(r'^([A-Z][A-Za-z\s&(),]+(?:\s+and\s+[A-Z]+)?[A-Za-z\s]*):', report.goals_achieved, re.MULTILINE)
-                section_titles.update([m.strip() for m in matches if m.strip()])
-    
-    # Return as sorted list for consistency
-    return sorted(list(section_titles)) if section_titles else []
-
-
-def _extract_section_content(report, section_name):
-    """Extract content for a specific section from a report - ONLY from matching section."""
-    if not report.goals_achieved:
-        return ""
-    
-    parsed = _parse_goals_achieved(report.goals_achieved)
-    
-    if isinstance(parsed, dict):
-        # Try matching by label first (new format), then by key
-        for key, value in parsed.items():
-            if isinstance(value, dict):
-                label = value.get('label', '')
-                notes = value.get('notes', '')
-                if (label == section_name or key == section_name) and notes and notes.strip():
-                    return notes.strip()[:300]
-            elif isinstance(value, str) and value.strip():
-                if key == section_name:
-                    return value.strip()[:300]
-        return ""
-    
-    # If goals_achieved is a raw string (not JSON), try regex extraction
-    if isinstance(report.goals_achieved, str):
-        import re
-        pattern = rf"^{re.escape(section_name)}:\s*(.*?)(?=\n[A-Z][A-Za-z\s&(),]+(?:\s+and\s+[A-Z]+)?[A-Za-z\s]*:|$)"
-        match = re.search(pattern, report.goals_achieved, re.DOTALL | re.MULTILINE)
-        if match:
-            return match.group(1).strip()[:300]
-    
-    return ""
+    return goal_sections.section_titles(reports)
+
+
+def _extract_section_content(report, section_name, max_length=300):
+    """Extract content for a specific section from a report - ONLY from matching section.
+    max_length=None returns the full note (prompt builders trim to their token budget)."""
+    return report_goals(report).section_content(section_name)[:max_length]
 
 
 # ============================================================================
 # FEW-SHOT PROMPT BUILDERS WITH PROFESSIONAL EXAMPLES
 # ============================================================================
 
-def _build_overview_prompt_with_fewshot(reports, student):
+def _build_overview_prompt_with_fewshot(reports, student, budget_tokens=None):
     """Build overview prompt with few-shot examples for better quality output."""
     student_name = getattr(student, 'name', 'Student')
     
@@ -1419,36 +1979,43 @@ NOW GENERATE FOR THIS STUDENT:
         for title in section_titles:
             prompt += f"  - {title}\n"
     
-    # Provide session data organized by sections
-    prompt += f"\nSession Data by Section:\n"
+    # Provide session data organized by sections; notes compete for the token
+    # budget (latest and baseline note of every section first)
+    prompt += f"\nSession Data by Section (oldest to newest):\n"
+    items = []
+    group_headers = {}
+    section_notes = {}
     for section in section_titles if section_titles else ["General Progress"]:
-        prompt += f"\n{section}:\n"
-        
-        # Extract notes related to this section from early and recent sessions
-        early_notes = []
-        recent_notes = []
-        
-        for report in reports[:min(3, len(reports))]:  # Early sessions
-            note = _extract_section_content(report, section)
-            if note:
-                early_notes.append(note)
-        
-        for report in reports[-min(3, len(reports)):]:  # Recent sessions
-            note = _extract_section_content(report, section)
-            if note:
-                recent_notes.append(note)
-        
-        if early_notes:
-            prompt += f"  Early sessions: {' '.join(early_notes[:2])}\n"
-        if recent_notes:
-            prompt += f"  Recent sessions: {' '.join(recent_notes[:2])}\n"
-    
-    prompt += f"\nGenerate a consolidated PROGRESS SUMMARY using the exact section titles listed above. Start with 'PROGRESS SUMMARY' as the heading, then list each section with a description of the child's current abilities and progress:\n"
-    
-    return prompt
+        notes = [(r_idx, _extract_section_content(report, section, None), None) for r_idx, report in enumerate(reports)]
+        section_notes[section] = [entry for entry in notes if entry[1]]
+    retrieval_index = None
+    if any(len(notes) > settings.AI_NOTE_RETRIEVAL_TOP_K + 2 for notes in section_notes.values()):
+        retrieval_index = _note_retrieval_index(reports)
+    for s_idx, (section, notes) in enumerate(section_notes.items()):
+        group_headers[section] = f"\n{section}:\n"
+        selected = _select_section_notes(retrieval_index, reports, notes)
+        for n_idx, (r_idx, note, _) in enumerate(notes):
+            if selected is not None and n_idx not in selected:
+                continue
+            rank = recency_rank(r_idx, len(reports), s_idx)
+            if selected is not None and selected[n_idx] is not None:
+                rank = (2, selected[n_idx], s_idx)
+            items.append(PromptItem(
+                text=f"  - {note}\n",
+                group=section,
+                order=(s_idx, r_idx),
+                rank=rank,
+                key=f"{section}|{dedupe_key(note)}",
+            ))
+    
+    tail = f"\nGenerate a consolidated PROGRESS SUMMARY using the exact section titles listed above. Start with 'PROGRESS SUMMARY' as the heading, then list each section with a description of the child's current abilities and progress:\n"
+    
+    return assemble_prompt(
+        prompt, items, tail, budget=budget_tokens or prompt_token_budget(), group_headers=group_headers
+    )
 
 
-def _build_start_analysis_prompt_with_fewshot(start_reports, student):
+def _build_start_analysis_prompt_with_fewshot(start_reports, student, budget_tokens=None):
     """Build start analysis prompt with few-shot examples."""
     student_name = getattr(student, 'name', 'Student')
     
@@ -1479,20 +2046,16 @@ NOW ANALYZE THIS STUDENT'S BASELINE:
     prompt += f"Initial Assessment Period: {len(start_reports)} early sessions\n\n"
     
     prompt += "Early Session Notes (actual baseline data):\n"
-    for i, report in enumerate(start_reports, 1):
-        if report.progress_notes:
-            prompt += f"- {report.progress_notes[:200]}\n"
-        goals_text = _goals_to_readable_text(report.goals_achieved, 200)
-        if goals_text:
-            prompt += f"  Goals: {goals_text}\n"
+    # Earliest sessions have priority: they define the baseline
+    items = _session_note_items(start_reports, "Goals", rank_key=lambda i: i)
     
-    prompt += f"\nDescribe {student_name}'s initial baseline condition based on the early session notes above. Only describe what the notes say - do not invent details:\n"
+    tail = f"\nDescribe {student_name}'s initial baseline condition based on the early session notes above. Only describe what the notes say - do not invent details:\n"
     
-    return prompt
+    return assemble_prompt(prompt, items, tail, budget=budget_tokens or prompt_token_budget())
 
 
-def _generate_enhanced_current_status_llama(client, end_reports, student, payload):
-    """Generate current status using Llama with few-shot examples."""
+def _build_current_status_prompt_with_fewshot(end_reports, student, budget_tokens=None):
+    """Build current status prompt with few-shot examples."""
     student_name = getattr(student, 'name', 'Student')
     
     prompt = """You are a clinical report summarization assistant.
@@ -1522,30 +2085,48 @@ NOW ANALYZE THIS STUDENT'S CURRENT STATUS:
     prompt += f"Analysis Period: {len(end_reports)} most recent sessions\n\n"
     
     prompt += "Recent Session Notes (current status data):\n"
-    for report in end_reports:
-        if report.progress_notes:
-            prompt += f"- {report.progress_notes[:200]}\n"
-        goals_text = _goals_to_readable_text(report.goals_achieved, 200)
-        if goals_text:
-            prompt += f"  Observations: {goals_text}\n"
+    # Most recent session first
+    items = _session_note_items(end_reports, "Observations", rank_key=lambda i: len(end_reports) - 1 - i)
     
-    prompt += f"\nDescribe {student_name}'s current abilities and functioning level based on the notes above. Only describe what the notes say - do not invent details:\n"
+    tail = f"\nDescribe {student_name}'s current abilities and functioning level based on the notes above. Only describe what the notes say - do not invent details:\n"
+    return assemble_prompt(prompt, items, tail, budget=budget_tokens or prompt_token_budget())
+
+
+def _session_note_items(reports, goals_label, rank_key):
+    """Prompt items for each report's progress notes and goal notes (in report order)."""
+    items = []
+    for i, report in enumerate(reports):
+        if report.progress_notes and report.progress_notes.strip():
+            note = report.progress_notes.strip()
+            items.append(PromptItem(text=f"- {note}\n", order=(i, 0), rank=(rank_key(i), 0), key=dedupe_key(note)))
+        goals_text = _goals_to_readable_text(report, None)
+        if goals_text:
+            items.append(PromptItem(
+                text=f"  {goals_label}: {goals_text}\n", order=(i, 1), rank=(rank_key(i), 1), key=dedupe_key(goals_text)
+            ))
+    return items
+
+
+def _generate_enhanced_current_status_llama(client, end_reports, student, payload):
+    """Generate current status using Llama with few-shot examples."""
+    model_name = payload.model or "meta-llama/Llama-3.3-70B-Instruct"
+    prompt = _build_current_status_prompt_with_fewshot(end_reports, student, prompt_token_budget(model_name))
     
     try:
-        result = _run_model_completion(
+        return _cached_model_completion(
+            "end_date_analysis",
             client=client,
             prompt=prompt,
-            model=payload.model or "meta-llama/Llama-3.3-70B-Instruct",
+            model=model_name,
             max_tokens=350,
             temperature=0.3
         )
-        return _extract_generated_text(result)
     except Exception as e:
         logging.warning(f"Llama current status failed: {e}, using fallback")
         return _build_basic_current_status(end_reports, student)
 
 
-def _build_recommendations_prompt_with_fewshot(reports, metrics, student):
+def _build_recommendations_prompt_with_fewshot(reports, metrics, student, budget_tokens=None):
     """Build recommendations prompt with few-shot examples."""
     student_name = getattr(student, 'name', 'Student')
     
@@ -1574,23 +2155,32 @@ NOW GENERATE RECOMMENDATIONS FOR:
     prompt += f"Total Sessions Completed: {len(reports)}\n"
     
     # Add early to later progression narrative
+    items = []
     if len(reports) >= 2:
-        prompt += f"\nEarly Sessions Context:\n"
-        for report in reports[:min(2, len(reports))]:
-            if report.progress_notes:
-                prompt += f"- {report.progress_notes[:150]}\n"
-        
-        prompt += f"\nRecent Sessions Context:\n"
-        for report in reports[-min(2, len(reports)):]:
-            if report.progress_notes:
-                prompt += f"- {report.progress_notes[:150]}\n"
-    
-    prompt += f"\nGenerate professional recommendations for {student_name} based on the progress shown:\n"
-    
-    return prompt
+        half = len(reports) // 2
+        for r_idx, report in enumerate(reports):
+            if report.progress_notes and report.progress_notes.strip():
+                note = report.progress_notes.strip()
+                items.append(PromptItem(
+                    text=f"- {note}\n",
+                    group="early" if r_idx < half else "recent",
+                    order=(0 if r_idx < half else 1, r_idx),
+                    rank=recency_rank(r_idx, len(reports)),
+                    key=dedupe_key(note),
+                ))
+    
+    tail = f"\nGenerate professional recommendations for {student_name} based on the progress shown:\n"
+    
+    return assemble_prompt(
+        prompt,
+        items,
+        tail,
+        budget=budget_tokens or prompt_token_budget(),
+        group_headers={"early": "\nEarly Sessions Context:\n", "recent": "\nRecent Sessions Context:\n"},
+    )
 
 
-def _build_main_summary_prompt_with_fewshot(reports, student):
+def _build_main_summary_prompt_with_fewshot(reports, student, budget_tokens=None):
     """Build main summary prompt with section-based bullet point format."""
     import logging
     
@@ -1601,93 +2191,17 @@ def _build_main_summary_prompt_with_fewshot(reports, student):
     if reports and reports[0].therapy_type:
         therapy_type = reports[0].therapy_type
     
-    # Define exact 5 sections for each therapy type (matching frontend)
-    therapy_sections = {
-        "Speech Therapy": [
-            "Receptive Language Skills (Comprehension)",
-            "Expressive Language Skills",
-            "Oral Motor & Oral Placement Therapy (OPT) Goals",
-            "Pragmatic Language Skills (Social Communication)",
-            "Narrative Skills"
-        ],
-        "Behavioral Therapy": [
-            "Behavior Regulation & Self-Control",
-            "Attention, Compliance & Task Engagement",
-            "Emotional Regulation Skills",
-            "Social Behavior & Interaction Skills",
-            "Adaptive Behavior & Functional Skills"
-        ],
-        "Cognitive Therapy": [
-            "Attention & Concentration Skills",
-            "Memory & Recall Skills",
-            "Problem Solving & Reasoning Skills",
-            "Executive Functioning Skills",
-            "Cognitive Flexibility & Processing Skills"
-        ],
-        "Occupational Therapy": [
-            "Fine Motor Skills",
-            "Sensory Processing & Integration",
-            "Visual-Motor Integration Skills",
-            "Activities of Daily Living (ADL)",
-            "Handwriting & Pre-Academic Skills"
-        ],
-        "Physical Therapy": [
-            "Gross Motor Skills",
-            "Balance & Postural Control",
-            "Strength & Endurance",
-            "Coordination & Motor Planning",
-            "Functional Mobility Skills"
-        ]
-    }
-    
     # Get the 5 sections for this therapy type
-    predefined_sections = therapy_sections.get(therapy_type, therapy_sections["Speech Therapy"])
-    
-    # CRITICAL: Build mappings from old/alternate labels AND keys to standard sections
-    # This handles reports saved with getGoalsForTherapyType() (old labels) and key variations
-    label_aliases = {
-        # Behavioral Therapy aliases (getGoalsForTherapyType used different labels)
-        "Behavioral Management": "Behavior Regulation & Self-Control",
-        "Emotional Regulation": "Emotional Regulation Skills",
-        "Social Skills": "Social Behavior & Interaction Skills",
-        "Coping Strategies": "Adaptive Behavior & Functional Skills",
-        # Occupational Therapy aliases
-        "Fine Motor Skills": "Fine Motor Skills",
-        "Gross Motor Skills": "Gross Motor Skills",  
-        "Daily Living Activities": "Activities of Daily Living (ADL)",
-        "Sensory Integration": "Sensory Processing & Integration",
-        # Physical Therapy aliases
-        "Strength & Endurance": "Strength & Endurance",
-        "Flexibility & Range of Motion": "Coordination & Motor Planning",
-        "Balance & Coordination": "Balance & Postural Control",
-        "Mobility & Gait": "Functional Mobility Skills",
-    }
-    
-    # Key-based aliases: map JSON keys to standard section titles
-    key_aliases = {
-        # Behavioral Therapy keys
-        "behavior_regulation": "Behavior Regulation & Self-Control",
-        "behavioral_management": "Behavior Regulation & Self-Control",
-        "attention_compliance": "Attention, Compliance & Task Engagement",
-        "emotional_regulation": "Emotional Regulation Skills",
-        "social_behavior": "Social Behavior & Interaction Skills",
-        "social_skills": "Social Behavior & Interaction Skills",
-        "adaptive_behavior": "Adaptive Behavior & Functional Skills",
-        "coping_strategies": "Adaptive Behavior & Functional Skills",
-    }
+    predefined_sections = goal_sections.therapy_sections_for(therapy_type)
     
     # First, detect what labels actually exist in the reports
     actual_labels_in_reports = set()
     actual_keys_in_reports = set()
     for report in reports:
-        parsed = _parse_goals_achieved(report.goals_achieved)
-        if isinstance(parsed, dict):
-            for key, value in parsed.items():
-                actual_keys_in_reports.add(key)
-                if isinstance(value, dict):
-                    label = value.get('label', '').strip()
-                    if label:
-                        actual_labels_in_reports.add(label)
+        for entry in report_goals(report).entries:
+            actual_keys_in_reports.add(entry.key)
+            if entry.kind == "dict" and entry.label.strip():
+                actual_labels_in_reports.add(entry.label.strip())
     
     logging.info(f"="*60)
     logging.info(f"AI SUMMARY EXTRACTION DEBUG INFO:")
@@ -1696,33 +2210,12 @@ def _build_main_summary_prompt_with_fewshot(reports, student):
     logging.info(f"Predefined sections for {therapy_type}: {predefined_sections}")
     logging.info(f"="*60)
     
-    # Build reverse lookup: for each predefined section, which labels/keys should match?
-    section_to_aliases = {}
-    section_to_key_aliases = {}
-    for section in predefined_sections:
-        # Label aliases
-        aliases = {section, section.lower()}
-        for old_label, mapped_section in label_aliases.items():
-            if mapped_section == section:
-                aliases.add(old_label)
-                aliases.add(old_label.lower())
-        section_to_aliases[section] = aliases
-        
-        # Key aliases
-        key_alias_set = set()
-        for key, mapped_section in key_aliases.items():
-            if mapped_section == section:
-                key_alias_set.add(key)
-                key_alias_set.add(key.lower())
-        section_to_key_aliases[section] = key_alias_set
-    
-    # Check if ANY predefined section matches any report label
-    any_match = False
-    for section in predefined_sections:
-        for actual_label in actual_labels_in_reports:
-            if actual_label in section_to_aliases.get(section, set()) or actual_label == section:
-                any_match = True
-                break
+    # Check if ANY predefined section matches any report label (directly or via an old label)
+    any_match = any(
+        actual_label in goal_sections.section_aliases(section, True)[0]
+        for section in predefined_sections
+        for actual_label in actual_labels_in_reports
+    )
     
     # If no predefined sections match, use the actual labels from reports instead
     if not any_match and actual_labels_in_reports:
@@ -1838,104 +2331,8 @@ REQUIRED SECTIONS (Use these EXACT titles in this EXACT order, with ** bold mark
 """
     
     # ── PRE-COLLECT notes per section so we know which sections have data ──
-    section_notes_map = {}  # title -> list of notes
-    for title in section_titles:
-        all_notes = []
-        title_lower = title.lower().strip()
-        aliases = section_to_aliases.get(title, {title, title_lower})
-        title_clean = re.sub(r'[^a-z0-9\s]', ' ', title_lower)
-        title_keywords = set(title_clean.split()) - {'and', 'the', 'of', 'for', 'in', 'skills', 'a', ''}
-        
-        logging.info(f"\n--- Searching for section: '{title}' ---")
-        logging.info(f"  Title keywords: {title_keywords}")
-        logging.info(f"  Known aliases: {aliases}")
-        logging.info(f"  Key aliases: {section_to_key_aliases.get(title, set())}")
-        
-        for report in reports:
-            parsed = _parse_goals_achieved(report.goals_achieved)
-            if isinstance(parsed, dict):
-                logging.info(f"Processing report ID={report.id} for section '{title}': keys={list(parsed.keys())}")
-                
-                for key, value in parsed.items():
-                    if isinstance(value, dict):
-                        label = value.get('label', '').strip()
-                        notes = value.get('notes', '')
-                        has_notes = notes and notes.strip()
-                        
-                        if not has_notes:
-                            continue
-                        
-                        label_match = False
-                        match_reason = None
-                        
-                        key_normalized = key.lower().replace('_', ' ').strip()
-                        key_clean = re.sub(r'[^a-z0-9\\s]', ' ', key_normalized)
-                        key_words = set(key_clean.split()) - {'and', 'the', 'of', 'for', 'in', 'skills', 'a', ''}
-                        
-                        if label == title:
-                            label_match = True
-                            match_reason = "exact label match"
-                        
-                        if not label_match and (label in aliases or label.lower() in aliases):
-                            label_match = True
-                            match_reason = "alias match"
-                        
-                        if not label_match and label and label.lower().strip() == title_lower:
-                            label_match = True
-                            match_reason = "case-insensitive exact match"
-                        
-                        if not label_match:
-                            key_lower = key.lower().strip()
-                            if key_lower in section_to_key_aliases.get(title, set()):
-                                label_match = True
-                                match_reason = "explicit key alias"
-                        
-                        if not label_match and key_words:
-                            matching_words = key_words & title_keywords
-                            if len(matching_words) >= 2:
-                                label_match = True
-                                match_reason = f"keyword match (2+ words): {matching_words}"
-                            elif len(key_words) == 1 and key_words.issubset(title_keywords):
-                                label_match = True
-                                match_reason = f"single keyword match: {key_words}"
-                        
-                        if not label_match:
-                            for alias in aliases:
-                                alias_clean = re.sub(r'[^a-z0-9\s]', ' ', alias.lower())
-                                alias_keywords = set(alias_clean.split()) - {'and', 'the', 'of', 'for', 'in', 'skills', 'a', ''}
-                                if key_words and alias_keywords:
-                                    matching = key_words & alias_keywords
-                                    if len(matching) >= 2 or (len(key_words) == 1 and key_words.issubset(alias_keywords)):
-                                        label_match = True
-                                        match_reason = f"alias keyword match via '{alias}': {matching}"
-                                        break
-                        
-                        if not label_match and label:
-                            label_cleaned = re.sub(r'[^a-z0-9\s]', ' ', label.lower())
-                            title_cleaned = re.sub(r'[^a-z0-9\s]', ' ', title_lower)
-                            label_words = set(label_cleaned.split()) - {'and', 'the', 'of', 'for', 'in', 'skills', 'a', ''}
-                            title_words_full = set(title_cleaned.split()) - {'and', 'the', 'of', 'for', 'in', 'skills', 'a', ''}
-                            if label_words and title_words_full:
-                                overlap = label_words & title_words_full
-                                min_words = min(len(label_words), len(title_words_full))
-                                required_matches = max(2, int(0.8 * min_words))
-                                if len(overlap) >= required_matches:
-                                    label_match = True
-                                    match_reason = f"substring/overlap match ({len(overlap)}/{min_words} words): {overlap}"
-                        
-                        if label_match:
-                            logging.info(f"  ✓ MATCH - Key='{key}', Label='{label}', Reason={match_reason}")
-                            all_notes.append(notes.strip())
-                        else:
-                            logging.debug(f"  ✗ No match - Key='{key}', Label='{label}'")
-                    elif isinstance(value, str) and value.strip():
-                        if title.lower().replace(' ', '_').startswith(key.lower().replace(' ', '_')[:10]):
-                            all_notes.append(value)
-            else:
-                logging.warning(f"Report ID={report.id}: goals_achieved could not be parsed (type={type(report.goals_achieved)})")
-        
-        logging.info(f"Section '{title}': Found {len(all_notes)} notes")
-        section_notes_map[title] = all_notes
+    # title -> list of (report position, note, goal key)
+    section_notes_map = goal_sections.collect_section_notes(reports, section_titles, predefined_sections)
     
     # ── Filter to only sections that have notes ──
     active_sections = [t for t in section_titles if section_notes_map.get(t)]
@@ -1951,76 +2348,135 @@ REQUIRED SECTIONS (Use these EXACT titles in this EXACT order, with ** bold mark
     prompt += f"\nSession Notes by Section:\n"
     prompt += f"⚠️ CRITICAL RULE: For EACH section below, use ONLY the notes listed under that section's heading. DO NOT move notes between sections. ⚠️\n"
     
-    # Provide section data — only sections that have notes
-    for title in active_sections:
-        all_notes = section_notes_map[title]
-        prompt += f"\n━━━ {title} ━━━\n"
-        prompt += f"(Write 2-3 bullets using ONLY the notes below)\n"
-        
-        if len(reports) == 1:
-            for idx, note in enumerate(all_notes, 1):
-                prompt += f"  [{idx}] {note[:300]}\n"
-        elif len(all_notes) >= 3:
-            prompt += f"  [1] Session 1: {all_notes[0][:250]}\n"
-            prompt += f"  [2] Mid-point: {all_notes[len(all_notes)//2][:250]}\n"
-            prompt += f"  [3] Latest: {all_notes[-1][:250]}\n"
-        elif len(all_notes) == 2:
-            prompt += f"  [1] First: {all_notes[0][:250]}\n"
-            prompt += f"  [2] Second: {all_notes[-1][:250]}\n"
-        else:
-            prompt += f"  [1] {all_notes[0][:250]}\n"
+    # Provide section data — only sections that have notes. Notes compete for
+    # the token budget: each section's latest note first, then its earliest
+    # (baseline), then the rest newest to oldest; repeated notes appear once.
+    # Sections with a long history send only the most informative, diverse
+    # middle notes (note index + MMR), in MMR order.
+    items = []
+    group_headers = {}
+    retrieval_index = None
+    if any(len(section_notes_map[t]) > settings.AI_NOTE_RETRIEVAL_TOP_K + 2 for t in active_sections):
+        retrieval_index = _note_retrieval_index(reports)
+    for s_idx, title in enumerate(active_sections):
+        group_headers[title] = f"\n━━━ {title} ━━━\n(Write 2-3 bullets using ONLY the notes below)\n"
+        selected = _select_section_notes(retrieval_index, reports, section_notes_map[title])
+        for n_idx, (r_pos, note, _) in enumerate(section_notes_map[title]):
+            if selected is not None and n_idx not in selected:
+                continue
+            rank = recency_rank(r_pos, len(reports), s_idx)
+            if selected is not None and selected[n_idx] is not None:
+                rank = (2, selected[n_idx], s_idx)
+            label = f"Session {r_pos + 1}/{len(reports)}: " if len(reports) > 1 else ""
+            items.append(PromptItem(
+                text=f"  - {label}{note}\n",
+                group=title,
+                order=(s_idx, r_pos, n_idx),
+                rank=rank,
+                key=f"{title}|{dedupe_key(note)}",
+            ))
     
     # SAFETY NET: If ALL sections have no notes, include raw progress_notes as general context
     # This handles cases where goals_achieved labels don't match any section
-    all_sections_empty = True
-    for title in section_titles:
-        # Re-check quickly
-        for report in reports:
-            parsed = _parse_goals_achieved(report.goals_achieved)
-            if isinstance(parsed, dict):
-                for key, value in parsed.items():
-                    if isinstance(value, dict) and value.get('notes', '').strip():
-                        # There ARE notes in the data, they just didn't match sections
-                        all_sections_empty = False
-                        break
-            if not all_sections_empty:
-                break
-        if not all_sections_empty:
-            break
+    # (there ARE notes in the data, they just didn't match sections)
+    all_sections_empty = not (section_titles and any(report_goals(r).has_section_notes() for r in reports))
     
+    tail = ""
     if all_sections_empty:
         # Dump ALL available notes as general context
-        prompt += f"\n--- ADDITIONAL CONTEXT (notes from reports that did not match specific sections) ---\n"
-        for report in reports:
+        group_headers["__context__"] = f"\n--- ADDITIONAL CONTEXT (notes from reports that did not match specific sections) ---\n"
+        for r_pos, report in enumerate(reports):
+            context_notes = []
             if report.progress_notes and report.progress_notes.strip():
-                prompt += f"  Progress notes: {report.progress_notes.strip()[:300]}\n"
-            goals_text = _goals_to_readable_text(report.goals_achieved, 400)
+                context_notes.append(f"  Progress notes: {report.progress_notes.strip()}\n")
+            goals_text = _goals_to_readable_text(report, None)
             if goals_text:
-                prompt += f"  Goal notes: {goals_text}\n"
-        prompt += f"--- END ADDITIONAL CONTEXT ---\n"
-        prompt += f"\nNOTE: The above notes did not match the predefined section titles. Distribute the information across the most relevant sections. Do NOT leave sections marked 'No documented data' if relevant notes exist above.\n"
-    
-    prompt += f"\nIMPORTANT REMINDERS:\n"
-    prompt += f"- Write 2-3 sentences per bullet point (• symbol) based ONLY on the session notes above\n"
-    prompt += f"- ONLY generate the {len(active_sections)} sections listed above — do NOT add extra sections or write 'No documented data'\n"
-    prompt += f"- For each section: paraphrase and synthesize the notes faithfully — do NOT add information not in the notes\n"
-    prompt += f"- SECTION ISOLATION: each section's bullets must ONLY use notes from THAT section — never borrow notes from other sections\n"
+                context_notes.append(f"  Goal notes: {goals_text}\n")
+            for k, text in enumerate(context_notes):
+                items.append(PromptItem(
+                    text=text,
+                    group="__context__",
+                    order=(len(active_sections), r_pos, k),
+                    rank=recency_rank(r_pos, len(reports), k),
+                    key=dedupe_key(text),
+                ))
+        tail += f"--- END ADDITIONAL CONTEXT ---\n"
+        tail += f"\nNOTE: The above notes did not match the predefined section titles. Distribute the information across the most relevant sections. Do NOT leave sections marked 'No documented data' if relevant notes exist above.\n"
+    
+    tail += f"\nIMPORTANT REMINDERS:\n"
+    tail += f"- Write 2-3 sentences per bullet point (• symbol) based ONLY on the session notes above\n"
+    tail += f"- ONLY generate the {len(active_sections)} sections listed above — do NOT add extra sections or write 'No documented data'\n"
+    tail += f"- For each section: paraphrase and synthesize the notes faithfully — do NOT add information not in the notes\n"
+    tail += f"- SECTION ISOLATION: each section's bullets must ONLY use notes from THAT section — never borrow notes from other sections\n"
     if is_single_session:
-        prompt += f"- SINGLE SESSION: Do NOT use improvement/progression language. Use: 'demonstrated', 'attempted', 'practiced', 'worked on', 'with support', 'emerging', 'during the session'\n"
-        prompt += f"- SINGLE SESSION: Goals listed in notes are targets that were WORKED ON — do not claim they were achieved or improved\n"
-    prompt += f"- If notes describe inconsistent or uneven progress, your summary MUST reflect that - do NOT reframe as improvement\n"
-    prompt += f"- NEVER fabricate specific techniques, tools, or strategies not mentioned in the notes\n"
-    prompt += f"\n**ABSOLUTE BAN ON RECOMMENDATIONS:**\n"
-    prompt += f"- DO NOT write: 'support is needed', 'further work is indicated', 'continued practice', 'therapist should', 'it is recommended', 'would benefit from'\n"
-    
-    prompt += f"\n🔒 FINAL REMINDER - SECTION ISOLATION:\n"
-    prompt += f"Each section is separated by ━━━ dividers above. When writing bullets for 'Behavior Regulation & Self-Control', use ONLY notes under that heading.\n"
-    prompt += f"Do NOT copy notes from 'Emotional Regulation Skills' into 'Behavior Regulation & Self-Control' even if they mention similar topics.\n"
-    prompt += f"If a note appears under Section A's heading, it belongs ONLY in Section A's output - NEVER in Section B, C, D, or E.\n"
-    prompt += f"- ONLY describe what WAS observed or attempted — past tense, descriptive language ONLY\n"
-    prompt += f"- This is a progress SUMMARY (describing what happened), NOT a treatment plan\n"
-    prompt += f"\n- Match the EXACT tone of the notes: uncertain notes = uncertain summary, negative notes = honest summary\n"
-    prompt += f"- Use bold **section titles** for each section\n"
-    prompt += f"\nSTART YOUR RESPONSE WITH: '{therapy_label} – Progress Summary'\n"
-    
-    return prompt
\ No newline at end of file
+        tail += f"- SINGLE SESSION: Do NOT use improvement/progression language. Use: 'demonstrated', 'attempted', 'practiced', 'worked on', 'with support', 'emerging', 'during the session'\n"
+        tail += f"- SINGLE SESSION: Goals listed in notes are targets that were WORKED ON — do not claim they were achieved or improved\n"
+    tail += f"- If notes describe inconsistent or uneven progress, your summary MUST reflect that - do NOT reframe as improvement\n"
+    tail += f"- NEVER fabricate specific techniques, tools, or strategies not mentioned in the notes\n"
+    tail += f"\n**ABSOLUTE BAN ON RECOMMENDATIONS:**\n"
+    tail += f"- DO NOT write: 'support is needed', 'further work is indicated', 'continued practice', 'therapist should', 'it is recommended', 'would benefit from'\n"
+    
+    tail += f"\n🔒 FINAL REMINDER - SECTION ISOLATION:\n"
+    tail += f"Each section is separated by ━━━ dividers above. When writing bullets for 'Behavior Regulation & Self-Control', use ONLY notes under that heading.\n"
+    tail += f"Do NOT copy notes from 'Emotional Regulation Skills' into 'Behavior Regulation & Self-Control' even if they mention similar topics.\n"
+    tail += f"If a note appears under Section A's heading, it belongs ONLY in Section A's output - NEVER in Section B, C, D, or E.\n"
+    tail += f"- ONLY describe what WAS observed or attempted — past tense, descriptive language ONLY\n"
+    tail += f"- This is a progress SUMMARY (describing what happened), NOT a treatment plan\n"
+    tail += f"\n- Match the EXACT tone of the notes: uncertain notes = uncertain summary, negative notes = honest summary\n"
+    tail += f"- Use bold **section titles** for each section\n"
+    tail += f"\nSTART YOUR RESPONSE WITH: '{therapy_label} – Progress Summary'\n"
+    
+    return assemble_prompt(
+        prompt, items, tail, budget=budget_tokens or prompt_token_budget(), group_headers=group_headers
+    )
+
+
+def _build_rolling_update_prompt(previous_summary, new_reports, student, total_sessions, budget_tokens=None):
+    """Prompt that folds new session notes into an existing progress summary."""
+    student_name = getattr(student, 'name', 'Student')
+    therapy_type = next((r.therapy_type for r in new_reports if r.therapy_type), None)
+    therapy_label = therapy_type if therapy_type else "Therapy"
+    earlier_sessions = total_sessions - len(new_reports)
+
+    prompt = f"""You are an objective clinical therapist keeping a factual progress summary up to date.
+
+Below is the current {therapy_label} progress summary for {student_name}, covering {earlier_sessions} earlier session(s), followed by the notes from {len(new_reports)} new session(s). Rewrite the summary so it covers all {total_sessions} sessions.
+
+RULES:
+- Keep the exact format of the current summary: the title line, **bold section titles**, 2-3 bullets per section (use • for bullets), each bullet 2-3 complete sentences
+- Keep earlier observations unless the new notes change them
+- Describe change only when the new notes actually show it; if they are similar, say performance was "consistent" or "stable"
+- If the new notes describe struggles or uneven progress, report that honestly
+- Add a section only if the new notes cover an area the summary does not have yet
+- NEVER fabricate techniques, tools or observations that are not in the summary or the notes
+- NO dates, NO session numbers
+- DO NOT give advice or recommendations - describe only what was observed
+
+CURRENT SUMMARY:
+{previous_summary.strip()}
+
+NEW SESSION NOTES:
+"""
+    ordered = sorted(new_reports, key=lambda r: r.report_date)
+    items = []
+    group_headers = {}
+    for r_pos, report in enumerate(ordered):
+        group_headers[f"session-{r_pos}"] = f"\n━━━ Session ({report.therapy_type or therapy_label}) ━━━\n"
+        lines = []
+        goals_text = _goals_to_readable_text(report, None)
+        if goals_text:
+            lines.append(f"  Goal notes: {goals_text}\n")
+        if report.progress_notes and report.progress_notes.strip():
+            lines.append(f"  Progress notes: {report.progress_notes.strip()}\n")
+        if report.progress_level:
+            lines.append(f"  Progress level: {report.progress_level}\n")
+        for k, text in enumerate(lines):
+            # Newest sessions first
+            items.append(PromptItem(
+                text=text, group=f"session-{r_pos}", order=(r_pos, k), rank=(len(ordered) - 1 - r_pos, k)
+            ))
+
+    tail = f"\nSTART YOUR RESPONSE WITH: '{therapy_label} – Progress Summary'\n"
+    return assemble_prompt(
+        prompt, items, tail, budget=budget_tokens or prompt_token_budget(), group_headers=group_headers
+    )
@@ -1,125 +1,43 @@
 """
 Translation endpoint using CTranslate2 INT8 quantized NLLB-200 for Malayalam (5-10x faster)
-and Helsinki-NLP for other Indian languages
+and CTranslate2 INT8 Helsinki-NLP models for other Indian languages
 """
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from app.api.deps import get_current_user
+from app.ml import translation_models, translation_service
+from app.ml.translation_models import (
+    NLLB_LANGUAGE_CODES,
+    get_ct2_marian_model,
+    get_ct2_nllb_model,
+    get_model_for_language,
+)
+from app.ml.translation_postprocess import get_postprocessor, reload_glossaries
+from app.ml.translation_markup import MarkupPlan, normalize_title
+from app.ml.translation_segmenter import length_sorted_order, rejoin_line, segment_lines
 from app.models.user import User
+import json
 import logging
 import time
-import os
 import re
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Global cache for CTranslate2 models
-_ct2_translator = None
-_ct2_tokenizer = None
-_translation_model = None
-_tokenizer = None
-_device = None
-
-# Path for converted CTranslate2 model
-CT2_MODEL_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "..", "models", "nllb-200-distilled-600M-int8")
-
-# Standardized Malayalam terminology for clinical/therapy reporting
-MALAYALAM_CLINICAL_TERM_MAP = {
-    # Receptive Language
-    "അനുഭവശേഷി": "ഗ്രഹണഭാഷാ കഴിവ്",
-    "പതുക്കെ": "സാവധാനം",
-    "സംസാരിക്കുന്ന ഭാഷ": "സംസാരഭാഷ",
-    "മനസിലാക്കാൻ": "മനസ്സിലാക്കാൻ",
-    "ഗ്രഹണ ഭാഷാ കഴിവ്": "ഗ്രഹണഭാഷാ കഴിവ്",
-    "ഗ്രഹണ ഭാഷ": "ഗ്രഹണഭാഷ",
-    "ഗ്രഹണ കഴിവ്": "ഗ്രഹണഭാഷാ കഴിവ്",
-    "ധാരണ": "ഗ്രഹണശേഷി",
-    
-    # Visual cues
-    "വിഷ്വൽ സൂചനകൾ": "ദൃശ്യ സൂചനകൾ",
-    "വിഷ്വൽ സൂചന": "ദൃശ്യ സൂചന",
-    "വിഷ്വല്‍ സൂചന": "ദൃശ്യ സൂചന",
-    "വിഷ്വല്‍ സൂചനകൾ": "ദൃശ്യ സൂചനകൾ",
-    "visual cues": "ദൃശ്യ സൂചനകൾ",
-    
-    # Repetition terminology
-    "ആവർത്തിക്കേണ്ടിവന്നു": "ആവർത്തനം ആവശ്യമായി വന്നു",
-    "കൂടുതൽ ആവർത്തിക്കലും": "കൂടുതൽ ആവർത്തനവും",
-    
-    # Comprehension variants
-    "കമ്പ്രഹെൻഷൻ": "ഗ്രാഹ്യം",
-    "comprehension": "ഗ്രാഹ്യം",
-    
-    # OPT (Oral Motor) corrections
-    "ശ്വാസകോശ നിയന്ത്രണം": "ശ്വാസനിയന്ത്രണം",
-    "ശ്വാസകോശങ്ങൾ സംസാരിക്കാൻ": "വാചകങ്ങൾ സംസാരിക്കാൻ",
-    "ഒരു ശ്വാസം കൊണ്ട് ഒന്നിലധികം ശ്വാസകോശങ്ങൾ": "ഒരു ശ്വാസത്തിൽ ഒന്നിലധികം വാചകങ്ങൾ",
-    
-    # Expressive Language
-    "വാക്കാലുള്ള ഉത്ഭവം": "വാക്കാലുള്ള പ്രകടനം",
-    
-    # Pragmatic Language
-    "കണ്ണടച്ച്": "കണ്ണോട്ടം നിലനിർത്തി",
-    "സാമൂഹിക സംരംഭത്തിൽ": "സാമൂഹിക ഇടപെടലുകളുടെ ആരംഭത്തിൽ",
-    "പ്രായോഗിക ഭാഷാ കഴിവ്": "പ്രാഗ്മാറ്റിക് ഭാഷാ കഴിവ്",
-    
-    # Narrative Skills
-    "കഥാപാത്രങ്ങളുടെ കഴിവ്": "കഥ പറയാനുള്ള കഴിവ്",
-    
-    # Minor language improvements
-    "ശാന്തമായിത്തീർന്നു": "ശാന്തമായി മാറി",
-    "നിശബ്ദത": "നിശ്ശബ്ദത",
-    "സ്പോൺട്ടൻ സംസാര": "സ്വതന്ത്ര സംസാരത്തിൽ",
-}
-
-
-def _apply_critical_clinical_phrase_fixes(text: str) -> str:
-    """
-    Apply targeted fixes for critical logical/semantic errors that persist
-    after model translation but before validation.
-    """
-    normalized = text
-    
-    # Fix 1: Cause-effect error - reorder to show improvement WITH reduced repetition, not BECAUSE of it
-    normalized = re.sub(
-        r"അല്പം\s*കുറച്ച\s*ആവർത്തിക്കേണ്ടിവരുമ്പോൾ\s*അവൾ\s*മെച്ചപ്പെട്ട\s*(?:ഗ്രഹണശേഷി|ധാരണ)\s*കാണിച്ചു",
-        "കുറവ് ആവർത്തനത്തോടെ മെച്ചപ്പെട്ട ഗ്രഹണശേഷി അവൾ പ്രകടിപ്പിച്ചു",
-        normalized,
-    )
-    
-    # Fix 2: Inconsistency nuance - show that repetition need is variable, not constant
-    normalized = normalized.replace(
-        "സങ്കീർണ്ണമായ വാക്യങ്ങളുടെ ആവർത്തനവും വിശദീകരണവും ആവശ്യമായിരുന്നു",
-        "സങ്കീർണ്ണമായ വാക്യങ്ങൾക്കായുള്ള ആവർത്തനത്തിന്റെയും വിശദീകരണത്തിന്റെയും ആവശ്യം സ്ഥിരതയില്ലാത്തതായിരുന്നു",
-    )
-    
-    # Fix 3: Major logical error - avoid false conclusion of steady improvement
-    normalized = normalized.replace(
-        "ആവർത്തിക്കാനുള്ള ആവശ്യകതയും കുറയുന്നതു മൂലം പഠനകാലത്ത് അറിവ് മെച്ചപ്പെട്ടു",
-        "ഈ സ്ഥിരതയില്ലായ്മ കാരണം ഗ്രഹണഭാഷാ കഴിവിന്റെ വ്യക്തമായ പുരോഗതി പ്രവണത നിർണ്ണയിക്കുന്നത് ബുദ്ധിമുട്ടായി",
-    )
-    
-    return normalized
+# Precompiled patterns for validation / dedupe
+_DEDUPE_WHITESPACE = re.compile(r"\s+")
+# Zero-width joiners and punctuation are both outside [\w\u0d00-\u0d7f ]
+_DEDUPE_STRIP = re.compile(r"[^\w\u0d00-\u0d7f ]")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
 
 
 def _canonicalize_for_dedupe(text: str) -> str:
     """Create a loose canonical form so near-identical lines/sentences can be deduplicated."""
-    lowered = text.lower().strip()
-    lowered = re.sub(r"\s+", " ", lowered)
-    lowered = re.sub(r"[\u200b\u200c\u200d]", "", lowered)
-    lowered = re.sub(r"[^\w\u0d00-\u0d7f ]", "", lowered)
-    return lowered.strip()
-
-
-def _apply_malayalam_clinical_term_standardization(text: str) -> str:
-    """Apply deterministic terminology replacement for consistent report wording."""
-    normalized = text
-    for source_term, target_term in sorted(MALAYALAM_CLINICAL_TERM_MAP.items(), key=lambda kv: len(kv[0]), reverse=True):
-        normalized = normalized.replace(source_term, target_term)
-    return normalized
+    lowered = _DEDUPE_WHITESPACE.sub(" ", text.lower().strip())
+    return _DEDUPE_STRIP.sub("", lowered).strip()
 
 
 def _validate_malayalam_translation(source_text: str, translated_text: str) -> str:
@@ -150,44 +68,95 @@ def _validate_malayalam_translation(source_text: str, translated_text: str) -> s
 
     validated = "\n".join(unique_lines).strip()
 
-    source_sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", source_text.strip()) if s.strip()]
-    translated_sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", validated.strip()) if s.strip()]
+    translated_sentences = [s.strip() for s in _SENTENCE_SPLIT.split(validated.strip()) if s.strip()]
 
-    if source_sentences:
-        max_allowed = max(len(source_sentences) * 2, len(source_sentences) + 3)
-        if len(translated_sentences) > max_allowed:
-            validated = " ".join(translated_sentences[:max_allowed]).strip()
+    max_allowed = _max_translated_sentences(source_text)
+    if max_allowed and len(translated_sentences) > max_allowed:
+        validated = " ".join(translated_sentences[:max_allowed]).strip()
 
     return validated
 
 
+def _max_translated_sentences(source_text: str) -> int:
+    """Sentence budget for a translation before it counts as expanding beyond the source (0 = no limit)."""
+    source_sentences = [s.strip() for s in _SENTENCE_SPLIT.split(source_text.strip()) if s.strip()]
+    if not source_sentences:
+        return 0
+    return max(len(source_sentences) * 2, len(source_sentences) + 3)
+
+
+class _IncrementalMalayalamPostprocessor:
+    """
+    Line-at-a-time version of _postprocess_malayalam_clinical_text for streaming:
+    glossary + phrase fixes per line, duplicate-line removal and the sentence
+    budget tracked across the lines emitted so far.
+    """
+
+    def __init__(self, source_text: str):
+        self._processor = get_postprocessor("ml")
+        self._seen_lines = set()
+        self._remaining_sentences = _max_translated_sentences(source_text) or None
+
+    def process_line(self, translated_line: str) -> Optional[str]:
+        """Return the cleaned line, or None when it should not be emitted."""
+        if self._remaining_sentences is not None and self._remaining_sentences <= 0:
+            return None
+        line = self._processor.apply(translated_line) if self._processor else translated_line
+        line = line.strip()
+        if not line:
+            return None
+        canonical = _canonicalize_for_dedupe(line)
+        if canonical in self._seen_lines:
+            return None
+        self._seen_lines.add(canonical)
+
+        if self._remaining_sentences is not None:
+            sentences = [s.strip() for s in _SENTENCE_SPLIT.split(line) if s.strip()]
+            if len(sentences) > self._remaining_sentences:
+                line = " ".join(sentences[:self._remaining_sentences])
+            self._remaining_sentences -= len(sentences)
+        return line
+
+
 def _postprocess_malayalam_clinical_text(source_text: str, translated_text: str) -> str:
     """
     Post-processing pipeline for Malayalam clinical text:
-    1. Apply terminology standardization (locked glossary).
-    2. Apply critical phrase fixes (logic/semantic corrections).
-    3. Validate (deduplicate, scope check).
+    1. Apply terminology standardization and critical phrase fixes in one pass
+       (compiled glossary from app/data/glossaries/ml.json).
+    2. Validate (deduplicate, scope check).
     """
     if not translated_text:
         return translated_text
 
-    text = re.sub(r"[ \t]+", " ", translated_text)
-    text = _apply_malayalam_clinical_term_standardization(text)
-    text = _apply_critical_clinical_phrase_fixes(text)
+    processor = get_postprocessor("ml")
+    text = processor.apply(translated_text) if processor else translated_text
     return _validate_malayalam_translation(source_text, text)
 
+@router.get("/translation/ready")
+def translation_readiness():
+    """
+    Readiness probe for translation models (no auth, for load balancers).
+    Returns 503 until every preloaded model is ready, with per-model status
+    (missing/converted/converting/loading/ready/failed) and durations.
+    """
+    client = translation_service.get_client()
+    if client is not None:
+        try:
+            models = client.call("status")
+        except translation_service.TranslationServiceError as e:
+            return JSONResponse(status_code=503, content={"ready": False, "service_error": str(e), "models": {}})
+    else:
+        models = translation_models.model_status()
+    ready = bool(models) and all(info["status"] == "ready" for info in models.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "models": models},
+    )
+
 @router.post("/clear-translation-cache")
 async def clear_translation_cache(current_user: User = Depends(get_current_user)):
     """Force clear translation models cache - requires restart to take effect"""
-    global _ct2_translator, _ct2_tokenizer, _translation_model, _tokenizer, _device
-    
-    old_type = "CTranslate2" if _ct2_translator else ("Helsinki" if _translation_model else "None")
-    
-    _ct2_translator = None
-    _ct2_tokenizer = None
-    _translation_model = None
-    _tokenizer = None
-    _device = None
+    old_type = translation_models.clear_cache()
     
     logger.info(f"Translation model cache cleared (was: {old_type})")
     return {
@@ -196,6 +165,13 @@ async def clear_translation_cache(current_user: User = Depends(get_current_user)
         "previous_model": old_type
     }
 
+@router.post("/reload-translation-glossaries")
+async def reload_translation_glossaries(current_user: User = Depends(get_current_user)):
+    """Recompile post-processing glossaries from app/data/glossaries (also picked up automatically on file change)"""
+    loaded = reload_glossaries()
+    logger.info(f"Translation glossaries reloaded: {loaded}")
+    return {"status": "success", "glossaries": loaded}
+
 # Translation request model
 class TranslationRequest(BaseModel):
     text: str
@@ -207,136 +183,385 @@ class TranslationResponse(BaseModel):
     source_language: str
     target_language: str
 
+# Text fields of a TherapyAISummaryResponse translated by /translate/document
+SUMMARY_TRANSLATABLE_FIELDS = [
+    "summary",
+    "brief_overview",
+    "start_date_analysis",
+    "end_date_analysis",
+    "recommendations",
+]
+
+class DocumentTranslationRequest(BaseModel):
+    document: Dict[str, Any]  # e.g. a whole TherapyAISummaryResponse
+    target_language: str
+    source_language: str = "eng_Latn"
+    fields: Optional[List[str]] = None  # defaults to SUMMARY_TRANSLATABLE_FIELDS
 
-def _convert_nllb_to_ct2():
-    """Convert NLLB model to CTranslate2 INT8 format (one-time operation)"""
-    import ctranslate2
-    
-    logger.info("Converting NLLB-200-distilled-600M to CTranslate2 INT8 format...")
-    logger.info("This is a one-time operation and will take a few minutes...")
+class DocumentTranslationResponse(BaseModel):
+    document: Dict[str, Any]
+    translated_fields: List[str]
+    source_language: str
+    target_language: str
+
+
+# Longer texts are truncated before translation (AI summaries are typically 100-2000 chars)
+MAX_TRANSLATION_CHARS = 5000
+# Segments per CTranslate2 batch for /translate/stream (first event arrives after one batch)
+STREAM_BATCH_SIZE = 4
+# Tokens per CTranslate2 batch for length-sorted sentence segments
+SEGMENT_BATCH_TOKENS = 1024
+# Section titles not in the glossary, translated once: (language, normalized title) -> translation
+TITLE_CACHE_SIZE = 2048
+_title_cache: Dict[tuple, str] = {}
+
+# Map IndicTrans2 language codes to ISO codes
+LANGUAGE_MAP = {
+    "mal_Mlym": "ml",  # Malayalam
+    "hin_Deva": "hi",  # Hindi
+    "tam_Tamil": "ta",  # Tamil
+    "tel_Telu": "te",  # Telugu
+    "kan_Knda": "kn",  # Kannada
+    "ben_Beng": "bn",  # Bengali
+    "guj_Gujr": "gu",  # Gujarati
+    "mar_Deva": "mr",  # Marathi
+    "pan_Guru": "pa",  # Punjabi
+    "ory_Orya": "or",  # Odia
+}
+
+
+def _split_lines_for_translation(text: str):
+    """Return (lines, line_map) where line_map holds (index, content) for non-empty lines."""
+    # PRESERVE FORMATTING: Split by lines to maintain structure (headings, bullets, etc.)
+    # This is crucial for preserving markdown formatting in therapy reports
+    lines = text.split('\n')
     
-    start_time = time.time()
+    # Filter and prepare lines (preserve structure)
+    line_map = []  # (index, content) for non-empty lines
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped:
+            # Keep line as-is to preserve formatting
+            line_map.append((i, stripped))
+    return lines, line_map
+
+
+def _tokenize_for_ct2(tokenizer, contents):
+    """FAST batch tokenization into the token strings CTranslate2 expects."""
+    return [
+        tokenizer.convert_ids_to_tokens(
+            tokenizer(content, return_tensors=None, add_special_tokens=True)["input_ids"]
+        )
+        for content in contents
+    ]
+
+
+def _decode_ct2_result(tokenizer, result, target_prefix: Optional[str] = None) -> str:
+    """Decode the best hypothesis, dropping the NLLB target language token."""
+    hypothesis = result.hypotheses[0]
+    if target_prefix and hypothesis and hypothesis[0] == target_prefix:
+        hypothesis = hypothesis[1:]
+    return tokenizer.decode(tokenizer.convert_tokens_to_ids(hypothesis), skip_special_tokens=True)
+
+
+def _translate_contents_ct2(
+    translator,
+    tokenizer,
+    contents,
+    target_prefix: Optional[str] = None,
+    *,
+    beam_size: int = 1,  # Greedy = fastest
+    max_batch_size: int = SEGMENT_BATCH_TOKENS,
+    batch_type: str = "tokens",  # Batch by tokens for better GPU/CPU utilization
+    stats: Optional[dict] = None,
+):
+    """
+    Translate a list of single-line strings with CTranslate2.
+    Long lines are split into sentences; segments are sorted by length and
+    batched by tokens (less padding), then rejoined per line. The decoding
+    options are only overridden by benchmark_translation.py, which also passes
+    `stats` to count segments and output tokens.
+    """
+    if not contents:
+        return []
     
-    # Create models directory if it doesn't exist
-    os.makedirs(os.path.dirname(CT2_MODEL_PATH), exist_ok=True)
+    segments, layout = segment_lines(contents)
+    all_source_tokens = _tokenize_for_ct2(tokenizer, segments)
+    order = length_sorted_order(all_source_tokens)
     
-    # Convert using ctranslate2 converter
-    ctranslate2.converters.TransformersConverter(
-        "facebook/nllb-200-distilled-600M"
-    ).convert(
-        CT2_MODEL_PATH,
-        quantization="int8",  # INT8 quantization for 4x speed + smaller size
-        force=True
+    results = translator.translate_batch(
+        [all_source_tokens[i] for i in order],
+        target_prefix=[[target_prefix]] * len(segments) if target_prefix else None,
+        beam_size=beam_size,
+        max_decoding_length=400,
+        replace_unknowns=True,
+        max_batch_size=max_batch_size,
+        batch_type=batch_type,
     )
+    if stats is not None:
+        stats["segments"] = stats.get("segments", 0) + len(segments)
+        stats["output_tokens"] = stats.get("output_tokens", 0) + sum(len(r.hypotheses[0]) for r in results)
     
-    elapsed = time.time() - start_time
-    logger.info(f"✓ Model converted to CTranslate2 INT8 in {elapsed:.1f}s")
-    logger.info(f"  Saved to: {CT2_MODEL_PATH}")
+    translated_segments = [''] * len(segments)
+    for position, segment_idx in enumerate(order):
+        translated_segments[segment_idx] = _decode_ct2_result(tokenizer, results[position], target_prefix)
+    
+    return [rejoin_line(line_layout, segments, translated_segments) for line_layout in layout]
+
+
+def _title_lookup(target_lang: str):
+    """Section title translations: glossary first, then titles the model already translated."""
+    processor = get_postprocessor(target_lang)
+
+    def lookup(title: str) -> Optional[str]:
+        if processor is not None:
+            translated = processor.lookup_title(title)
+            if translated is not None:
+                return translated
+        return _title_cache.get((target_lang, normalize_title(title)))
+
+    return lookup
 
 
-def get_ct2_nllb_model():
+def _remember_titles(target_lang: str, titles: Dict[str, str]) -> None:
+    if len(_title_cache) + len(titles) > TITLE_CACHE_SIZE:
+        _title_cache.clear()
+    for title, translated in titles.items():
+        if translated.strip():
+            _title_cache[(target_lang, normalize_title(title))] = translated.strip()
+
+
+def _translate_contents(
+    translator, tokenizer, contents, target_prefix: Optional[str], target_lang: str, **decode_options
+):
     """
-    Load CTranslate2 INT8 quantized NLLB model for Malayalam translation
-    MAXIMUM SPEED: Optimized for fastest possible inference
+    Markup-aware _translate_contents_ct2: bullets, heading and title markers are
+    kept out of the model, inline bold travels as sentinels, section titles come from the glossary
+    (or are translated once and cached), and only unique text spans are decoded.
     """
-    global _ct2_translator, _ct2_tokenizer, _device
+    plan = MarkupPlan(contents, _title_lookup(target_lang))
+    translated_inputs = _translate_contents_ct2(translator, tokenizer, plan.inputs, target_prefix, **decode_options)
+    _remember_titles(target_lang, plan.translated_titles(translated_inputs))
+    return [plan.rebuild(line_idx, translated_inputs) for line_idx in range(len(plan))]
+
+
+def _translate_lines_ct2(
+    translator, tokenizer, text: str, target_lang: str, target_prefix: Optional[str] = None, **decode_options
+) -> str:
+    """
+    Translate text line-by-line in one CTranslate2 batch, preserving line structure.
+    `target_prefix` is the NLLB target language token; Marian models need none.
+    """
+    lines, line_map = _split_lines_for_translation(text)
+    if not line_map:
+        return ""
     
-    if _ct2_translator is None:
-        import ctranslate2
-        from transformers import NllbTokenizerFast
-        import torch
-        import multiprocessing
-        
-        start_time = time.time()
-        
-        # Check if converted model exists, if not convert it
-        if not os.path.exists(CT2_MODEL_PATH):
-            _convert_nllb_to_ct2()
-        
-        # Determine device
-        _device = "cuda" if torch.cuda.is_available() else "cpu"
-        
-        # Get optimal thread count
-        cpu_count = multiprocessing.cpu_count()
-        
-        logger.info(f"Loading CTranslate2 INT8 NLLB model on {_device} with {cpu_count} threads...")
-        
-        # MAXIMUM SPEED settings
-        _ct2_translator = ctranslate2.Translator(
-            CT2_MODEL_PATH,
-            device=_device,
-            compute_type="int8",
-            inter_threads=cpu_count,
-            intra_threads=2,  # Some intra-op parallelism helps
-        )
-        
-        # Use FAST tokenizer (2-5x faster tokenization)
-        _ct2_tokenizer = NllbTokenizerFast.from_pretrained(
-            "facebook/nllb-200-distilled-600M",
-            use_fast=True
+    logger.info(f"Translating {len(line_map)} lines (preserving structure)")
+    
+    translated_lines = _translate_contents(
+        translator, tokenizer, [content for _, content in line_map], target_prefix, target_lang, **decode_options
+    )
+    
+    # Reconstruct with original line structure
+    result_lines = [''] * len(lines)
+    for idx, (orig_idx, _) in enumerate(line_map):
+        result_lines[orig_idx] = translated_lines[idx]
+    
+    return '\n'.join(result_lines)
+
+
+def _translate_marian_eager(text: str, target_lang: str) -> str:
+    """Eager PyTorch Marian translation - used only when no converted CT2 model exists."""
+    import torch
+    
+    # Get language-specific Helsinki model
+    model, tokenizer, device = get_model_for_language(target_lang)
+    
+    # Tokenize input
+    inputs = tokenizer(
+        text,
+        return_tensors="pt",
+        padding=False,
+        truncation=True,
+        max_length=512
+    ).to(device)
+    
+    logger.info(f"Input tokens: {inputs['input_ids'].shape[1]}")
+    
+    # OPTIMIZED: Use greedy decoding for speed
+    with torch.no_grad(), torch.cuda.amp.autocast(enabled=(device == "cuda")):
+        outputs = model.generate(
+            **inputs,
+            max_length=512,
+            num_beams=1,  # Greedy decoding - much faster
+            do_sample=False,
+            use_cache=True,
         )
-        
-        # Warm up the model (first inference is slow)
-        logger.info("Warming up model...")
-        _ct2_tokenizer.src_lang = "eng_Latn"
-        warmup_tokens = _ct2_tokenizer("Hello", return_tensors=None)["input_ids"]
-        warmup_tokens = _ct2_tokenizer.convert_ids_to_tokens(warmup_tokens)
-        _ct2_translator.translate_batch([warmup_tokens], target_prefix=[["mal_Mlym"]], beam_size=1)
-        
-        load_time = time.time() - start_time
-        logger.info(f"✓ CTranslate2 INT8 NLLB model loaded and warmed up in {load_time:.1f}s")
     
-    return _ct2_translator, _ct2_tokenizer, _device
+    return tokenizer.decode(outputs[0], skip_special_tokens=True)
 
 
-def get_model_for_language(target_lang):
-    """Get or load the appropriate model for the target language (non-Malayalam)
-    OPTIMIZED: Uses half-precision on GPU and eval mode
+def _resolve_translation_backend(target_lang: str):
     """
-    from transformers import MarianMTModel, MarianTokenizer
-    import torch
+    Return (backend, translator, tokenizer, target_prefix) for a target language.
+    backend is "nllb", "ct2_marian" or "marian" (eager PyTorch; translator/tokenizer are None).
+    """
+    backend = translation_models.select_backend(target_lang)
     
-    global _translation_model, _tokenizer, _device
+    if backend == "ct2_marian":
+        ct2_marian = get_ct2_marian_model(target_lang)
+        if ct2_marian is not None:
+            translator, tokenizer, _ = ct2_marian
+            return backend, translator, tokenizer, None
+        backend = "marian"
     
-    if _translation_model is None:
-        _translation_model = {}
-        _tokenizer = {}
+    if backend == "nllb":
+        translator, tokenizer, _ = get_ct2_nllb_model()
+        # Set source language for tokenizer
+        tokenizer.src_lang = "eng_Latn"
+        return backend, translator, tokenizer, NLLB_LANGUAGE_CODES[target_lang]
     
-    if _device is None:
-        _device = "cuda" if torch.cuda.is_available() else "cpu"
+    return backend, None, None, None
+
+
+def iter_raw_translated_lines(text: str, target_lang: str):
+    """
+    Yield (original line index, translated line) as translation batches complete,
+    without post-processing. Used by /translate/stream, in-process or in the
+    translation service.
+    """
+    backend, translator, tokenizer, target_prefix = _resolve_translation_backend(target_lang)
     
-    # Model mapping for each language (excluding Malayalam - uses NLLB)
-    model_map = {
-        "hi": "Helsinki-NLP/opus-mt-en-hi",  # Hindi
-        "bn": "Helsinki-NLP/opus-mt-en-bn",  # Bengali  
-        "ta": "Helsinki-NLP/opus-mt-en-ta",  # Tamil
-        "te": "Helsinki-NLP/opus-mt-en-te",  # Telugu
-        "mr": "Helsinki-NLP/opus-mt-en-mr",  # Marathi
-        "gu": "Helsinki-NLP/opus-mt-en-gu",  # Gujarati
-        # Fallback for others
-        "default": "Helsinki-NLP/opus-mt-en-mul"
-    }
+    if backend == "marian":
+        # Eager PyTorch has no iterable API - translate everything, then emit lines
+        translated_text = _translate_marian_eager(text, target_lang)
+        for idx, line in enumerate(translated_text.split("\n")):
+            if line.strip():
+                yield idx, line
+        return
     
-    model_name = model_map.get(target_lang, model_map["default"])
+    _, line_map = _split_lines_for_translation(text.strip())
+    # Markup stays out of the model; long spans go out as sentence segments. A line
+    # is emitted once every span it needs has been translated.
+    plan = MarkupPlan([content for _, content in line_map], _title_lookup(target_lang))
+    segments, layout = segment_lines(plan.inputs)
+    source_tokens = _tokenize_for_ct2(tokenizer, segments)
+    results = translator.translate_iterable(
+        source_tokens,
+        target_prefix=[[target_prefix]] * len(source_tokens) if target_prefix else None,
+        max_batch_size=STREAM_BATCH_SIZE,
+        batch_type="examples",
+        beam_size=1,  # Greedy = fastest
+        max_decoding_length=400,
+        replace_unknowns=True,
+    )
+    translated_segments = []
+    translated_inputs = []
+    line_position = 0
+    while line_position < len(plan) and plan.last_input(line_position) < 0:
+        yield line_map[line_position][0], plan.rebuild(line_position, translated_inputs)
+        line_position += 1
+    for result in results:
+        translated_segments.append(_decode_ct2_result(tokenizer, result, target_prefix))
+        while len(translated_inputs) < len(layout) and layout[len(translated_inputs)][-1][0] < len(translated_segments):
+            translated_inputs.append(rejoin_line(layout[len(translated_inputs)], segments, translated_segments))
+        while line_position < len(plan) and plan.last_input(line_position) < len(translated_inputs):
+            yield line_map[line_position][0], plan.rebuild(line_position, translated_inputs)
+            line_position += 1
+    _remember_titles(target_lang, plan.translated_titles(translated_inputs))
+
+
+def translate_plain_text(text: str, target_language: str) -> str:
+    """
+    Translate English text to `target_language` (IndicTrans2-style code such as
+    "mal_Mlym", or an ISO code) with the best available backend.
+    Shared by /translate and background jobs (e.g. notification pre-translation).
+    Runs in the shared translation service when TRANSLATION_SERVICE_ADDRESS is set.
+    """
+    client = translation_service.get_client()
+    if client is not None:
+        return client.call("translate", text=text, target_language=target_language)
+    return translate_plain_text_local(text, target_language)
+
+
+def translate_plain_text_local(text: str, target_language: str) -> str:
+    """translate_plain_text with the models loaded in this process."""
+    start_time = time.time()
+    target_lang = LANGUAGE_MAP.get(target_language, target_language)
+    backend, translator, tokenizer, target_prefix = _resolve_translation_backend(target_lang)
     
-    # Load model if not cached
-    if target_lang not in _translation_model:
-        logger.info(f"Loading model for {target_lang}: {model_name}")
-        _tokenizer[target_lang] = MarianTokenizer.from_pretrained(model_name)
-        
-        use_half = _device == "cuda"
-        if use_half:
-            _translation_model[target_lang] = MarianMTModel.from_pretrained(
-                model_name,
-                torch_dtype=torch.float16
-            ).to(_device)
-        else:
-            _translation_model[target_lang] = MarianMTModel.from_pretrained(model_name).to(_device)
+    if backend == "nllb":
+        logger.info(f"Using CTranslate2 INT8 NLLB-200 for {target_lang} (ultra-fast)")
+        translated_text = _translate_lines_ct2(translator, tokenizer, text.strip(), target_lang, target_prefix=target_prefix)
+        if translated_text and target_lang == "ml":
+            translated_text = _postprocess_malayalam_clinical_text(text, translated_text)
         
-        _translation_model[target_lang].eval()
-        logger.info(f"Model for {target_lang} loaded on {_device} (half={use_half})")
+        elapsed = time.time() - start_time
+        logger.info(f"CTranslate2 INT8 Translation complete: {len(translated_text)} chars in {elapsed:.2f}s")
+    elif backend == "ct2_marian":
+        logger.info(f"Using CTranslate2 INT8 Helsinki-NLP model for {target_lang}")
+        translated_text = _translate_lines_ct2(translator, tokenizer, text.strip(), target_lang)
+        elapsed = time.time() - start_time
+        logger.info(f"CTranslate2 INT8 Helsinki Translation complete: {len(translated_text)} chars in {elapsed:.2f}s")
+    else:
+        logger.warning(f"No converted CTranslate2 model for {target_lang}; using eager PyTorch Helsinki-NLP")
+        translated_text = _translate_marian_eager(text, target_lang)
+        elapsed = time.time() - start_time
+        logger.info(f"Helsinki Translation complete: {len(translated_text)} chars in {elapsed:.2f}s")
     
-    return _translation_model[target_lang], _tokenizer[target_lang], _device
+    return translated_text
+
+
+def translate_document_fields(fields: Dict[str, str], target_language: str) -> Dict[str, str]:
+    """
+    Translate several text fields of one document together.
+    Non-empty lines are deduplicated across all fields (headings such as
+    "**Recommendations**" and repeated sentences are translated once) and sent to
+    the model in a single batch; each field is then rebuilt with its own line
+    structure and post-processed on its own.
+    """
+    client = translation_service.get_client()
+    if client is not None:
+        return client.call("translate_document", fields=fields, target_language=target_language)
+    return translate_document_fields_local(fields, target_language)
+
+
+def translate_document_fields_local(fields: Dict[str, str], target_language: str) -> Dict[str, str]:
+    """translate_document_fields with the models loaded in this process."""
+    target_lang = LANGUAGE_MAP.get(target_language, target_language)
+    backend, translator, tokenizer, target_prefix = _resolve_translation_backend(target_lang)
+    
+    if backend == "marian":
+        # Eager PyTorch fallback translates whole texts; no batching to gain
+        return {name: _translate_marian_eager(text, target_lang) if text.strip() else text
+                for name, text in fields.items()}
+    
+    split_fields = {name: _split_lines_for_translation(text) for name, text in fields.items()}
+    unique_contents = list(dict.fromkeys(
+        content for _, line_map in split_fields.values() for _, content in line_map
+    ))
+    total_lines = sum(len(line_map) for _, line_map in split_fields.values())
+    logger.info(f"Document translation: {len(fields)} fields, {total_lines} lines, {len(unique_contents)} unique")
+    
+    translated_contents = dict(zip(
+        unique_contents,
+        _translate_contents(translator, tokenizer, unique_contents, target_prefix, target_lang),
+    ))
+    
+    translated_fields = {}
+    for name, (lines, line_map) in split_fields.items():
+        if not line_map:
+            translated_fields[name] = fields[name]
+            continue
+        result_lines = [''] * len(lines)
+        for orig_idx, content in line_map:
+            result_lines[orig_idx] = translated_contents[content]
+        translated = '\n'.join(result_lines)
+        if target_lang == "ml":
+            translated = _postprocess_malayalam_clinical_text(fields[name], translated)
+        translated_fields[name] = translated
+    return translated_fields
+
 
 @router.post("/translate", response_model=TranslationResponse)
 async def translate_text(
@@ -345,19 +570,23 @@ async def translate_text(
 ):
     """
     Translate text from English to Indian languages
-    ULTRA-FAST: Uses CTranslate2 INT8 quantized NLLB-200 (5-10x faster than PyTorch)
+    ULTRA-FAST: Uses CTranslate2 INT8 models for every language (5-10x faster than PyTorch)
     
     Supported language codes:
     - mal_Mlym: Malayalam (ml) - Uses CTranslate2 INT8 NLLB-200
-    - hin_Deva: Hindi (hi) - Uses Helsinki-NLP
-    - tam_Tamil: Tamil (ta) - Uses Helsinki-NLP
-    - tel_Telu: Telugu (te) - Uses Helsinki-NLP
-    - kan_Knda: Kannada (kn) - Uses Helsinki-NLP
-    - ben_Beng: Bengali (bn) - Uses Helsinki-NLP
-    - guj_Gujr: Gujarati (gu) - Uses Helsinki-NLP
-    - mar_Deva: Marathi (mr) - Uses Helsinki-NLP
-    - pan_Guru: Punjabi (pa) - Uses Helsinki-NLP
-    - ory_Orya: Odia (or) - Uses Helsinki-NLP
+    - hin_Deva: Hindi (hi) - Uses CTranslate2 INT8 Helsinki-NLP
+    - tam_Tamil: Tamil (ta) - Uses CTranslate2 INT8 Helsinki-NLP
+    - tel_Telu: Telugu (te) - Uses CTranslate2 INT8 Helsinki-NLP
+    - kan_Knda: Kannada (kn) - Uses CTranslate2 INT8 Helsinki-NLP
+    - ben_Beng: Bengali (bn) - Uses CTranslate2 INT8 Helsinki-NLP
+    - guj_Gujr: Gujarati (gu) - Uses CTranslate2 INT8 Helsinki-NLP
+    - mar_Deva: Marathi (mr) - Uses CTranslate2 INT8 Helsinki-NLP
+    - pan_Guru: Punjabi (pa) - Uses CTranslate2 INT8 Helsinki-NLP
+    - ory_Orya: Odia (or) - Uses CTranslate2 INT8 Helsinki-NLP
+    
+    With TRANSLATION_ROUTE=nllb every language goes through the NLLB model instead.
+    Helsinki-NLP models fall back to eager PyTorch until converted with
+    `python convert_translation_models.py`.
     """
     try:
         start_time = time.time()
@@ -367,134 +596,13 @@ async def translate_text(
         if not request.text.strip():
             raise HTTPException(status_code=400, detail="Text cannot be empty")
         
-        # Validate text length (AI summaries are typically 100-2000 chars)
-        if len(request.text) > 5000:
+        # Validate text length
+        if len(request.text) > MAX_TRANSLATION_CHARS:
             logger.warning(f"Large text received: {len(request.text)} chars")
-            request.text = request.text[:5000]
-            logger.info("Text truncated to 5000 characters")
-        
-        # Map IndicTrans2 language codes to ISO codes
-        language_map = {
-            "mal_Mlym": "ml",  # Malayalam
-            "hin_Deva": "hi",  # Hindi
-            "tam_Tamil": "ta",  # Tamil
-            "tel_Telu": "te",  # Telugu
-            "kan_Knda": "kn",  # Kannada
-            "ben_Beng": "bn",  # Bengali
-            "guj_Gujr": "gu",  # Gujarati
-            "mar_Deva": "mr",  # Marathi
-            "pan_Guru": "pa",  # Punjabi
-            "ory_Orya": "or",  # Odia
-        }
-        
-        target_lang = language_map.get(request.target_language, request.target_language)
+            request.text = request.text[:MAX_TRANSLATION_CHARS]
+            logger.info(f"Text truncated to {MAX_TRANSLATION_CHARS} characters")
         
-        # Use CTranslate2 INT8 NLLB for Malayalam, Helsinki-NLP for others
-        if target_lang == "ml":
-            logger.info("Using CTranslate2 INT8 NLLB-200 for Malayalam (ultra-fast)")
-            translator, tokenizer, device = get_ct2_nllb_model()
-            
-            # NLLB language codes
-            src_lang = "eng_Latn"
-            tgt_lang = "mal_Mlym"
-            
-            # Set source language for tokenizer
-            tokenizer.src_lang = src_lang
-            
-            text_to_translate = request.text.strip()
-            
-            # PRESERVE FORMATTING: Split by lines to maintain structure (headings, bullets, etc.)
-            # This is crucial for preserving markdown formatting in therapy reports
-            lines = text_to_translate.split('\n')
-            
-            if not lines or (len(lines) == 1 and not lines[0].strip()):
-                translated_text = ""
-            else:
-                # Filter and prepare lines (preserve structure)
-                line_map = []  # (index, content) for non-empty lines
-                for i, line in enumerate(lines):
-                    stripped = line.strip()
-                    if stripped:
-                        # Keep line as-is to preserve formatting
-                        line_map.append((i, stripped))
-                
-                if not line_map:
-                    translated_text = ""
-                else:
-                    logger.info(f"Translating {len(line_map)} lines (preserving structure)")
-                    
-                    # FAST batch tokenization using list comprehension
-                    all_source_tokens = [
-                        tokenizer.convert_ids_to_tokens(
-                            tokenizer(content, return_tensors=None, add_special_tokens=True)["input_ids"]
-                        )
-                        for _, content in line_map
-                    ]
-                    
-                    # Single optimized batch call
-                    results = translator.translate_batch(
-                        all_source_tokens,
-                        target_prefix=[[tgt_lang]] * len(line_map),
-                        beam_size=1,  # Greedy = fastest
-                        max_decoding_length=400,
-                        replace_unknowns=True,
-                        max_batch_size=0,  # 0 = no limit, process all at once
-                        batch_type="tokens",  # Batch by tokens for better GPU/CPU utilization
-                    )
-                    
-                    # Fast batch decode using list comprehension
-                    translated_lines = [
-                        tokenizer.decode(
-                            tokenizer.convert_tokens_to_ids(
-                                r.hypotheses[0][1:] if r.hypotheses[0] and r.hypotheses[0][0] == tgt_lang else r.hypotheses[0]
-                            ),
-                            skip_special_tokens=True
-                        )
-                        for r in results
-                    ]
-                    
-                    # Reconstruct with original line structure
-                    result_lines = [''] * len(lines)
-                    for idx, (orig_idx, _) in enumerate(line_map):
-                        result_lines[orig_idx] = translated_lines[idx]
-                    
-                    translated_text = '\n'.join(result_lines)
-
-                    translated_text = _postprocess_malayalam_clinical_text(request.text, translated_text)
-            
-            elapsed = time.time() - start_time
-            logger.info(f"CTranslate2 INT8 Translation complete: {len(translated_text)} chars in {elapsed:.2f}s")
-        else:
-            logger.info(f"Using Helsinki-NLP model for translation to {target_lang}")
-            import torch
-            
-            # Get language-specific Helsinki model
-            model, tokenizer, device = get_model_for_language(target_lang)
-            
-            # Tokenize input
-            inputs = tokenizer(
-                request.text,
-                return_tensors="pt",
-                padding=False,
-                truncation=True,
-                max_length=512
-            ).to(device)
-            
-            logger.info(f"Input tokens: {inputs['input_ids'].shape[1]}")
-            
-            # OPTIMIZED: Use greedy decoding for speed
-            with torch.no_grad(), torch.cuda.amp.autocast(enabled=(device == "cuda")):
-                outputs = model.generate(
-                    **inputs,
-                    max_length=512,
-                    num_beams=1,  # Greedy decoding - much faster
-                    do_sample=False,
-                    use_cache=True,
-                )
-            
-            translated_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
-            elapsed = time.time() - start_time
-            logger.info(f"Helsinki Translation complete: {len(translated_text)} chars in {elapsed:.2f}s")
+        translated_text = translate_plain_text(request.text, request.target_language)
         
         logger.info(f"Translation completed successfully in {time.time() - start_time:.2f}s")
         logger.info(f"Translated text preview: {translated_text[:100]}...")
@@ -515,3 +623,120 @@ async def translate_text(
     except Exception as e:
         logger.error(f"Translation error: {e}")
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
+
+
+@router.post("/translate/document", response_model=DocumentTranslationResponse)
+def translate_document(
+    request: DocumentTranslationRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Translate the text fields of a whole AI summary (TherapyAISummaryResponse) in
+    one round-trip. Identical lines across fields are translated once and all
+    fields share a single model batch. Other keys (improvement_metrics,
+    date_range, ...) are returned unchanged.
+    """
+    try:
+        start_time = time.time()
+        field_names = request.fields or SUMMARY_TRANSLATABLE_FIELDS
+        fields = {}
+        for name in field_names:
+            value = request.document.get(name)
+            if isinstance(value, str) and value.strip():
+                # Same per-text limit as /translate
+                fields[name] = value[:MAX_TRANSLATION_CHARS]
+        
+        if not fields:
+            raise HTTPException(status_code=400, detail="Document has no text to translate")
+        
+        logger.info(
+            f"Document translation request from user {current_user.username} to {request.target_language}: "
+            f"{', '.join(fields)}"
+        )
+        translated_fields = translate_document_fields(fields, request.target_language)
+        logger.info(f"Document translation completed in {time.time() - start_time:.2f}s")
+        
+        return DocumentTranslationResponse(
+            document={**request.document, **translated_fields},
+            translated_fields=list(translated_fields),
+            source_language=request.source_language,
+            target_language=request.target_language,
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Document translation error: {e}")
+        raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
+
+
+@router.post("/translate/stream")
+def translate_text_stream(
+    request: TranslationRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Streaming variant of /translate (Server-Sent Events).
+
+    Lines are translated with CTranslate2's iterable API in small batches and each
+    translated line is sent as soon as its batch completes:
+    - event: line      data: {"index": <original line index>, "text": "..."}
+    - event: complete  data: {"translated_text": "...", "source_language": ..., "target_language": ...}
+    - event: error     data: {"message": "..."}
+    Malayalam post-processing runs per line as lines arrive.
+    """
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    
+    text = request.text[:MAX_TRANSLATION_CHARS]
+    target_lang = LANGUAGE_MAP.get(request.target_language, request.target_language)
+    logger.info(f"Streaming translation request from user {current_user.username} to {request.target_language}")
+
+    def event_stream():
+        start_time = time.time()
+        try:
+            client = translation_service.get_client()
+            if client is not None:
+                raw_lines = client.stream("translate_lines_stream", text=text, target_lang=target_lang)
+            else:
+                raw_lines = iter_raw_translated_lines(text, target_lang)
+            postprocessor = _IncrementalMalayalamPostprocessor(text) if target_lang == "ml" else None
+            
+            result_lines = {}
+            for orig_idx, translated_line in raw_lines:
+                if postprocessor is not None:
+                    translated_line = postprocessor.process_line(translated_line)
+                    if translated_line is None:
+                        continue
+                if not result_lines:
+                    logger.info(f"First streamed line after {time.time() - start_time:.2f}s")
+                result_lines[orig_idx] = translated_line
+                yield f"event: line\ndata: {json.dumps({'index': orig_idx, 'text': translated_line}, ensure_ascii=False)}\n\n"
+            
+            if postprocessor is not None:
+                # Match /translate: validated Malayalam output has no blank lines
+                translated_text = "\n".join(result_lines[idx] for idx in sorted(result_lines))
+            else:
+                line_count = max(result_lines) + 1 if result_lines else 0
+                translated_text = "\n".join(result_lines.get(idx, "") for idx in range(line_count))
+            
+            logger.info(f"Streaming translation complete in {time.time() - start_time:.2f}s")
+            complete = {
+                "translated_text": translated_text,
+                "source_language": request.source_language,
+                "target_language": request.target_language,
+            }
+            yield f"event: complete\ndata: {json.dumps(complete, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            logger.exception("Streaming translation failed")
+            yield f"event: error\ndata: {json.dumps({'message': str(e)})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
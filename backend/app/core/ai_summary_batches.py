@@ -0,0 +1,245 @@
+"""
+Class-wide AI summary batches.
+
+POST /therapy-reports/summary/ai/batches (or batch_ai_summaries.py) stores one
+batch row plus one item per student and starts a runner thread. The runner
+works through the pending items with AI_BATCH_CONCURRENCY workers; before an
+uncached summary is generated it takes one token per router call from a
+process-wide token bucket (AI_BATCH_ROUTER_CALLS_PER_MINUTE, bursts of
+AI_BATCH_ROUTER_BURST), so a whole class cannot starve interactive requests of
+router quota. Each item's result, error and status are committed as soon as it
+finishes; a batch interrupted by a restart is resumed by `start_batch_runners()`
+and only its unfinished students are generated again.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Router calls per generated summary: overview, start, end, recommendations, main summary
+CALLS_PER_SUMMARY = 5
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `capacity` banked."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = max(rate, 1e-6)
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0, stop: Optional[threading.Event] = None) -> bool:
+        """Block until `tokens` are available and take them; False if `stop` was set first."""
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            if stop is None:
+                time.sleep(wait)
+            elif stop.wait(wait):
+                return False
+
+
+router_bucket = TokenBucket(
+    rate=settings.AI_BATCH_ROUTER_CALLS_PER_MINUTE / 60.0,
+    capacity=settings.AI_BATCH_ROUTER_BURST,
+)
+
+# Set on shutdown: runners stop claiming items and release the ones in flight
+_stop = threading.Event()
+# Batches with a runner in this process
+_runners: Dict[str, threading.Thread] = {}
+_runners_lock = threading.Lock()
+
+
+def resolve_students(
+    db, *, class_name: Optional[str] = None, student_codes: Sequence[str] = ()
+) -> Tuple[List[Tuple[int, str]], List[str]]:
+    """(student db id, student code) pairs for a class and/or explicit student codes, plus unknown codes."""
+    from app.models.student import Student
+
+    students: Dict[int, str] = {}
+    if class_name:
+        rows = (
+            db.query(Student.id, Student.student_id)
+            .filter(Student.class_name == class_name)
+            .order_by(Student.student_id)
+            .all()
+        )
+        students.update(rows)
+    missing = []
+    codes = list(dict.fromkeys(student_codes))
+    if codes:
+        rows = dict(
+            db.query(Student.student_id, Student.id).filter(Student.student_id.in_(codes)).all()
+        )
+        for code in codes:
+            if code in rows:
+                students[rows[code]] = code
+            else:
+                missing.append(code)
+    return list(students.items()), missing
+
+
+def _run_item(item_id: int, stop: threading.Event, on_item: Optional[Callable] = None) -> None:
+    # Imported here: the endpoint module imports this one
+    from fastapi import HTTPException
+    from app import crud
+    from app.api.endpoints import therapy_reports
+
+    if stop.is_set():
+        return
+    db = SessionLocal()
+    item = None
+    claimed_at = None
+    try:
+        item = crud.ai_summary.claim_batch_item(db, item_id)
+        if item is None:
+            return  # claimed by another runner
+        # Identifies this claim; the item object is reloaded after commits/rollbacks
+        claimed_at = item.started_at
+        batch = crud.ai_summary.get_batch(db, item.batch_id)
+        try:
+            payload = therapy_reports.TherapyAISummaryRequest(student_id=item.student_code, **batch.request)
+            db_student, filtered = therapy_reports._get_filtered_reports_for_payload(db, payload)
+            cache_key = therapy_reports._summary_cache_key(db_student, filtered, payload)
+            analysis = therapy_reports._get_cached_summary(db, cache_key)
+            if analysis is None:
+                if not router_bucket.acquire(CALLS_PER_SUMMARY, stop=stop):
+                    crud.ai_summary.release_batch_item(db, item, claimed_at=claimed_at)
+                    return
+                analysis = therapy_reports._generate_comprehensive_analysis(filtered, db_student, payload)
+                therapy_reports._store_cached_summary(db, db_student, cache_key, analysis)
+            recorded = crud.ai_summary.finish_batch_item(
+                db, item, claimed_at=claimed_at, status="done", result=analysis.model_dump(mode="json")
+            )
+        except HTTPException as e:
+            # No (matching) reports for this student: nothing to summarise
+            db.rollback()
+            recorded = crud.ai_summary.finish_batch_item(
+                db,
+                item,
+                claimed_at=claimed_at,
+                status="skipped" if e.status_code == 404 else "failed",
+                error=str(e.detail),
+            )
+        except Exception as e:
+            logger.exception(f"AI summary batch item {item_id} ({item.student_code}) failed")
+            db.rollback()
+            recorded = crud.ai_summary.finish_batch_item(
+                db, item, claimed_at=claimed_at, status="failed", error=str(e) or e.__class__.__name__
+            )
+        if not recorded:
+            logger.info(f"AI summary batch item {item_id} was re-claimed; discarding this run's outcome")
+            return
+        if on_item is not None:
+            db.refresh(item)
+            on_item(item)
+    except Exception:
+        logger.exception(f"Could not run AI summary batch item {item_id}")
+        if claimed_at is not None:
+            db.rollback()
+            crud.ai_summary.release_batch_item(db, item, claimed_at=claimed_at)
+    finally:
+        db.close()
+
+
+def run_batch(batch_id: str, on_item: Optional[Callable] = None) -> bool:
+    """
+    Generate every unfinished item of a batch (blocking). `on_item(item)` is
+    called after each finished item. Returns True when the batch is complete,
+    False when it was interrupted (shutdown) and remains resumable.
+    """
+    from app import crud
+
+    db = SessionLocal()
+    try:
+        crud.ai_summary.start_batch(db, batch_id, stale_seconds=settings.AI_BATCH_ITEM_STALE_SECONDS)
+        item_ids = crud.ai_summary.pending_batch_items(db, batch_id)
+    finally:
+        db.close()
+    logger.info(f"AI summary batch {batch_id}: {len(item_ids)} student(s) to generate")
+    with ThreadPoolExecutor(
+        max_workers=max(1, settings.AI_BATCH_CONCURRENCY),
+        thread_name_prefix=f"ai-summary-batch-{batch_id[:8]}",
+    ) as executor:
+        for item_id in item_ids:
+            executor.submit(_run_item, item_id, _stop, on_item)
+    if _stop.is_set():
+        logger.info(f"AI summary batch {batch_id} interrupted; it resumes on next start")
+        return False
+    db = SessionLocal()
+    try:
+        done = crud.ai_summary.finish_batch(db, batch_id)
+    finally:
+        db.close()
+    if done:
+        logger.info(f"AI summary batch {batch_id} done")
+    return done
+
+
+def _runner(batch_id: str) -> None:
+    try:
+        run_batch(batch_id)
+    except Exception:
+        logger.exception(f"AI summary batch {batch_id} runner crashed")
+    finally:
+        with _runners_lock:
+            _runners.pop(batch_id, None)
+
+
+def start_batch(batch_id: str) -> None:
+    """Run a batch in a background thread (no-op if this process already runs it)."""
+    with _runners_lock:
+        if batch_id in _runners:
+            return
+        thread = threading.Thread(
+            target=_runner, args=(batch_id,), name=f"ai-summary-batch-{batch_id[:8]}", daemon=True
+        )
+        _runners[batch_id] = thread
+    thread.start()
+
+
+def start_batch_runners() -> None:
+    """Resume queued and interrupted batches (application startup)."""
+    from app import crud
+
+    _stop.clear()
+    db = SessionLocal()
+    try:
+        batch_ids = crud.ai_summary.unfinished_batches(db)
+    except Exception as e:
+        logger.warning(f"Could not recover AI summary batches: {e}")
+        return
+    finally:
+        db.close()
+    for batch_id in batch_ids:
+        start_batch(batch_id)
+    if batch_ids:
+        logger.info(f"Resumed {len(batch_ids)} AI summary batch(es)")
+
+
+def stop_batch_runners(timeout: float = 5.0) -> None:
+    """Stop claiming items (application shutdown); unfinished items stay pending for the next start."""
+    _stop.set()
+    with _runners_lock:
+        threads: Set[threading.Thread] = set(_runners.values())
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
@@ -0,0 +1,154 @@
+"""
+Background runner for AI summary jobs.
+
+POST /therapy-reports/summary/ai/jobs stores a job row and returns at once; a
+bounded pool of AI_SUMMARY_JOB_WORKERS threads per API process runs the
+generation. Identical requests (same report-set fingerprint) share one job while
+it is queued or running. Because jobs live in the database, work that was
+queued or interrupted by a restart is resumed by `start_job_workers()`.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Set
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+# Jobs this process is currently running (requeued on shutdown)
+_running: Set[str] = set()
+_running_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.AI_SUMMARY_JOB_WORKERS),
+                    thread_name_prefix="ai-summary-job",
+                )
+    return _executor
+
+
+def enqueue(job_id: str) -> None:
+    _get_executor().submit(_run_job, job_id)
+
+
+def _run_job(job_id: str) -> None:
+    # Imported here: the endpoint module imports this one
+    from fastapi import HTTPException
+    from app import crud
+    from app.api.endpoints import therapy_reports
+
+    db = SessionLocal()
+    try:
+        if not crud.ai_summary.claim_job(db, job_id):
+            return  # already taken by another worker, or finished
+        with _running_lock:
+            _running.add(job_id)
+        job = crud.ai_summary.get_job(db, job_id)
+        try:
+            payload = therapy_reports.TherapyAISummaryRequest(**job.request)
+            db_student, filtered = therapy_reports._get_filtered_reports_for_payload(db, payload)
+            analysis = therapy_reports._generate_comprehensive_analysis(filtered, db_student, payload)
+            therapy_reports._store_cached_summary(db, db_student, job.cache_key, analysis)
+            crud.ai_summary.finish_job(db, job_id, result=analysis.model_dump(mode="json"))
+            logger.info(f"AI summary job {job_id} done")
+        except HTTPException as e:
+            db.rollback()
+            crud.ai_summary.finish_job(db, job_id, error=str(e.detail))
+        except Exception as e:
+            logger.exception(f"AI summary job {job_id} failed")
+            db.rollback()
+            crud.ai_summary.finish_job(db, job_id, error=str(e) or e.__class__.__name__)
+    except Exception:
+        logger.exception(f"Could not run AI summary job {job_id}")
+    finally:
+        with _running_lock:
+            _running.discard(job_id)
+        db.close()
+
+
+def start_job_workers() -> None:
+    """Resume queued and abandoned jobs (application startup)."""
+    from app import crud
+
+    db = SessionLocal()
+    try:
+        job_ids = crud.ai_summary.recover_jobs(
+            db,
+            stale_seconds=settings.AI_SUMMARY_JOB_STALE_SECONDS,
+            max_attempts=settings.AI_SUMMARY_JOB_MAX_ATTEMPTS,
+        )
+    except Exception as e:
+        logger.warning(f"Could not recover AI summary jobs: {e}")
+        return
+    finally:
+        db.close()
+    for job_id in job_ids:
+        enqueue(job_id)
+    if job_ids:
+        logger.info(f"Resumed {len(job_ids)} AI summary job(s)")
+
+
+def stop_job_workers() -> None:
+    """Stop accepting work and hand unfinished jobs back to the queue (application shutdown)."""
+    from app import crud
+
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+    with _running_lock:
+        running = list(_running)
+    if not running:
+        return
+    db = SessionLocal()
+    try:
+        crud.ai_summary.requeue_jobs(db, running)
+        logger.info(f"Requeued {len(running)} running AI summary job(s)")
+    except Exception as e:
+        logger.warning(f"Could not requeue AI summary jobs: {e}")
+    finally:
+        db.close()
+
+
+def _purge_cache_loop(stop: threading.Event) -> None:
+    from app import crud
+
+    while True:
+        db = SessionLocal()
+        try:
+            deleted = crud.ai_summary.purge_expired(db)
+            if deleted:
+                logger.info(f"Purged {deleted} expired AI summary cache row(s)")
+        except Exception as e:
+            logger.warning(f"Could not purge expired AI summary cache rows: {e}")
+            db.rollback()
+        finally:
+            db.close()
+        interval = settings.AI_SUMMARY_CACHE_PURGE_INTERVAL_SECONDS
+        if interval <= 0 or stop.wait(interval):
+            return
+
+
+_purge_stop = threading.Event()
+
+
+def start_cache_purger() -> None:
+    """Delete expired ai_summary_cache/ai_section_cache rows now and every AI_SUMMARY_CACHE_PURGE_INTERVAL_SECONDS."""
+    _purge_stop.clear()
+    threading.Thread(
+        target=_purge_cache_loop, args=(_purge_stop,), name="ai-summary-cache-purge", daemon=True
+    ).start()
+
+
+def stop_cache_purger() -> None:
+    _purge_stop.set()
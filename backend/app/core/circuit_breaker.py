@@ -0,0 +1,184 @@
+"""
+Circuit breaker for calls to the LLM router.
+
+Every AI summary section is an independent router call with its own timeout.
+When the router is down or overloaded each call would wait out that timeout
+before falling back, so a response that ends up fully deterministic could take
+minutes. The breaker watches the last LLM_BREAKER_WINDOW outcomes shared by all
+requests in the process:
+
+- closed: calls go through. Once at least LLM_BREAKER_MIN_CALLS are recorded and
+  the failure rate reaches LLM_BREAKER_FAILURE_RATE, or the share of calls slower
+  than LLM_BREAKER_SLOW_CALL_SECONDS reaches LLM_BREAKER_SLOW_CALL_RATE, it opens.
+- open: calls fail immediately with `CircuitOpenError` (callers use their
+  fallback) for LLM_BREAKER_OPEN_SECONDS.
+- half-open: one probe call is let through; success closes the breaker, failure
+  opens it again.
+
+Use `with llm_breaker.guard(): ...` around a call (sync or async code).
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """The breaker is open: the call was not attempted."""
+
+
+def is_llm_failure(exc: Exception) -> bool:
+    """Whether an exception says the router is unhealthy (rejected requests, e.g. HTTP 400, do not)."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500 or exc.response.status_code == 429
+    return True
+
+
+class _Call:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.responded_at: Optional[float] = None
+
+    def responded(self) -> None:
+        if self.responded_at is None:
+            self.responded_at = time.monotonic()
+
+    def latency(self) -> float:
+        return (self.responded_at or time.monotonic()) - self.started
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        *,
+        window: int,
+        min_calls: int,
+        failure_rate: float,
+        slow_call_seconds: float,
+        slow_call_rate: float,
+        open_seconds: float,
+        is_failure: Callable[[Exception], bool] = lambda exc: True,
+    ):
+        self.name = name
+        self.min_calls = max(1, min_calls)
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.is_failure = is_failure
+        self._outcomes = deque(maxlen=max(self.min_calls, window))  # (failed, slow)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                return HALF_OPEN
+            return self._state
+
+    def _acquire(self) -> bool:
+        """Admit a call; True if it is the half-open probe."""
+        with self._lock:
+            if self._state == CLOSED:
+                return False
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                logger.info(f"Circuit '{self.name}' half-open: sending a probe call")
+                return True
+            raise CircuitOpenError(f"circuit '{self.name}' is open")
+
+    def _trip(self, reason: str) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        logger.warning(f"Circuit '{self.name}' opened ({reason}); failing fast for {self.open_seconds:g}s")
+
+    def _record(self, probe: bool, failed: Optional[bool], duration: float) -> None:
+        """Record a call outcome (failed=None: abandoned by the caller, no verdict)."""
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            if probe:
+                self._probe_in_flight = False
+                if failed is None:
+                    return
+                if failed or slow:
+                    self._trip("probe " + ("failed" if failed else f"took {duration:.1f}s"))
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    logger.info(f"Circuit '{self.name}' closed: probe succeeded in {duration:.1f}s")
+                return
+            if self._state != CLOSED or failed is None:
+                return  # admitted before the breaker opened, or abandoned
+            self._outcomes.append((failed, slow))
+            calls = len(self._outcomes)
+            if calls < self.min_calls:
+                return
+            failures = sum(1 for f, _ in self._outcomes if f)
+            slow_calls = sum(1 for _, s in self._outcomes if s)
+            if failures / calls >= self.failure_rate:
+                self._trip(f"{failures}/{calls} calls failed")
+            elif slow_calls / calls >= self.slow_call_rate:
+                self._trip(f"{slow_calls}/{calls} calls slower than {self.slow_call_seconds:g}s")
+
+    @contextmanager
+    def guard(self):
+        """
+        Run the body as one call: raises CircuitOpenError up front when open and
+        records the outcome. The call's latency is its duration, or the time until
+        `call.responded()` (e.g. first streamed token) when the body calls it.
+        """
+        probe = self._acquire()
+        call = _Call()
+        try:
+            yield call
+        except Exception as exc:
+            self._record(probe, self.is_failure(exc), call.latency())
+            raise
+        except BaseException:
+            # Cancelled or closed by the caller (client went away): says nothing about the router
+            self._record(probe, None, call.latency())
+            raise
+        self._record(probe, False, call.latency())
+
+    def snapshot(self) -> dict:
+        state = self.state
+        with self._lock:
+            calls = len(self._outcomes)
+            return {
+                "state": state,
+                "calls": calls,
+                "failures": sum(1 for f, _ in self._outcomes if f),
+                "slow_calls": sum(1 for _, s in self._outcomes if s),
+            }
+
+
+llm_breaker = CircuitBreaker(
+    "llm-router",
+    window=settings.LLM_BREAKER_WINDOW,
+    min_calls=settings.LLM_BREAKER_MIN_CALLS,
+    failure_rate=settings.LLM_BREAKER_FAILURE_RATE,
+    slow_call_seconds=settings.LLM_BREAKER_SLOW_CALL_SECONDS,
+    slow_call_rate=settings.LLM_BREAKER_SLOW_CALL_RATE,
+    open_seconds=settings.LLM_BREAKER_OPEN_SECONDS,
+    is_failure=is_llm_failure,
+)
+
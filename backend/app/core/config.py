@@ -38,6 +38,85 @@ class Settings(BaseSettings):
     # Hugging Face Inference endpoint.
     # HF deprecated `https://api-inference.huggingface.co`; use router by default.
     HUGGINGFACE_BASE_URL: str = "https://router.huggingface.co"
+    # Per-section deadlines for the concurrent AI summary calls (seconds)
+    AI_SECTION_DEADLINE_SECONDS: float = 45.0
+    AI_MAIN_SUMMARY_DEADLINE_SECONDS: float = 90.0
+    # Overall budget for all LLM calls of one AI summary request; later calls get what is left
+    AI_REQUEST_DEADLINE_SECONDS: float = 150.0
+    # Cached AI summaries (ai_summary_cache table); 0 disables the cache
+    AI_SUMMARY_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    # Per-section outputs (ai_section_cache table), keyed by rendered prompt; 0 disables
+    AI_SECTION_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    # Expired rows of both caches are deleted at startup and then at this interval; 0 = startup only
+    AI_SUMMARY_CACHE_PURGE_INTERVAL_SECONDS: int = 6 * 3600
+    # Rolling main summary per student/therapy type (ai_rolling_summaries table):
+    # only reports added since the checkpoint are sent to the model
+    AI_ROLLING_SUMMARY_ENABLED: bool = True
+    # More new reports than this since the checkpoint rebuilds from the full history
+    AI_ROLLING_SUMMARY_MAX_NEW_REPORTS: int = 20
+    # Prompt token budgets (app/utils/prompt_budget.py). AI_PROMPT_TOKEN_BUDGETS
+    # overrides per model: "model-a=8000,model-b=4000"
+    AI_PROMPT_TOKEN_BUDGET: int = 6000
+    AI_PROMPT_TOKEN_BUDGETS: str = ""
+    # Local tokenizer.json path or cached Hugging Face tokenizer name; unset = estimate
+    AI_PROMPT_TOKENIZER: Optional[str] = None
+    # Retrieval-based note selection (app/ml/note_index.py): per section, the
+    # latest and baseline notes plus the top-k most informative, diverse ones (MMR)
+    AI_NOTE_RETRIEVAL_ENABLED: bool = True
+    AI_NOTE_RETRIEVAL_TOP_K: int = 6
+    # 1.0 = pure relevance, 0.0 = pure diversity
+    AI_NOTE_MMR_LAMBDA: float = 0.5
+    AI_NOTE_INDEX_DIR: str = str(BACKEND_DIR / "note_index")
+    # Background AI summary jobs (app/core/ai_summary_jobs.py)
+    AI_SUMMARY_JOB_WORKERS: int = 2
+    # A running job older than this whose worker is gone is picked up again at startup
+    AI_SUMMARY_JOB_STALE_SECONDS: int = 600
+    AI_SUMMARY_JOB_MAX_ATTEMPTS: int = 3
+    AI_SUMMARY_JOB_POLL_SECONDS: float = 1.0
+    # Class-wide batches (app/core/ai_summary_batches.py): students generated at once per batch
+    AI_BATCH_CONCURRENCY: int = 2
+    # A running batch item older than this whose runner is gone is generated again
+    AI_BATCH_ITEM_STALE_SECONDS: int = 600
+    # Token bucket shared by all batches in a process, in router calls (5 per uncached summary)
+    AI_BATCH_ROUTER_CALLS_PER_MINUTE: float = 30.0
+    AI_BATCH_ROUTER_BURST: int = 10
+    # Pooled HTTP clients for the LLM router (app/core/http_clients.py)
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    LLM_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    LLM_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    # Requires the h2 package (pip install httpx[http2])
+    LLM_HTTP2: bool = False
+    # Circuit breaker around LLM router calls (app/core/circuit_breaker.py)
+    LLM_BREAKER_WINDOW: int = 20
+    LLM_BREAKER_MIN_CALLS: int = 5
+    LLM_BREAKER_FAILURE_RATE: float = 0.5
+    LLM_BREAKER_SLOW_CALL_SECONDS: float = 30.0
+    LLM_BREAKER_SLOW_CALL_RATE: float = 0.8
+    LLM_BREAKER_OPEN_SECONDS: float = 30.0
+
+    # Translation settings
+    # "marian": per-language Helsinki-NLP models (CTranslate2 INT8 when converted)
+    # "nllb": route every supported language through the shared NLLB CTranslate2 model
+    TRANSLATION_ROUTE: str = "marian"
+    # 0 = use all CPU cores
+    TRANSLATION_CT2_INTER_THREADS: int = 0
+    TRANSLATION_CT2_INTRA_THREADS: int = 2
+    # Load translation models in a background thread at startup
+    TRANSLATION_PRELOAD: bool = True
+    # Comma-separated ISO codes of converted Marian models to preload as well (e.g. "hi,ta")
+    TRANSLATION_PRELOAD_LANGUAGES: str = ""
+    # Convert a missing NLLB model at load time; disable in production and run
+    # convert_translation_models.py at build time instead
+    TRANSLATION_CONVERT_ON_DEMAND: bool = True
+    # Address of the shared translation service (python -m app.ml.translation_service),
+    # e.g. "/tmp/ssm-translation.sock" or "127.0.0.1:8765"; unset = translate in-process
+    TRANSLATION_SERVICE_ADDRESS: Optional[str] = None
+    TRANSLATION_SERVICE_TIMEOUT: float = 120.0
+    # Comma-separated languages parent reports are pre-translated into when the
+    # student has no preferred_languages set
+    NOTIFICATION_TRANSLATION_LANGUAGES: str = "mal_Mlym"
 
     class Config:
         env_file = str(ENV_FILE)
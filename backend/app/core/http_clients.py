@@ -0,0 +1,166 @@
+"""
+Application-scoped HTTP clients for the Hugging Face router (LLM calls).
+
+One sync and one async `httpx` client are created at startup and closed at
+shutdown, so AI summary calls reuse pooled keep-alive connections instead of
+paying DNS + TCP + TLS on every request. Pool limits, timeouts and HTTP/2 come
+from Settings (LLM_*). Connection reuse is visible through `llm_metrics()`.
+"""
+import asyncio
+import contextlib
+import functools
+import logging
+import threading
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_sync_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+# Event loop the async client belongs to (httpx async pools are loop-bound)
+_async_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+_metrics = {
+    "requests": 0,
+    "connections_opened": 0,
+    "tls_handshakes": 0,
+    "temporary_async_clients": 0,
+}
+_metrics_lock = threading.Lock()
+
+
+def _count(name: str) -> None:
+    with _metrics_lock:
+        _metrics[name] += 1
+
+
+def _trace(event_name: str, info: dict) -> None:
+    # httpcore trace events; a pooled request that reuses a connection emits neither
+    if event_name == "connection.connect_tcp.complete":
+        _count("connections_opened")
+    elif event_name == "connection.start_tls.complete":
+        _count("tls_handshakes")
+
+
+async def _async_trace(event_name: str, info: dict) -> None:
+    _trace(event_name, info)
+
+
+def _on_request(request: httpx.Request) -> None:
+    _count("requests")
+    request.extensions["trace"] = _trace
+
+
+async def _on_async_request(request: httpx.Request) -> None:
+    _count("requests")
+    request.extensions["trace"] = _async_trace
+
+
+@functools.lru_cache(maxsize=1)
+def _http2_enabled() -> bool:
+    if not settings.LLM_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("LLM_HTTP2 is set but the 'h2' package is not installed (pip install httpx[http2]); using HTTP/1.1")
+        return False
+    return True
+
+
+def _client_options() -> dict:
+    return {
+        "timeout": httpx.Timeout(settings.LLM_TIMEOUT_SECONDS, connect=settings.LLM_CONNECT_TIMEOUT_SECONDS),
+        "limits": httpx.Limits(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        "http2": _http2_enabled(),
+    }
+
+
+def get_llm_client() -> httpx.Client:
+    """Shared sync client (thread-safe). Created lazily outside the app (scripts, CLIs)."""
+    global _sync_client
+    if _sync_client is None:
+        with _lock:
+            if _sync_client is None:
+                _sync_client = httpx.Client(event_hooks={"request": [_on_request]}, **_client_options())
+    return _sync_client
+
+
+@contextlib.asynccontextmanager
+async def llm_async_client():
+    """
+    Yield the shared async client when running on the application event loop;
+    anywhere else (asyncio.run in a CLI or background thread) yield a temporary
+    client that is closed afterwards.
+    """
+    if _async_client is not None and asyncio.get_running_loop() is _async_loop:
+        yield _async_client
+        return
+    _count("temporary_async_clients")
+    async with httpx.AsyncClient(event_hooks={"request": [_on_async_request]}, **_client_options()) as client:
+        yield client
+
+
+def run_on_app_loop(async_fn, *args):
+    """
+    Run `async_fn(*args)` from synchronous code and return its result.
+    From a worker thread of the running app (sync endpoints, StreamingResponse
+    iterators, background tasks) it runs on the application loop, where the
+    pooled async client lives; otherwise in a fresh event loop.
+    """
+    loop = _async_loop
+    if loop is not None and loop.is_running():
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not loop:
+            return asyncio.run_coroutine_threadsafe(async_fn(*args), loop).result()
+    return asyncio.run(async_fn(*args))
+
+
+async def start_http_clients() -> None:
+    """Create the pooled clients (application startup)."""
+    global _async_client, _async_loop
+    get_llm_client()
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(event_hooks={"request": [_on_async_request]}, **_client_options())
+        _async_loop = asyncio.get_running_loop()
+    logger.info(
+        f"LLM HTTP clients ready (max_connections={settings.LLM_MAX_CONNECTIONS}, "
+        f"keepalive={settings.LLM_MAX_KEEPALIVE_CONNECTIONS}, http2={_http2_enabled()})"
+    )
+
+
+async def close_http_clients() -> None:
+    """Close the pooled clients (application shutdown)."""
+    global _sync_client, _async_client, _async_loop
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+        _async_loop = None
+    with _lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
+
+
+def llm_metrics() -> dict:
+    """Request/connection counters; reuse_ratio is the share of requests served on an existing connection."""
+    with _metrics_lock:
+        snapshot = dict(_metrics)
+    requests = snapshot["requests"]
+    snapshot["reuse_ratio"] = (
+        round(max(requests - snapshot["connections_opened"], 0) / requests, 3) if requests else None
+    )
+    snapshot["http2"] = _http2_enabled()
+    return snapshot
@@ -14,4 +14,6 @@ from app.crud.teacher import teacher
 from app.crud.user import user 
 from app.crud import therapy_report
 from app.crud import therapist
-from app.crud import notification
\ No newline at end of file
+from app.crud import notification
+from app.crud import ai_summary
+from app.crud import therapy_progress
@@ -0,0 +1,445 @@
+from datetime import datetime, timedelta, timezone
+import uuid
+from typing import Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.ai_summary import (
+    AISummaryCache, AISectionCache, AIRollingSummary, AISummaryJob, AISummaryBatch, AISummaryBatchItem
+)
+
+
+def get_cached(db: Session, cache_key: str) -> Optional[dict]:
+    """Cached response for `cache_key`, or None when missing or expired."""
+    entry = db.query(AISummaryCache).filter(AISummaryCache.cache_key == cache_key).first()
+    if entry is None:
+        return None
+    if entry.expires_at <= datetime.now(timezone.utc):
+        db.delete(entry)
+        db.commit()
+        return None
+    return entry.response
+
+
+def store(
+    db: Session,
+    *,
+    student_id: int,
+    cache_key: str,
+    response: dict,
+    ttl_seconds: int,
+    model: str = None,
+    prompt_version: str = None,
+) -> None:
+    """Insert or refresh the cache entry for `cache_key`."""
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+    entry = db.query(AISummaryCache).filter(AISummaryCache.cache_key == cache_key).first()
+    if entry is None:
+        entry = AISummaryCache(student_id=student_id, cache_key=cache_key)
+        db.add(entry)
+    entry.response = response
+    entry.model = model
+    entry.prompt_version = prompt_version
+    entry.expires_at = expires_at
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent request stored the same key first; its result is equivalent
+        db.rollback()
+
+
+def invalidate_student(db: Session, student_id: int) -> int:
+    """Drop every cached summary for a student (their report set changed)."""
+    deleted = db.query(AISummaryCache).filter(AISummaryCache.student_id == student_id).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+def purge_expired(db: Session) -> int:
+    """Delete expired cached summaries and section outputs; returns the number of rows."""
+    now = datetime.now(timezone.utc)
+    deleted = 0
+    for model in (AISummaryCache, AISectionCache):
+        deleted += db.query(model).filter(model.expires_at <= now).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+def get_sections(db: Session, prompt_hashes: List[str]) -> Dict[str, str]:
+    """Unexpired cached section outputs, by prompt hash."""
+    if not prompt_hashes:
+        return {}
+    rows = (
+        db.query(AISectionCache.prompt_hash, AISectionCache.output)
+        .filter(
+            AISectionCache.prompt_hash.in_(prompt_hashes),
+            AISectionCache.expires_at > datetime.now(timezone.utc),
+        )
+        .all()
+    )
+    return {prompt_hash: output for prompt_hash, output in rows}
+
+
+def store_section(
+    db: Session,
+    *,
+    prompt_hash: str,
+    section: str,
+    output: str,
+    ttl_seconds: int,
+    model: str = None,
+) -> None:
+    """Insert or refresh a cached section output."""
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+    entry = db.query(AISectionCache).filter(AISectionCache.prompt_hash == prompt_hash).first()
+    if entry is None:
+        entry = AISectionCache(prompt_hash=prompt_hash, section=section)
+        db.add(entry)
+    entry.output = output
+    entry.model = model
+    entry.expires_at = expires_at
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+
+
+def get_rolling(db: Session, student_id: int, therapy_type: str) -> Optional[AIRollingSummary]:
+    return (
+        db.query(AIRollingSummary)
+        .filter(AIRollingSummary.student_id == student_id, AIRollingSummary.therapy_type == therapy_type)
+        .first()
+    )
+
+
+def save_rolling(
+    db: Session,
+    *,
+    student_id: int,
+    therapy_type: str,
+    summary: str,
+    last_report_id: int,
+    report_count: int,
+    last_report_updated_at=None,
+    model: str = None,
+    prompt_version: str = None,
+) -> None:
+    """Create or advance the rolling summary checkpoint."""
+    entry = get_rolling(db, student_id, therapy_type)
+    if entry is None:
+        entry = AIRollingSummary(student_id=student_id, therapy_type=therapy_type)
+        db.add(entry)
+    elif entry.last_report_id > last_report_id:
+        # A concurrent request already folded in newer reports
+        return
+    entry.summary = summary
+    entry.last_report_id = last_report_id
+    entry.report_count = report_count
+    entry.last_report_updated_at = last_report_updated_at
+    entry.model = model
+    entry.prompt_version = prompt_version
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+
+
+ACTIVE_JOB_STATUSES = ("queued", "running")
+
+
+def get_job(db: Session, job_id: str) -> Optional[AISummaryJob]:
+    return db.query(AISummaryJob).filter(AISummaryJob.id == job_id).first()
+
+
+def get_active_job(db: Session, cache_key: str) -> Optional[AISummaryJob]:
+    return (
+        db.query(AISummaryJob)
+        .filter(AISummaryJob.cache_key == cache_key, AISummaryJob.status.in_(ACTIVE_JOB_STATUSES))
+        .first()
+    )
+
+
+def create_job(
+    db: Session,
+    *,
+    student_id: int,
+    cache_key: str,
+    request: dict,
+    requested_by_user_id: int = None,
+    status: str = "queued",
+    result: dict = None,
+):
+    """
+    Create a job unless an identical one is already queued or running.
+    Returns (job, created); `created` is False when the active job was reused.
+    """
+    existing = get_active_job(db, cache_key)
+    if existing is not None:
+        return existing, False
+    job = AISummaryJob(
+        id=uuid.uuid4().hex,
+        student_id=student_id,
+        cache_key=cache_key,
+        request=request,
+        status=status,
+        result=result,
+        requested_by_user_id=requested_by_user_id,
+    )
+    if status == "done":
+        job.finished_at = datetime.now(timezone.utc)
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker created the same job between the check and the insert
+        db.rollback()
+        existing = get_active_job(db, cache_key)
+        if existing is None:
+            raise
+        return existing, False
+    db.refresh(job)
+    return job, True
+
+
+def claim_job(db: Session, job_id: str) -> bool:
+    """Move a queued job to running; False if another worker claimed it first."""
+    claimed = (
+        db.query(AISummaryJob)
+        .filter(AISummaryJob.id == job_id, AISummaryJob.status == "queued")
+        .update(
+            {
+                "status": "running",
+                "started_at": datetime.now(timezone.utc),
+                "attempts": AISummaryJob.attempts + 1,
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return claimed == 1
+
+
+def finish_job(db: Session, job_id: str, *, result: dict = None, error: str = None) -> None:
+    db.query(AISummaryJob).filter(AISummaryJob.id == job_id).update(
+        {
+            "status": "failed" if error else "done",
+            "result": result,
+            "error": error,
+            "finished_at": datetime.now(timezone.utc),
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+
+
+def requeue_jobs(db: Session, job_ids: List[str]) -> None:
+    """Put running jobs back in the queue (worker shutting down)."""
+    if not job_ids:
+        return
+    db.query(AISummaryJob).filter(
+        AISummaryJob.id.in_(job_ids), AISummaryJob.status == "running"
+    ).update({"status": "queued", "started_at": None}, synchronize_session=False)
+    db.commit()
+
+
+def recover_jobs(db: Session, *, stale_seconds: int, max_attempts: int) -> List[str]:
+    """
+    Jobs to resume after a restart: every queued job plus running jobs whose
+    worker has been gone for `stale_seconds`. Stale jobs that already used
+    `max_attempts` are failed instead. Returns the ids to enqueue, oldest first.
+    """
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=stale_seconds)
+    stale = (
+        db.query(AISummaryJob)
+        .filter(AISummaryJob.status == "running", AISummaryJob.started_at < stale_before)
+        .all()
+    )
+    for job in stale:
+        if job.attempts >= max_attempts:
+            job.status = "failed"
+            job.error = f"Abandoned by its worker after {job.attempts} attempt(s)"
+            job.finished_at = datetime.now(timezone.utc)
+        else:
+            job.status = "queued"
+            job.started_at = None
+    db.commit()
+    queued = (
+        db.query(AISummaryJob.id)
+        .filter(AISummaryJob.status == "queued")
+        .order_by(AISummaryJob.created_at)
+        .all()
+    )
+    return [job_id for (job_id,) in queued]
+
+
+def create_batch(
+    db: Session,
+    *,
+    students: List[tuple],
+    request: dict,
+    class_name: str = None,
+    requested_by_user_id: int = None,
+) -> AISummaryBatch:
+    """Store a batch with one pending item per (student db id, student code)."""
+    batch = AISummaryBatch(
+        id=uuid.uuid4().hex,
+        class_name=class_name,
+        request=request,
+        status="queued",
+        total=len(students),
+        requested_by_user_id=requested_by_user_id,
+    )
+    db.add(batch)
+    db.add_all(
+        AISummaryBatchItem(batch_id=batch.id, student_id=student_id, student_code=student_code)
+        for student_id, student_code in students
+    )
+    db.commit()
+    db.refresh(batch)
+    return batch
+
+
+def get_batch(db: Session, batch_id: str) -> Optional[AISummaryBatch]:
+    return db.query(AISummaryBatch).filter(AISummaryBatch.id == batch_id).first()
+
+
+def get_batch_items(db: Session, batch_id: str) -> List[AISummaryBatchItem]:
+    return (
+        db.query(AISummaryBatchItem)
+        .filter(AISummaryBatchItem.batch_id == batch_id)
+        .order_by(AISummaryBatchItem.id)
+        .all()
+    )
+
+
+def start_batch(db: Session, batch_id: str, *, stale_seconds: int) -> None:
+    """
+    Mark a batch running and hand items back to the queue whose runner has been
+    gone for `stale_seconds` (items still being generated by a live runner in
+    another worker process are left alone).
+    """
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=stale_seconds)
+    db.query(AISummaryBatch).filter(
+        AISummaryBatch.id == batch_id, AISummaryBatch.status != "done"
+    ).update(
+        {"status": "running", "started_at": func.coalesce(AISummaryBatch.started_at, func.now())},
+        synchronize_session=False,
+    )
+    db.query(AISummaryBatchItem).filter(
+        AISummaryBatchItem.batch_id == batch_id,
+        AISummaryBatchItem.status == "running",
+        AISummaryBatchItem.started_at < stale_before,
+    ).update({"status": "pending", "started_at": None}, synchronize_session=False)
+    db.commit()
+
+
+def pending_batch_items(db: Session, batch_id: str) -> List[int]:
+    rows = (
+        db.query(AISummaryBatchItem.id)
+        .filter(AISummaryBatchItem.batch_id == batch_id, AISummaryBatchItem.status == "pending")
+        .order_by(AISummaryBatchItem.id)
+        .all()
+    )
+    return [item_id for (item_id,) in rows]
+
+
+def claim_batch_item(db: Session, item_id: int) -> Optional[AISummaryBatchItem]:
+    """Move a pending item to running; None if another runner claimed it first."""
+    claimed = (
+        db.query(AISummaryBatchItem)
+        .filter(AISummaryBatchItem.id == item_id, AISummaryBatchItem.status == "pending")
+        .update(
+            {
+                "status": "running",
+                "started_at": datetime.now(timezone.utc),
+                "attempts": AISummaryBatchItem.attempts + 1,
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    if claimed != 1:
+        return None
+    return db.query(AISummaryBatchItem).filter(AISummaryBatchItem.id == item_id).first()
+
+
+def finish_batch_item(
+    db: Session,
+    item: AISummaryBatchItem,
+    *,
+    claimed_at: datetime,
+    status: str,
+    result: dict = None,
+    error: str = None,
+) -> bool:
+    """
+    Record an item's outcome and bump the batch's progress counters in the same
+    transaction. Only the claim made at `claimed_at` (its started_at) counts:
+    False, nothing written, when the item was released or re-claimed since.
+    """
+    updated = (
+        db.query(AISummaryBatchItem)
+        .filter(
+            AISummaryBatchItem.id == item.id,
+            AISummaryBatchItem.status == "running",
+            AISummaryBatchItem.started_at == claimed_at,
+        )
+        .update(
+            {
+                "status": status,
+                "result": result,
+                "error": error,
+                "finished_at": datetime.now(timezone.utc),
+            },
+            synchronize_session=False,
+        )
+    )
+    if updated != 1:
+        db.rollback()
+        return False
+    counter = AISummaryBatch.failed if status == "failed" else AISummaryBatch.completed
+    db.query(AISummaryBatch).filter(AISummaryBatch.id == item.batch_id).update(
+        {counter.key: counter + 1}, synchronize_session=False
+    )
+    db.commit()
+    return True
+
+
+def release_batch_item(db: Session, item: AISummaryBatchItem, *, claimed_at: datetime) -> None:
+    """Put a running item back to pending (runner stopping), unless it was re-claimed since."""
+    db.query(AISummaryBatchItem).filter(
+        AISummaryBatchItem.id == item.id,
+        AISummaryBatchItem.status == "running",
+        AISummaryBatchItem.started_at == claimed_at,
+    ).update({"status": "pending", "started_at": None}, synchronize_session=False)
+    db.commit()
+
+
+def finish_batch(db: Session, batch_id: str) -> bool:
+    """Mark the batch done once no item is pending or running; False otherwise."""
+    unfinished = (
+        db.query(AISummaryBatchItem.id)
+        .filter(
+            AISummaryBatchItem.batch_id == batch_id,
+            AISummaryBatchItem.status.in_(("pending", "running")),
+        )
+        .first()
+    )
+    if unfinished is not None:
+        return False
+    db.query(AISummaryBatch).filter(AISummaryBatch.id == batch_id).update(
+        {"status": "done", "finished_at": datetime.now(timezone.utc)}, synchronize_session=False
+    )
+    db.commit()
+    return True
+
+
+def unfinished_batches(db: Session) -> List[str]:
+    """Queued or interrupted batches, oldest first."""
+    rows = (
+        db.query(AISummaryBatch.id)
+        .filter(AISummaryBatch.status.in_(("queued", "running")))
+        .order_by(AISummaryBatch.created_at)
+        .all()
+    )
+    return [batch_id for (batch_id,) in rows]
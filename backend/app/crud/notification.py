@@ -1,6 +1,6 @@
-from typing import List
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
-from app.models.notification import Notification
+from app.models.notification import Notification, NotificationTranslation
 from app.schemas.notification import NotificationCreate
 
 
@@ -56,3 +56,54 @@ def get_unread_count(db: Session, student_id: str) -> int:
         .filter(Notification.student_id == student_id, Notification.is_read == False)
         .count()
     )
+
+
+def create_translation_jobs(db: Session, *, notification_id: int, languages: List[str]) -> List[NotificationTranslation]:
+    """Create pending translation rows for a notification (existing languages are left untouched)."""
+    existing = {
+        t.language
+        for t in db.query(NotificationTranslation).filter(NotificationTranslation.notification_id == notification_id)
+    }
+    jobs = []
+    for language in languages:
+        if language in existing:
+            continue
+        job = NotificationTranslation(notification_id=notification_id, language=language, status="pending")
+        db.add(job)
+        jobs.append(job)
+    db.commit()
+    return jobs
+
+
+def set_translation_result(
+    db: Session,
+    *,
+    notification_id: int,
+    language: str,
+    translated_summary: Optional[str] = None,
+    error: Optional[str] = None,
+) -> Optional[NotificationTranslation]:
+    db_obj = (
+        db.query(NotificationTranslation)
+        .filter(NotificationTranslation.notification_id == notification_id, NotificationTranslation.language == language)
+        .first()
+    )
+    if db_obj:
+        db_obj.translated_summary = translated_summary
+        db_obj.error = error
+        db_obj.status = "failed" if error else "done"
+        db.commit()
+        db.refresh(db_obj)
+    return db_obj
+
+
+def get_translations(db: Session, *, notification_ids: List[int], language: str) -> Dict[int, NotificationTranslation]:
+    """Stored translations for the given notifications in one language, keyed by notification id."""
+    if not notification_ids:
+        return {}
+    rows = (
+        db.query(NotificationTranslation)
+        .filter(NotificationTranslation.notification_id.in_(notification_ids), NotificationTranslation.language == language)
+        .all()
+    )
+    return {row.notification_id: row for row in rows}
@@ -0,0 +1,108 @@
+from typing import List, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, load_only
+from app.models.therapy_report import TherapyReport, TherapyProgressStats
+from app.utils import progress_stats
+from app.utils.progress_stats import ALL_THERAPY_TYPES
+
+# Columns progress_stats.add_report reads
+STATS_COLUMNS = (
+    TherapyReport.id,
+    TherapyReport.report_date,
+    TherapyReport.therapy_type,
+    TherapyReport.progress_level,
+    TherapyReport.updated_at,
+)
+
+
+def get(db: Session, student_id: int, therapy_type: str = ALL_THERAPY_TYPES) -> Optional[TherapyProgressStats]:
+    return (
+        db.query(TherapyProgressStats)
+        .filter(TherapyProgressStats.student_id == student_id, TherapyProgressStats.therapy_type == therapy_type)
+        .first()
+    )
+
+
+def get_for_student(db: Session, student_id: int) -> List[TherapyProgressStats]:
+    """All rows of a student (over all types first); built from the reports if there are none yet."""
+    rows = (
+        db.query(TherapyProgressStats)
+        .filter(TherapyProgressStats.student_id == student_id)
+        .order_by(TherapyProgressStats.therapy_type)
+        .all()
+    )
+    return rows or rebuild_for_student(db, student_id)
+
+
+def rebuild_for_student(db: Session, student_id: int) -> List[TherapyProgressStats]:
+    """Recompute a student's rows from their reports (after an edit, or for reports predating the table)."""
+    reports = (
+        db.query(TherapyReport)
+        .options(load_only(*STATS_COLUMNS))
+        .filter(TherapyReport.student_id == student_id)
+        .order_by(TherapyReport.report_date.asc(), TherapyReport.id.asc())
+        .all()
+    )
+    db.query(TherapyProgressStats).filter(TherapyProgressStats.student_id == student_id).delete(
+        synchronize_session=False
+    )
+    rows = []
+    if reports:
+        rows.append(progress_stats.from_reports(reports, student_id, ALL_THERAPY_TYPES))
+        therapy_types = sorted({r.therapy_type for r in reports if r.therapy_type})
+        for therapy_type in therapy_types:
+            subset = [r for r in reports if r.therapy_type == therapy_type]
+            rows.append(progress_stats.from_reports(subset, student_id, therapy_type))
+    db.add_all(rows)
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent rebuild of the same student won; its rows are equivalent
+        db.rollback()
+        return (
+            db.query(TherapyProgressStats)
+            .filter(TherapyProgressStats.student_id == student_id)
+            .order_by(TherapyProgressStats.therapy_type)
+            .all()
+        )
+    return rows
+
+
+def record_report(db: Session, report: TherapyReport) -> None:
+    """
+    Fold a newly created report into its student's rows. Falls back to a
+    rebuild when a row is missing or the report is dated before the newest
+    one already counted.
+    """
+    therapy_types = [ALL_THERAPY_TYPES] + ([report.therapy_type] if report.therapy_type else [])
+    rows = (
+        db.query(TherapyProgressStats)
+        .filter(
+            TherapyProgressStats.student_id == report.student_id,
+            TherapyProgressStats.therapy_type.in_(therapy_types),
+        )
+        .with_for_update()
+        .all()
+    )
+    by_type = {row.therapy_type: row for row in rows}
+    all_types = by_type.get(ALL_THERAPY_TYPES)
+    if all_types is None or not progress_stats.can_append(all_types, report):
+        db.rollback()
+        rebuild_for_student(db, report.student_id)
+        return
+    for therapy_type in therapy_types:
+        row = by_type.get(therapy_type)
+        if row is None:
+            # First report of this therapy type
+            row = progress_stats.new_stats(report.student_id, therapy_type)
+            db.add(row)
+        elif not progress_stats.can_append(row, report):
+            db.rollback()
+            rebuild_for_student(db, report.student_id)
+            return
+        progress_stats.add_report(row, report)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        rebuild_for_student(db, report.student_id)
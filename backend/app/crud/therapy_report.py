@@ -1,6 +1,7 @@
-from typing import List
+from datetime import date
+from typing import List, Optional
 import json
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from app.models.therapy_report import TherapyReport
 from app.schemas.therapy_report import TherapyReportCreate
 
@@ -26,5 +27,49 @@ def create(db: Session, *, obj_in: TherapyReportCreate) -> TherapyReport:
     return db_obj
 
 
+def get(db: Session, id: int) -> Optional[TherapyReport]:
+    return db.query(TherapyReport).filter(TherapyReport.id == id).first()
+
+
 def get_by_student(db: Session, student_id: int) -> List[TherapyReport]:
     return db.query(TherapyReport).filter(TherapyReport.student_id == student_id).order_by(TherapyReport.report_date.desc()).all()
+
+
+# Columns the AI summary prompts, caches and note index read
+SUMMARY_COLUMNS = (
+    TherapyReport.id,
+    TherapyReport.student_id,
+    TherapyReport.report_date,
+    TherapyReport.therapy_type,
+    TherapyReport.progress_notes,
+    TherapyReport.goals_achieved,
+    TherapyReport.progress_level,
+    TherapyReport.updated_at,
+)
+
+
+def get_for_summary(
+    db: Session,
+    student_id: int,
+    *,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    therapy_type: Optional[str] = None,
+) -> List[TherapyReport]:
+    """A student's reports for an AI summary, filtered and ordered oldest first in SQL."""
+    query = (
+        db.query(TherapyReport)
+        .options(load_only(*SUMMARY_COLUMNS))
+        .filter(TherapyReport.student_id == student_id)
+    )
+    if therapy_type:
+        query = query.filter(TherapyReport.therapy_type == therapy_type)
+    if from_date:
+        query = query.filter(TherapyReport.report_date >= from_date)
+    if to_date:
+        query = query.filter(TherapyReport.report_date <= to_date)
+    return query.order_by(TherapyReport.report_date.asc(), TherapyReport.id.asc()).all()
+
+
+def exists_for_student(db: Session, student_id: int) -> bool:
+    return db.query(TherapyReport.id).filter(TherapyReport.student_id == student_id).first() is not None
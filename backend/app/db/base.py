@@ -4,4 +4,8 @@ from app.db.base_class import Base
 from app.models.user import User
 from app.models.student import Student
 from app.models.teacher import Teacher
-from app.models.notification import Notification 
\ No newline at end of file
+from app.models.notification import Notification, NotificationTranslation
+from app.models.therapy_report import TherapyReport, TherapyProgressStats
+from app.models.ai_summary import (
+    AISummaryCache, AISectionCache, AIRollingSummary, AISummaryJob, AISummaryBatch, AISummaryBatchItem
+) 
\ No newline at end of file
@@ -16,6 +16,9 @@ if str(backend_dir) not in sys.path:
 
 from app.api.api import api_router
 from app.core.config import settings
+from app.core.ai_summary_batches import start_batch_runners, stop_batch_runners
+from app.core.ai_summary_jobs import start_cache_purger, start_job_workers, stop_cache_purger, stop_job_workers
+from app.core.http_clients import close_http_clients, start_http_clients
 
 app = FastAPI(
     title="Special School Management System",
@@ -56,6 +59,60 @@ app.add_middleware(
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
+@app.on_event("startup")
+async def open_http_clients():
+    # Pooled keep-alive clients for the LLM router
+    await start_http_clients()
+
+
+@app.on_event("shutdown")
+async def shutdown_http_clients():
+    await close_http_clients()
+
+
+@app.on_event("startup")
+def resume_ai_summary_jobs():
+    # Jobs are persisted: pick up work queued or interrupted before a restart
+    start_job_workers()
+
+
+@app.on_event("shutdown")
+def stop_ai_summary_jobs():
+    stop_job_workers()
+
+
+@app.on_event("startup")
+def purge_ai_summary_cache():
+    # Expired cache rows are never read again; delete them in the background
+    start_cache_purger()
+
+
+@app.on_event("shutdown")
+def stop_ai_summary_cache_purge():
+    stop_cache_purger()
+
+
+@app.on_event("startup")
+def resume_ai_summary_batches():
+    # Batch progress is persisted per student: continue interrupted class runs
+    start_batch_runners()
+
+
+@app.on_event("shutdown")
+def stop_ai_summary_batches():
+    stop_batch_runners()
+
+
+@app.on_event("startup")
+def preload_translation_models():
+    # Load (and warm up) translation models off the request path; progress is
+    # reported by GET /api/v1/translation/ready
+    # With a shared translation service the models live in that process instead
+    if settings.TRANSLATION_PRELOAD and not settings.TRANSLATION_SERVICE_ADDRESS:
+        from app.ml.translation_models import start_preload_thread
+        start_preload_thread()
+
+
 @app.get("/")
 @app.head("/")
 async def root():
@@ -64,4 +121,3 @@ async def root():
         "docs": "/docs",  # Swagger UI
         "redoc": "/redoc"  # ReDoc UI
     }
-
@@ -0,0 +1,252 @@
+"""
+Per-student TF-IDF index over therapy section notes, for retrieval-based note
+selection in the AI summary prompts.
+
+Every note in a report's goals_achieved becomes one row of a hashed term-count
+matrix (unigrams + bigrams, N_FEATURES columns, so adding notes never resizes
+the vocabulary). The matrix, its report ids/goal keys and each report's
+updated_at are stored per student as a compressed .npz under AI_NOTE_INDEX_DIR.
+Creating a report appends its rows (`update_for_report`); `get_index` re-syncs
+edited or deleted reports lazily. IDF weights come from the student's whole
+history, and `mmr_order` picks notes that are representative of a section yet
+different from each other (maximal marginal relevance).
+"""
+import logging
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.utils.goal_sections import report_goals
+
+logger = logging.getLogger(__name__)
+
+N_FEATURES = 2 ** 12
+# Indexes kept in memory per API process
+INDEX_CACHE_SIZE = 64
+
+_WORD = re.compile(r"[a-z][a-z0-9']+")
+_STOPWORDS = frozenset(
+    "a an and are as at be been but by for from had has have he her his in is it its of on or she that the "
+    "their them they this to was were when which while will with".split()
+)
+
+
+def _terms(text: str) -> List[str]:
+    words = [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def vectorize(texts: Sequence[str]) -> np.ndarray:
+    """Hashed term counts, one float32 row per text (crc32: stable across processes)."""
+    matrix = np.zeros((len(texts), N_FEATURES), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for term in _terms(text):
+            matrix[row, zlib.crc32(term.encode("utf-8")) % N_FEATURES] += 1.0
+    return matrix
+
+
+def report_notes(report) -> List[Tuple[str, str]]:
+    """(goal key, note) pairs with non-empty notes from a report's goals_achieved."""
+    return [(str(e.key), e.notes) for e in report_goals(report).entries if e.kind != "other" and e.notes]
+
+
+def _stamp(report) -> str:
+    return report.updated_at.isoformat() if getattr(report, "updated_at", None) else ""
+
+
+class StudentNoteIndex:
+    def __init__(self, student_id: int):
+        self.student_id = student_id
+        self.report_ids = np.zeros(0, dtype=np.int64)
+        self.keys: List[str] = []
+        self.counts = np.zeros((0, N_FEATURES), dtype=np.float32)
+        self.stamps = {}  # report id -> updated_at ISO string
+        self._rows = {}   # (report id, goal key) -> row
+        self.dirty = False
+
+    @property
+    def path(self) -> str:
+        return os.path.join(settings.AI_NOTE_INDEX_DIR, f"student_{self.student_id}.npz")
+
+    def _reindex(self):
+        self._rows = {(int(rid), key): i for i, (rid, key) in enumerate(zip(self.report_ids, self.keys))}
+
+    @classmethod
+    def load(cls, student_id: int) -> "StudentNoteIndex":
+        index = cls(student_id)
+        try:
+            with np.load(index.path, allow_pickle=False) as data:
+                if int(data["n_features"]) != N_FEATURES:
+                    raise ValueError("feature size changed")
+                index.report_ids = data["report_ids"].astype(np.int64)
+                index.keys = [str(k) for k in data["keys"]]
+                index.counts = data["counts"].astype(np.float32)
+                index.stamps = dict(zip((int(r) for r in data["stamp_ids"]), (str(s) for s in data["stamps"])))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Rebuilding note index for student {student_id}: {e}")
+            index = cls(student_id)
+        index._reindex()
+        return index
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        os.makedirs(settings.AI_NOTE_INDEX_DIR, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            n_features=np.int64(N_FEATURES),
+            report_ids=self.report_ids,
+            keys=np.array(self.keys, dtype=str),
+            counts=self.counts,
+            stamp_ids=np.array(list(self.stamps.keys()), dtype=np.int64),
+            stamps=np.array(list(self.stamps.values()), dtype=str),
+        )
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def remove_reports(self, report_ids: Iterable[int]) -> None:
+        drop = set(report_ids)
+        if not drop:
+            return
+        keep = ~np.isin(self.report_ids, list(drop))
+        self.report_ids = self.report_ids[keep]
+        self.keys = [k for k, kept in zip(self.keys, keep) if kept]
+        self.counts = self.counts[keep]
+        for report_id in drop:
+            self.stamps.pop(report_id, None)
+        self._reindex()
+        self.dirty = True
+
+    def add_report(self, report) -> None:
+        """Index (or re-index) one report's notes."""
+        if report.id in self.stamps:
+            self.remove_reports([report.id])
+        notes = report_notes(report)
+        if notes:
+            self.report_ids = np.concatenate([self.report_ids, np.full(len(notes), report.id, dtype=np.int64)])
+            self.keys.extend(key for key, _ in notes)
+            self.counts = np.vstack([self.counts, vectorize([note for _, note in notes])])
+            self._reindex()
+        self.stamps[report.id] = _stamp(report)
+        self.dirty = True
+
+    def sync(self, reports) -> None:
+        """Bring the index in line with the student's current reports."""
+        current = {r.id: r for r in reports}
+        self.remove_reports([rid for rid in self.stamps if rid not in current])
+        for report in reports:
+            if self.stamps.get(report.id) != _stamp(report):
+                self.add_report(report)
+
+    def idf(self) -> np.ndarray:
+        n_docs = self.counts.shape[0]
+        df = np.count_nonzero(self.counts, axis=0)
+        return (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+
+    def tfidf(self, counts: np.ndarray) -> np.ndarray:
+        """Sublinear-tf TF-IDF rows, L2-normalised."""
+        weighted = np.where(counts > 0, 1.0 + np.log(np.maximum(counts, 1.0)), 0.0).astype(np.float32) * self.idf()
+        norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return weighted / norms
+
+    def vectors_for(self, entries: Sequence[Tuple[int, Optional[str], str]]) -> np.ndarray:
+        """TF-IDF vectors for (report id, goal key, note) entries; unindexed notes are vectorised on the fly."""
+        counts = np.zeros((len(entries), N_FEATURES), dtype=np.float32)
+        missing = []
+        for i, (report_id, key, note) in enumerate(entries):
+            row = self._rows.get((report_id, key))
+            if row is not None:
+                counts[i] = self.counts[row]
+            else:
+                missing.append(i)
+        if missing:
+            counts[missing] = vectorize([entries[i][2] for i in missing])
+        return self.tfidf(counts)
+
+
+def mmr_order(vectors: np.ndarray, k: int, lambda_: float = 0.5, query: Optional[np.ndarray] = None) -> List[int]:
+    """
+    Indices of up to `k` rows by maximal marginal relevance. Relevance is
+    cosine similarity to `query` (default: the rows' centroid, i.e. how
+    representative a note is); the penalty is similarity to notes already picked.
+    """
+    n = vectors.shape[0]
+    if n == 0 or k <= 0:
+        return []
+    if query is None:
+        query = vectors.mean(axis=0)
+    norm = np.linalg.norm(query)
+    relevance = vectors @ (query / norm) if norm else np.zeros(n, dtype=np.float32)
+    similarity = vectors @ vectors.T
+    selected: List[int] = []
+    max_sim = np.zeros(n, dtype=np.float32)
+    remaining = np.ones(n, dtype=bool)
+    for _ in range(min(k, n)):
+        scores = lambda_ * relevance - (1.0 - lambda_) * max_sim
+        scores[~remaining] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        remaining[best] = False
+        max_sim = np.maximum(max_sim, similarity[best])
+    return selected
+
+
+_cache: "OrderedDict[int, StudentNoteIndex]" = OrderedDict()
+_cache_lock = threading.Lock()
+# One lock per student so concurrent requests don't rebuild the same index twice
+_student_locks = {}
+
+
+def _student_lock(student_id: int) -> threading.Lock:
+    with _cache_lock:
+        return _student_locks.setdefault(student_id, threading.Lock())
+
+
+def _cached(student_id: int) -> StudentNoteIndex:
+    with _cache_lock:
+        index = _cache.get(student_id)
+        if index is not None:
+            _cache.move_to_end(student_id)
+            return index
+    index = StudentNoteIndex.load(student_id)
+    with _cache_lock:
+        _cache[student_id] = index
+        while len(_cache) > INDEX_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
+
+
+def get_index(student_id: int, reports) -> StudentNoteIndex:
+    """The student's index, synced with `reports` (all of the student's reports or a subset)."""
+    with _student_lock(student_id):
+        index = _cached(student_id)
+        # Only add/refresh: a filtered subset must not drop the other reports' rows
+        for report in reports:
+            if index.stamps.get(report.id) != _stamp(report):
+                index.add_report(report)
+        try:
+            index.save()
+        except OSError as e:
+            logger.warning(f"Could not save note index for student {student_id}: {e}")
+        return index
+
+
+def update_for_report(report) -> None:
+    """Append a new (or edited) report's notes to its student's index."""
+    with _student_lock(report.student_id):
+        index = _cached(report.student_id)
+        index.add_report(report)
+        try:
+            index.save()
+        except OSError as e:
+            logger.warning(f"Could not save note index for student {report.student_id}: {e}")
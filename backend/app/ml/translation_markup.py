@@ -0,0 +1,164 @@
+"""
+Markup-aware preprocessing for translation.
+
+AI summaries are markdown-like: "**Section Title**" headings, "•"/"-"/"1."
+bullets, "# " headings and "**Label:** text" lines. Feeding those markers through
+the model costs decode steps and they sometimes come back mangled. Each line is
+split into literal markup and natural-language spans; only the spans are
+translated and the markup is put back verbatim afterwards. Inline **bold**
+inside body text stays in the span as a pair of guillemets, which the models
+copy through like quotes, and is turned back into "**" after decoding.
+
+Section titles are resolved through the glossary's "section_titles" first, so
+the standard therapy section headings never reach the model at all.
+"""
+import re
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# Leading heading/bullet/numbering markers
+_PREFIX = re.compile(r"^(?:#{1,6}\s+)?(?:[•◦▪\-–*]\s+|\d{1,2}[.)]\s+)?")
+_HASH_HEADING = re.compile(r"^#{1,6}\s+")
+# "**Title**", "**Title:**", "**Title**:"
+_WRAPPED = re.compile(r"^(\*\*|__)(.+?)\1(\s*:?)$")
+# "**Label:** text" / "**Label**: text"
+_LABELED = re.compile(r"^(\*\*|__)(.+?)\1(\s*:?\s+)(\S.*)$")
+_INLINE_BOLD = re.compile(r"(\*\*|__)(.+?)\1")
+_HAS_WORD = re.compile(r"\w")
+_SENTENCE_PUNCTUATION = re.compile(r"[.!?]")
+_TITLE_TAIL = re.compile(r"^(.*?)(\s*:?\s*)$", re.DOTALL)
+
+# Stand-ins for inline bold markers while a span is translated
+BOLD_OPEN = "«"
+BOLD_CLOSE = "»"
+_BOLD_SENTINEL = re.compile(f"[{BOLD_OPEN}{BOLD_CLOSE}]")
+_BOLD_SPAN = re.compile(BOLD_OPEN + r"\s*(.+?)\s*" + BOLD_CLOSE)
+
+# Unmarked lines ending in ":" up to this length are treated as headings
+_COLON_HEADING_MAX_CHARS = 80
+
+
+def normalize_title(title: str) -> str:
+    """Lookup key for section titles: case/whitespace-insensitive, no trailing colon."""
+    return " ".join(title.strip().rstrip(":").split()).lower()
+
+
+def _split_title(text: str) -> List[Tuple[str, str]]:
+    """A title span, with any trailing colon/spacing kept as markup."""
+    title, tail = _TITLE_TAIL.match(text).groups()
+    parts = [("title", title)] if title else []
+    if tail:
+        parts.append(("markup", tail))
+    return parts
+
+
+def _mark_bold(text: str) -> str:
+    """Replace inline bold markers with sentinels (dropped if the text already uses guillemets)."""
+    if _BOLD_SENTINEL.search(text):
+        return _INLINE_BOLD.sub(r"\2", text)
+    return _INLINE_BOLD.sub(BOLD_OPEN + r"\2" + BOLD_CLOSE, text)
+
+
+def restore_bold(translated: str) -> str:
+    """
+    Turn sentinel pairs in a translated span back into "**bold**" ("__bold__"
+    in the source comes back as "**bold**" too). If the model lost or reordered
+    a sentinel the span comes back without bold instead.
+    """
+    sentinels = _BOLD_SENTINEL.findall(translated)
+    if not sentinels:
+        return translated
+    if sentinels == [BOLD_OPEN, BOLD_CLOSE] * (len(sentinels) // 2):
+        return _BOLD_SPAN.sub(r"**\1**", translated)
+    return _BOLD_SENTINEL.sub("", translated)
+
+
+def extract_markup(line: str) -> List[Tuple[str, str]]:
+    """
+    Split one line into ("markup" | "title" | "text", value) parts whose values
+    concatenate back to the line, except that inline bold inside body text is
+    carried as BOLD_OPEN/BOLD_CLOSE sentinels (see `restore_bold`).
+    """
+    if not _HAS_WORD.search(line):
+        return [("markup", line)]
+
+    prefix = _PREFIX.match(line).group(0)
+    rest = line[len(prefix):]
+    parts = [("markup", prefix)] if prefix else []
+
+    wrapped = _WRAPPED.match(rest)
+    if wrapped:
+        marker, title, tail = wrapped.groups()
+        title_parts = _split_title(title)
+        return parts + [("markup", marker)] + title_parts + [("markup", marker + tail)]
+
+    labeled = _LABELED.match(rest)
+    if labeled:
+        marker, label, separator, body = labeled.groups()
+        return parts + [("markup", marker)] + _split_title(label) + [
+            ("markup", marker + separator),
+            ("text", _mark_bold(body)),
+        ]
+
+    if _HASH_HEADING.match(prefix) or (
+        rest.endswith(":")
+        and len(rest) <= _COLON_HEADING_MAX_CHARS
+        and not _SENTENCE_PUNCTUATION.search(rest)
+    ):
+        return parts + _split_title(rest)
+
+    return parts + [("text", _mark_bold(rest))]
+
+
+class MarkupPlan:
+    """
+    Translation plan for a list of lines: per-line templates plus the unique
+    natural-language spans (`inputs`) that still need the model. Titles found by
+    `title_lookup` are filled in directly.
+    """
+
+    def __init__(self, contents: List[str], title_lookup: Callable[[str], Optional[str]]):
+        self.inputs: List[str] = []
+        self.title_inputs: Dict[int, str] = {}  # input index -> title
+        self.bold_inputs: Set[int] = set()  # input indexes carrying bold sentinels
+        self._lines: List[list] = []
+        index: Dict[str, int] = {}
+        for content in contents:
+            template = []
+            for kind, value in extract_markup(content):
+                if kind == "markup":
+                    if value:
+                        template.append(value)
+                    continue
+                if kind == "title":
+                    translated_title = title_lookup(value)
+                    if translated_title is not None:
+                        template.append(translated_title)
+                        continue
+                if value not in index:
+                    index[value] = len(self.inputs)
+                    self.inputs.append(value)
+                if kind == "title":
+                    self.title_inputs[index[value]] = value
+                elif BOLD_OPEN in value:
+                    self.bold_inputs.add(index[value])
+                template.append(index[value])
+            self._lines.append(template)
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def last_input(self, line_idx: int) -> int:
+        """Highest input index line `line_idx` needs (-1 when it needs none)."""
+        return max((part for part in self._lines[line_idx] if isinstance(part, int)), default=-1)
+
+    def rebuild(self, line_idx: int, translated_inputs: List[str]) -> str:
+        return "".join(
+            part if isinstance(part, str)
+            else restore_bold(translated_inputs[part]) if part in self.bold_inputs
+            else translated_inputs[part]
+            for part in self._lines[line_idx]
+        )
+
+    def translated_titles(self, translated_inputs: List[str]) -> Dict[str, str]:
+        """Model translations of titles that were not in the glossary (for caching)."""
+        return {title: translated_inputs[idx] for idx, title in self.title_inputs.items()}
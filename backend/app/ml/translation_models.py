@@ -0,0 +1,417 @@
+"""
+Translation model registry: CTranslate2 INT8 conversion and loading for every
+target language, with eager PyTorch Marian as the last-resort fallback.
+
+Routes:
+- Malayalam always uses NLLB-200-distilled-600M (CTranslate2 INT8).
+- Other languages use their Helsinki-NLP Marian model converted to CTranslate2
+  INT8, or the shared NLLB model when TRANSLATION_ROUTE="nllb".
+- If no converted model exists on disk, the eager PyTorch Marian model is used.
+
+Models are converted at build time (convert_translation_models.py) and preloaded
+in a background thread at startup (start_preload_thread); model_status() reports
+missing/converting/loading/ready per model for the readiness endpoint.
+"""
+import logging
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Converted models live in backend/models/
+MODELS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "models")
+
+NLLB_MODEL_NAME = "facebook/nllb-200-distilled-600M"
+
+# Path for converted CTranslate2 model
+CT2_MODEL_PATH = os.path.join(MODELS_DIR, "nllb-200-distilled-600M-int8")
+
+# Model mapping for each language (excluding Malayalam - uses NLLB)
+MARIAN_MODEL_MAP = {
+    "hi": "Helsinki-NLP/opus-mt-en-hi",  # Hindi
+    "bn": "Helsinki-NLP/opus-mt-en-bn",  # Bengali
+    "ta": "Helsinki-NLP/opus-mt-en-ta",  # Tamil
+    "te": "Helsinki-NLP/opus-mt-en-te",  # Telugu
+    "mr": "Helsinki-NLP/opus-mt-en-mr",  # Marathi
+    "gu": "Helsinki-NLP/opus-mt-en-gu",  # Gujarati
+    # Fallback for others
+    "default": "Helsinki-NLP/opus-mt-en-mul"
+}
+
+# ISO code -> NLLB target language code (used for the multilingual NLLB route)
+NLLB_LANGUAGE_CODES = {
+    "ml": "mal_Mlym",
+    "hi": "hin_Deva",
+    "ta": "tam_Taml",
+    "te": "tel_Telu",
+    "kn": "kan_Knda",
+    "bn": "ben_Beng",
+    "gu": "guj_Gujr",
+    "mr": "mar_Deva",
+    "pa": "pan_Guru",
+    "or": "ory_Orya",
+}
+
+# Global cache for CTranslate2 models
+_ct2_translator = None
+_ct2_tokenizer = None
+# Converted model directory -> (translator, tokenizer); languages served by the
+# shared opus-mt-en-mul model resolve to the same directory and share one copy
+_ct2_marian = {}
+_translation_model = None
+_tokenizer = None
+_device = None
+
+# Serializes loading so a request and the startup preload never load twice
+_load_lock = threading.RLock()
+# Serializes on-demand NLLB conversion; held instead of _load_lock for the minutes
+# a conversion takes, so Marian loads and clear_cache() are not blocked meanwhile
+_convert_lock = threading.Lock()
+# model key ("nllb", "marian:hi") -> {"status", "convert_seconds", "load_seconds", "error"}
+_model_status = {}
+
+
+def marian_model_name(target_lang: str) -> str:
+    return MARIAN_MODEL_MAP.get(target_lang, MARIAN_MODEL_MAP["default"])
+
+
+def marian_ct2_path(target_lang: str) -> str:
+    """Directory of the converted CTranslate2 INT8 Marian model for a language."""
+    model_name = marian_model_name(target_lang)
+    return os.path.join(MODELS_DIR, f"{model_name.split('/')[-1]}-int8")
+
+
+def _get_device() -> str:
+    global _device
+    if _device is None:
+        import torch
+        _device = "cuda" if torch.cuda.is_available() else "cpu"
+    return _device
+
+
+def _ct2_thread_settings():
+    """Resolve (inter_threads, intra_threads) from settings, defaulting to all cores."""
+    inter_threads = settings.TRANSLATION_CT2_INTER_THREADS or multiprocessing.cpu_count()
+    intra_threads = settings.TRANSLATION_CT2_INTRA_THREADS
+    return inter_threads, intra_threads
+
+
+def _set_status(key: str, status: str, **fields):
+    entry = _model_status.setdefault(key, {})
+    entry["status"] = status
+    entry.update(fields)
+
+
+def convert_nllb_to_ct2(quantization: str = "int8", force: bool = True, output_dir: str = CT2_MODEL_PATH):
+    """Convert NLLB model to CTranslate2 INT8 format (one-time operation)"""
+    import ctranslate2
+
+    logger.info("Converting NLLB-200-distilled-600M to CTranslate2 INT8 format...")
+    logger.info("This is a one-time operation and will take a few minutes...")
+
+    start_time = time.time()
+
+    # Create models directory if it doesn't exist
+    os.makedirs(os.path.dirname(CT2_MODEL_PATH), exist_ok=True)
+
+    # Convert using ctranslate2 converter
+    ctranslate2.converters.TransformersConverter(
+        NLLB_MODEL_NAME
+    ).convert(
+        output_dir,
+        quantization=quantization,  # INT8 quantization for 4x speed + smaller size
+        force=force
+    )
+
+    elapsed = time.time() - start_time
+    logger.info(f"✓ Model converted to CTranslate2 INT8 in {elapsed:.1f}s")
+    logger.info(f"  Saved to: {output_dir}")
+
+
+def convert_marian_to_ct2(target_lang: str, quantization: str = "int8", force: bool = True) -> str:
+    """Convert the Helsinki-NLP Marian model for a language to CTranslate2 INT8."""
+    import ctranslate2
+
+    model_name = marian_model_name(target_lang)
+    output_dir = marian_ct2_path(target_lang)
+    logger.info(f"Converting {model_name} to CTranslate2 {quantization} format...")
+
+    start_time = time.time()
+    os.makedirs(MODELS_DIR, exist_ok=True)
+    ctranslate2.converters.TransformersConverter(model_name).convert(
+        output_dir,
+        quantization=quantization,
+        force=force,
+    )
+
+    elapsed = time.time() - start_time
+    logger.info(f"✓ {model_name} converted in {elapsed:.1f}s")
+    logger.info(f"  Saved to: {output_dir}")
+    return output_dir
+
+
+def get_ct2_nllb_model():
+    """
+    Load CTranslate2 INT8 quantized NLLB model for Malayalam translation
+    MAXIMUM SPEED: Optimized for fastest possible inference
+
+    Normally already loaded by the startup preload. If the model has not been
+    converted, it is converted here only when TRANSLATION_CONVERT_ON_DEMAND is on.
+    """
+    if _ct2_translator is None:
+        if not os.path.exists(CT2_MODEL_PATH):
+            _convert_nllb_on_demand()
+        with _load_lock:
+            if _ct2_translator is None:
+                _load_ct2_nllb_model()
+    return _ct2_translator, _ct2_tokenizer, _get_device()
+
+
+def _convert_nllb_on_demand():
+    """
+    Convert NLLB into a temporary directory and rename it into place, so a
+    half-written model is never loaded and _load_lock is not held meanwhile.
+    """
+    with _convert_lock:
+        if os.path.exists(CT2_MODEL_PATH):
+            return  # converted by another thread while we waited
+        if not settings.TRANSLATION_CONVERT_ON_DEMAND:
+            _set_status("nllb", "missing")
+            raise RuntimeError(
+                f"NLLB CTranslate2 model not found at {CT2_MODEL_PATH}; "
+                "run convert_translation_models.py --nllb-only"
+            )
+        _set_status("nllb", "converting")
+        convert_start = time.time()
+        tmp_dir = f"{CT2_MODEL_PATH}.converting-{os.getpid()}"
+        try:
+            convert_nllb_to_ct2(output_dir=tmp_dir)
+            os.replace(tmp_dir, CT2_MODEL_PATH)
+        except Exception as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.exists(CT2_MODEL_PATH):
+                _set_status("nllb", "failed", error=str(e))
+                raise
+            # Another worker process published its conversion first
+        _model_status["nllb"]["convert_seconds"] = round(time.time() - convert_start, 1)
+
+
+def _load_ct2_nllb_model():
+    global _ct2_translator, _ct2_tokenizer
+
+    import ctranslate2
+    from transformers import NllbTokenizerFast
+
+    _set_status("nllb", "loading", error=None)
+    start_time = time.time()
+    try:
+        device = _get_device()
+        inter_threads, intra_threads = _ct2_thread_settings()
+
+        logger.info(f"Loading CTranslate2 INT8 NLLB model on {device} with {inter_threads} threads...")
+
+        # MAXIMUM SPEED settings
+        translator = ctranslate2.Translator(
+            CT2_MODEL_PATH,
+            device=device,
+            compute_type="int8",
+            inter_threads=inter_threads,
+            intra_threads=intra_threads,  # Some intra-op parallelism helps
+        )
+
+        # Use FAST tokenizer (2-5x faster tokenization)
+        tokenizer = NllbTokenizerFast.from_pretrained(
+            NLLB_MODEL_NAME,
+            use_fast=True
+        )
+
+        # Warm up the model (first inference is slow)
+        logger.info("Warming up model...")
+        tokenizer.src_lang = "eng_Latn"
+        warmup_tokens = tokenizer("Hello", return_tensors=None)["input_ids"]
+        warmup_tokens = tokenizer.convert_ids_to_tokens(warmup_tokens)
+        translator.translate_batch([warmup_tokens], target_prefix=[["mal_Mlym"]], beam_size=1)
+    except Exception as e:
+        _set_status("nllb", "failed", error=str(e))
+        raise
+
+    _ct2_translator, _ct2_tokenizer = translator, tokenizer
+    load_time = time.time() - start_time
+    _set_status("nllb", "ready", load_seconds=round(load_time, 1))
+    logger.info(f"✓ CTranslate2 INT8 NLLB model loaded and warmed up in {load_time:.1f}s")
+
+
+def get_ct2_marian_model(target_lang: str):
+    """
+    Load the converted CTranslate2 INT8 Marian model for a language.
+    Returns (translator, tokenizer, device), or None when the model has not been
+    converted yet (run convert_translation_models.py).
+    """
+    model_path = marian_ct2_path(target_lang)
+    key = f"marian:{target_lang}"
+    if model_path in _ct2_marian:
+        if _model_status.get(key, {}).get("status") != "ready":
+            # Loaded already for another language that uses the same model
+            _set_status(key, "ready", load_seconds=0.0, error=None)
+        translator, tokenizer = _ct2_marian[model_path]
+        return translator, tokenizer, _get_device()
+
+    if not os.path.exists(model_path):
+        return None
+
+    import ctranslate2
+    from transformers import MarianTokenizer
+
+    with _load_lock:
+        if model_path not in _ct2_marian:
+            _set_status(key, "loading", error=None)
+            start_time = time.time()
+            try:
+                device = _get_device()
+                inter_threads, intra_threads = _ct2_thread_settings()
+
+                translator = ctranslate2.Translator(
+                    model_path,
+                    device=device,
+                    compute_type="int8",
+                    inter_threads=inter_threads,
+                    intra_threads=intra_threads,
+                )
+                tokenizer = MarianTokenizer.from_pretrained(marian_model_name(target_lang))
+            except Exception as e:
+                _set_status(key, "failed", error=str(e))
+                raise
+            _ct2_marian[model_path] = (translator, tokenizer)
+
+            load_time = time.time() - start_time
+            _set_status(key, "ready", load_seconds=round(load_time, 1))
+            logger.info(f"✓ CTranslate2 INT8 Marian model for {target_lang} loaded in {load_time:.1f}s")
+        else:
+            _set_status(key, "ready", load_seconds=0.0, error=None)
+
+    translator, tokenizer = _ct2_marian[model_path]
+    return translator, tokenizer, _get_device()
+
+
+def get_model_for_language(target_lang):
+    """Get or load the appropriate model for the target language (non-Malayalam)
+    OPTIMIZED: Uses half-precision on GPU and eval mode
+    """
+    from transformers import MarianMTModel, MarianTokenizer
+    import torch
+
+    global _translation_model, _tokenizer
+
+    if _translation_model is None:
+        _translation_model = {}
+        _tokenizer = {}
+
+    device = _get_device()
+    model_name = marian_model_name(target_lang)
+
+    # Load model if not cached
+    if target_lang not in _translation_model:
+        logger.info(f"Loading model for {target_lang}: {model_name}")
+        _tokenizer[target_lang] = MarianTokenizer.from_pretrained(model_name)
+
+        use_half = device == "cuda"
+        if use_half:
+            _translation_model[target_lang] = MarianMTModel.from_pretrained(
+                model_name,
+                torch_dtype=torch.float16
+            ).to(device)
+        else:
+            _translation_model[target_lang] = MarianMTModel.from_pretrained(model_name).to(device)
+
+        _translation_model[target_lang].eval()
+        logger.info(f"Model for {target_lang} loaded on {device} (half={use_half})")
+
+    return _translation_model[target_lang], _tokenizer[target_lang], device
+
+
+def select_backend(target_lang: str) -> str:
+    """
+    Pick the backend for a target language:
+    - "nllb": CTranslate2 NLLB (Malayalam, or every language when TRANSLATION_ROUTE="nllb")
+    - "ct2_marian": converted CTranslate2 Marian model
+    - "marian": eager PyTorch Marian (only when the converted model is missing)
+    """
+    if target_lang == "ml":
+        return "nllb"
+    if settings.TRANSLATION_ROUTE == "nllb" and target_lang in NLLB_LANGUAGE_CODES:
+        return "nllb"
+    model_path = marian_ct2_path(target_lang)
+    if model_path in _ct2_marian or os.path.exists(model_path):
+        return "ct2_marian"
+    return "marian"
+
+
+def clear_cache() -> str:
+    """Drop all cached translators. Returns a label describing what was loaded."""
+    global _ct2_translator, _ct2_tokenizer, _translation_model, _tokenizer, _device
+
+    with _load_lock:
+        old_type = "CTranslate2" if (_ct2_translator or _ct2_marian) else ("Helsinki" if _translation_model else "None")
+
+        _ct2_translator = None
+        _ct2_tokenizer = None
+        _ct2_marian.clear()
+        _translation_model = None
+        _tokenizer = None
+        _device = None
+        _model_status.clear()
+    return old_type
+
+
+def _preload_languages():
+    return [lang.strip() for lang in settings.TRANSLATION_PRELOAD_LANGUAGES.split(",") if lang.strip()]
+
+
+def model_status() -> dict:
+    """
+    Status of every model the deployment may serve:
+    missing (not converted), converted (on disk, not loaded yet), converting,
+    loading, ready or failed, with conversion/load durations in seconds.
+    """
+    def entry(key, path):
+        current = dict(_model_status.get(key, {}))
+        if "status" not in current:
+            current["status"] = "converted" if os.path.exists(path) else "missing"
+        current["path"] = os.path.abspath(path)
+        return current
+
+    models = {"nllb": entry("nllb", CT2_MODEL_PATH)}
+    for lang in _preload_languages():
+        if select_backend(lang) != "nllb":
+            models[f"marian:{lang}"] = entry(f"marian:{lang}", marian_ct2_path(lang))
+    return models
+
+
+def preload_models() -> None:
+    """Convert (if allowed) and load NLLB plus TRANSLATION_PRELOAD_LANGUAGES Marian models."""
+    try:
+        get_ct2_nllb_model()
+    except Exception as e:
+        logger.error(f"NLLB preload failed: {e}")
+
+    for lang in _preload_languages():
+        if select_backend(lang) == "nllb":
+            continue
+        try:
+            if get_ct2_marian_model(lang) is None:
+                _set_status(f"marian:{lang}", "missing")
+                logger.warning(f"No converted CTranslate2 model for {lang}; run convert_translation_models.py")
+        except Exception as e:
+            logger.error(f"Marian preload for {lang} failed: {e}")
+
+
+def start_preload_thread() -> threading.Thread:
+    """Preload translation models without blocking application startup."""
+    thread = threading.Thread(target=preload_models, name="translation-preload", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,199 @@
+"""
+Compiled glossary + phrase-fix engine for translation post-processing.
+
+Per-language glossaries live in app/data/glossaries/<lang>.json:
+
+    {
+      "terms": {"source term": "standard term", ...},
+      "phrase_fixes": [
+        {"name": "...", "pattern": "...", "replacement": "...", "regex": false}
+      ],
+      "section_titles": {"Section Title": "translated title", ...}
+    }
+
+Each glossary is compiled once into a single alternation regex and applied in
+one traversal of the text. Regex phrase fixes are tried before glossary terms at
+each position; fix patterns must therefore accept both the raw model wording and
+the standardized term (e.g. "(?:ഗ്രഹണശേഷി|ധാരണ)"). Glossary files are reloaded
+automatically when their modification time changes.
+"""
+import json
+import logging
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+from app.ml.translation_markup import normalize_title
+
+logger = logging.getLogger(__name__)
+
+GLOSSARY_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "glossaries")
+
+_WHITESPACE_RUN = re.compile(r"[ \t]+")
+
+
+def _trie_pattern(terms) -> str:
+    """Build a prefix-trie regex for literal terms.
+
+    A flat "a|b|c" alternation is tried alternative by alternative at every text
+    position; the trie form follows one branch per character, so matching cost no
+    longer grows with glossary size. Optional groups are greedy, so the longest
+    term wins at a position, like a longest-first alternation. Spaces inside terms
+    match any run of spaces/tabs.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node) -> str:
+        branches = [
+            ("[ \t]+" if ch == " " else re.escape(ch)) + build(child)
+            for ch, child in sorted(node.items())
+            if ch
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+
+class GlossaryPostprocessor:
+    """Single-pass matcher for one language's glossary terms and phrase fixes.
+
+    Whitespace collapsing, glossary terms and phrase fixes share one alternation
+    regex without capture groups (capture groups disable most of `re`'s literal
+    optimizations); the replacement is dispatched on the matched text.
+    """
+
+    def __init__(
+        self,
+        language: str,
+        terms: Dict[str, str],
+        phrase_fixes: list,
+        mtime: float = 0.0,
+        section_titles: Optional[Dict[str, str]] = None,
+    ):
+        self.language = language
+        self.mtime = mtime
+        self.term_count = len(terms)
+        self.fix_count = len(phrase_fixes)
+        # Pre-translated section headings, used instead of the model (see translation_markup)
+        self._section_titles = {
+            normalize_title(title): target for title, target in (section_titles or {}).items()
+        }
+
+        # Literal fixes behave exactly like glossary terms
+        self._literals = {term.strip(): target for term, target in terms.items() if term.strip()}
+        self._regex_fixes = []
+        for fix in phrase_fixes:
+            if fix.get("regex"):
+                self._regex_fixes.append((re.compile(fix["pattern"]), fix["replacement"]))
+            else:
+                self._literals[fix["pattern"]] = fix["replacement"]
+
+        # Regex fixes first (they take priority at a position), then the literal trie
+        # (longest term wins, like the old sorted replace loop). Literal spaces accept
+        # any run of spaces/tabs because collapsing happens in the same pass.
+        alternatives = [f"(?:{pattern.pattern})" for pattern, _ in self._regex_fixes]
+        if self._literals:
+            alternatives.append(_trie_pattern(self._literals))
+        # Tabs and multi-space runs; a lone space never matches, so it costs nothing
+        alternatives.append(r"\t[ \t]*| [ \t]+")
+        self._pattern = re.compile("|".join(alternatives))
+
+    def _replace(self, match: "re.Match") -> str:
+        matched = match.group(0)
+        if matched[0] in " \t":
+            # Whitespace run (glossary terms never start with whitespace)
+            return " "
+        replacement = self._literals.get(matched)
+        if replacement is not None:
+            return replacement
+        matched = _WHITESPACE_RUN.sub(" ", matched)
+        replacement = self._literals.get(matched)
+        if replacement is not None:
+            return replacement
+        for pattern, fix_replacement in self._regex_fixes:
+            if pattern.fullmatch(matched):
+                return pattern.sub(fix_replacement, matched)
+        return matched
+
+    def lookup_title(self, title: str) -> Optional[str]:
+        """Glossary translation of a section title, or None."""
+        return self._section_titles.get(normalize_title(title))
+
+    def apply(self, text: str) -> str:
+        """Collapse runs of spaces/tabs and apply all terms and fixes in one pass."""
+        if not text:
+            return text
+        return self._pattern.sub(self._replace, text)
+
+
+_cache: Dict[str, GlossaryPostprocessor] = {}
+_lock = threading.Lock()
+
+
+def _glossary_path(language: str) -> str:
+    return os.path.join(GLOSSARY_DIR, f"{language}.json")
+
+
+def _load(language: str, path: str, mtime: float) -> GlossaryPostprocessor:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    processor = GlossaryPostprocessor(
+        language,
+        terms=data.get("terms", {}),
+        phrase_fixes=data.get("phrase_fixes", []),
+        mtime=mtime,
+        section_titles=data.get("section_titles", {}),
+    )
+    logger.info(
+        f"Compiled {language} glossary: {processor.term_count} terms, {processor.fix_count} phrase fixes"
+    )
+    return processor
+
+
+def get_postprocessor(language: str) -> Optional[GlossaryPostprocessor]:
+    """Return the compiled post-processor for a language, or None if it has no glossary.
+
+    Recompiles when the glossary file has changed on disk (hot reload).
+    """
+    path = _glossary_path(language)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    cached = _cache.get(language)
+    if cached is not None and cached.mtime == mtime:
+        return cached
+
+    with _lock:
+        cached = _cache.get(language)
+        if cached is None or cached.mtime != mtime:
+            cached = _load(language, path, mtime)
+            _cache[language] = cached
+    return cached
+
+
+def reload_glossaries() -> Dict[str, int]:
+    """Force recompilation of every glossary file. Returns term counts per language."""
+    with _lock:
+        _cache.clear()
+    loaded = {}
+    if os.path.isdir(GLOSSARY_DIR):
+        for filename in sorted(os.listdir(GLOSSARY_DIR)):
+            if filename.endswith(".json"):
+                language = filename[:-len(".json")]
+                processor = get_postprocessor(language)
+                if processor is not None:
+                    loaded[language] = processor.term_count
+    return loaded
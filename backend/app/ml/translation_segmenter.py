@@ -0,0 +1,106 @@
+"""
+Sentence segmentation for long translation lines.
+
+AI summary paragraphs often arrive as one long line. Decoding them as a single
+sequence is slow, can hit max_decoding_length and pads every other line in the
+batch to the same length. Lines longer than SEGMENT_MIN_CHARS are split into
+sentences (without breaking on clinical abbreviations such as "Dr.", "e.g." or
+"approx."), translated as separate segments and rejoined with the original
+spacing between sentences.
+"""
+import re
+from typing import List, Sequence, Tuple
+
+# Shorter lines are translated as one segment
+SEGMENT_MIN_CHARS = 160
+
+# Lower-case words that end with "." without ending a sentence
+CLINICAL_ABBREVIATIONS = {
+    "dr", "mr", "mrs", "ms", "st", "no", "vs", "etc", "approx", "avg", "min", "max",
+    "hr", "hrs", "wk", "wks", "mo", "mos", "yr", "yrs", "sec", "secs", "mins",
+    "e.g", "i.e", "eg", "ie", "cf", "fig", "dept", "incl", "resp",
+    "b.i.d", "t.i.d", "q.i.d", "p.r.n", "a.m", "p.m",
+}
+
+# Sentence-ending punctuation (plus closing quotes/brackets), whitespace, then
+# something that can start a sentence
+_BOUNDARY = re.compile(r"([.!?]+[\"')\]]*)(\s+)(?=[\"'(\[]?[A-Z0-9•*\-])")
+_LAST_WORD = re.compile(r"(\S+?)[.!?]+[\"')\]]*$")
+_INITIALS = re.compile(r"^(?:[a-z]\.)*[a-z]$")
+_TERMINAL_PUNCTUATION = re.compile(r"([.!?]+)[\"')\]]*$")
+# Sentence enders a translation may legitimately use instead of the source's
+_TRANSLATED_ENDERS = (".", "!", "?", "।", "॥")
+
+
+def _ends_with_abbreviation(sentence: str) -> bool:
+    if not sentence.rstrip("\"')]").endswith("."):
+        return False
+    match = _LAST_WORD.search(sentence)
+    if not match:
+        return False
+    word = match.group(1).lstrip("\"'([").lower()
+    # Numbers end sentences: "reached level 3.", "improved to 4.5."
+    if not word or word[0].isdigit():
+        return False
+    # Known abbreviations ("approx.", "e.g.") and initials ("J.", "J.K.")
+    return word in CLINICAL_ABBREVIATIONS or bool(_INITIALS.match(word))
+
+
+def split_sentences(line: str) -> List[Tuple[str, str]]:
+    """
+    Split a line into (sentence, following whitespace) pairs such that
+    "".join(s + ws for s, ws in pairs) == line. Short lines are returned whole.
+    """
+    if len(line) < SEGMENT_MIN_CHARS:
+        return [(line, "")]
+    pieces = []
+    start = 0
+    for match in _BOUNDARY.finditer(line):
+        sentence = line[start:match.end(1)]
+        if _ends_with_abbreviation(sentence):
+            continue
+        pieces.append((sentence, match.group(2)))
+        start = match.end()
+    pieces.append((line[start:], ""))
+    return pieces
+
+
+def segment_lines(contents: Sequence[str]):
+    """
+    Split each line into sentence segments.
+    Returns (segments, layout): the flat list of segments to translate and, per
+    input line, the list of (segment index, separator) needed to rebuild it.
+    """
+    segments = []
+    layout = []
+    for content in contents:
+        line_layout = []
+        for sentence, separator in split_sentences(content):
+            line_layout.append((len(segments), separator))
+            segments.append(sentence)
+        layout.append(line_layout)
+    return segments, layout
+
+
+def restore_terminal_punctuation(source: str, translated: str) -> str:
+    """Re-append the source sentence's closing punctuation if the model dropped it."""
+    translated = translated.strip()
+    match = _TERMINAL_PUNCTUATION.search(source.strip())
+    if match and translated and not translated.rstrip("\"')]").endswith(_TRANSLATED_ENDERS):
+        return translated + match.group(1)
+    return translated
+
+
+def rejoin_line(line_layout, segments: Sequence[str], translated: Sequence[str]) -> str:
+    """Rebuild one translated line from its translated segments and original spacing."""
+    if len(line_layout) == 1:
+        return translated[line_layout[0][0]]
+    return "".join(
+        restore_terminal_punctuation(segments[idx], translated[idx]) + separator
+        for idx, separator in line_layout
+    )
+
+
+def length_sorted_order(token_lists: Sequence[Sequence[str]]) -> List[int]:
+    """Indices ordered by token count, so each batch holds similar-length segments."""
+    return sorted(range(len(token_lists)), key=lambda i: len(token_lists[i]))
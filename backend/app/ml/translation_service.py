@@ -0,0 +1,214 @@
+"""
+Out-of-process translation service shared by all API workers on a host.
+
+One service process owns the CTranslate2 models (one copy in memory, one thread
+pool sized by TRANSLATION_CT2_INTER_THREADS/INTRA_THREADS) and the uvicorn
+workers send it translation requests over a local socket. Enable it by starting
+
+    python -m app.ml.translation_service --address /tmp/ssm-translation.sock
+
+and setting TRANSLATION_SERVICE_ADDRESS to the same address ("host:port" for
+TCP, a filesystem path for a Unix socket, or \\\\.\\pipe\\name on Windows).
+Connections are authenticated with SECRET_KEY.
+
+Protocol (multiprocessing.connection, pickled dicts):
+    request:  {"op": "<op>", **payload}
+    reply:    {"ok": True, "result": ...} | {"ok": False, "error": "..."}
+    streams:  any number of {"ok": True, "item": ...}, then {"ok": True, "done": True}
+"""
+import argparse
+import logging
+import threading
+from multiprocessing.connection import Client, Listener
+from typing import Any, Iterator, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationServiceError(RuntimeError):
+    """The translation service is unreachable or returned an error."""
+
+
+class TranslationServiceTimeout(TranslationServiceError):
+    """No reply within TRANSLATION_SERVICE_TIMEOUT."""
+
+
+def parse_address(address: str):
+    """"127.0.0.1:8765" -> ("127.0.0.1", 8765); anything else is a socket/pipe path."""
+    host, sep, port = address.rpartition(":")
+    if sep and host and port.isdigit():
+        return host, int(port)
+    return address
+
+
+def _authkey() -> bytes:
+    return settings.SECRET_KEY.encode("utf-8")
+
+
+class TranslationServiceClient:
+    """
+    Client used by API workers. Calls reuse one connection per thread; each
+    stream gets a connection of its own, because a stream may be consumed from
+    different threadpool threads and must not share a socket with calls.
+    """
+
+    def __init__(self, address: str, timeout: float):
+        self.address = parse_address(address)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _open(self):
+        try:
+            return Client(self.address, authkey=_authkey())
+        except (OSError, EOFError) as e:
+            raise TranslationServiceError(f"Translation service unavailable at {self.address}: {e}") from e
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+        return conn
+
+    def _discard(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def _receive(self, conn):
+        if not conn.poll(self.timeout):
+            raise TranslationServiceTimeout(f"Translation service timed out after {self.timeout:.0f}s")
+        reply = conn.recv()
+        if not reply.get("ok"):
+            raise TranslationServiceError(reply.get("error") or "Translation service error")
+        return reply
+
+    def call(self, op: str, **payload) -> Any:
+        conn = self._connection()
+        try:
+            conn.send({"op": op, **payload})
+            return self._receive(conn)["result"]
+        except TranslationServiceTimeout:
+            # The late reply would otherwise be read by the next call
+            self._discard()
+            raise
+        except (OSError, EOFError) as e:
+            self._discard()
+            raise TranslationServiceError(f"Translation service connection lost: {e}") from e
+
+    def stream(self, op: str, **payload) -> Iterator[Any]:
+        conn = self._open()
+        try:
+            conn.send({"op": op, **payload})
+            while True:
+                reply = self._receive(conn)
+                if reply.get("done"):
+                    return
+                yield reply["item"]
+        except (OSError, EOFError) as e:
+            raise TranslationServiceError(f"Translation service connection lost: {e}") from e
+        finally:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+
+_client: Optional[TranslationServiceClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> Optional[TranslationServiceClient]:
+    """Client for TRANSLATION_SERVICE_ADDRESS, or None when translation runs in-process."""
+    global _client
+    if not settings.TRANSLATION_SERVICE_ADDRESS:
+        return None
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = TranslationServiceClient(
+                    settings.TRANSLATION_SERVICE_ADDRESS, settings.TRANSLATION_SERVICE_TIMEOUT
+                )
+    return _client
+
+
+def _handle(conn) -> None:
+    # Imported here: the endpoint module imports this one for the client
+    from app.api.endpoints import translation
+    from app.ml import translation_models
+
+    handlers = {
+        "translate": lambda p: translation.translate_plain_text_local(p["text"], p["target_language"]),
+        "translate_document": lambda p: translation.translate_document_fields_local(p["fields"], p["target_language"]),
+        "status": lambda p: translation_models.model_status(),
+    }
+    stream_handlers = {
+        "translate_lines_stream": lambda p: translation.iter_raw_translated_lines(p["text"], p["target_lang"]),
+    }
+
+    try:
+        while True:
+            try:
+                request = conn.recv()
+            except EOFError:
+                return
+            op = request.get("op")
+            try:
+                if op in stream_handlers:
+                    for item in stream_handlers[op](request):
+                        conn.send({"ok": True, "item": item})
+                    conn.send({"ok": True, "done": True})
+                elif op in handlers:
+                    conn.send({"ok": True, "result": handlers[op](request)})
+                else:
+                    conn.send({"ok": False, "error": f"Unknown operation: {op}"})
+            except (OSError, EOFError):
+                return
+            except Exception as e:
+                logger.exception(f"Translation service operation {op} failed")
+                conn.send({"ok": False, "error": str(e)})
+    finally:
+        conn.close()
+
+
+def serve(address: str) -> None:
+    """Preload the models and serve requests; one thread per worker connection."""
+    from app.ml import translation_models
+
+    translation_models.start_preload_thread()
+    listener = Listener(parse_address(address), authkey=_authkey())
+    logger.info(f"Translation service listening on {address}")
+    try:
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:  # failed authentication, aborted handshake
+                logger.warning(f"Rejected translation service connection: {e}")
+                continue
+            threading.Thread(target=_handle, args=(conn,), daemon=True).start()
+    finally:
+        listener.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the shared translation service")
+    parser.add_argument("--address", default=settings.TRANSLATION_SERVICE_ADDRESS,
+                        help="host:port, Unix socket path or Windows pipe (default: TRANSLATION_SERVICE_ADDRESS)")
+    args = parser.parse_args()
+    if not args.address:
+        parser.error("--address or TRANSLATION_SERVICE_ADDRESS is required")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    # This process is the service: never forward translations to another one
+    settings.TRANSLATION_SERVICE_ADDRESS = None
+    serve(args.address)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, UniqueConstraint, Index, text
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+
+class AISummaryCache(Base):
+    """Cached TherapyAISummaryResponse for one student/filter/report-set fingerprint."""
+    __tablename__ = "ai_summary_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
+    # sha256 of filters, report ids + updated_at, model and prompt version
+    cache_key = Column(String(64), nullable=False, unique=True, index=True)
+    model = Column(String, nullable=True)
+    prompt_version = Column(String, nullable=True)
+    response = Column(JSON, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class AISectionCache(Base):
+    """Generated text for one analysis section, keyed by its rendered prompt and generation settings."""
+    __tablename__ = "ai_section_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # sha256 of prompt, model, max_tokens and temperature
+    prompt_hash = Column(String(64), nullable=False, unique=True, index=True)
+    section = Column(String, nullable=False)
+    model = Column(String, nullable=True)
+    output = Column(Text, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class AIRollingSummary(Base):
+    """
+    Running main summary per student and therapy type. Reports created after
+    the checkpoint are folded into `summary` instead of re-sending the history.
+    """
+    __tablename__ = "ai_rolling_summaries"
+    __table_args__ = (
+        UniqueConstraint("student_id", "therapy_type", name="uq_ai_rolling_summaries_student_therapy_type"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
+    # "" when the summary covers all therapy types
+    therapy_type = Column(String, nullable=False, default="")
+    summary = Column(Text, nullable=False)
+    # Checkpoint: highest report id folded in, how many reports that covers and
+    # the newest updated_at among them (a later edit forces a rebuild)
+    last_report_id = Column(Integer, nullable=False)
+    report_count = Column(Integer, nullable=False)
+    last_report_updated_at = Column(DateTime(timezone=True), nullable=True)
+    model = Column(String, nullable=True)
+    prompt_version = Column(String, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class AISummaryJob(Base):
+    """Queued AI analysis run (POST /therapy-reports/summary/ai/jobs)."""
+    __tablename__ = "ai_summary_jobs"
+    __table_args__ = (
+        # Single-flight: at most one queued/running job per request fingerprint
+        Index(
+            "uq_ai_summary_jobs_active_cache_key",
+            "cache_key",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+            sqlite_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    # uuid4 hex
+    id = Column(String(32), primary_key=True)
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Same fingerprint as ai_summary_cache.cache_key
+    cache_key = Column(String(64), nullable=False, index=True)
+    # TherapyAISummaryRequest as JSON
+    request = Column(JSON, nullable=False)
+    # queued / running / done / failed
+    status = Column(String, nullable=False, default="queued")
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    requested_by_user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class AISummaryBatch(Base):
+    """Class-wide AI analysis run (POST /therapy-reports/summary/ai/batches or batch_ai_summaries.py)."""
+    __tablename__ = "ai_summary_batches"
+
+    # uuid4 hex
+    id = Column(String(32), primary_key=True)
+    class_name = Column(String, nullable=True)
+    # TherapyAISummaryRequest fields shared by every student (dates, therapy type, model)
+    request = Column(JSON, nullable=False)
+    # queued / running / done
+    status = Column(String, nullable=False, default="queued")
+    total = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    requested_by_user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class AISummaryBatchItem(Base):
+    """One student of a batch; its status is the batch's persisted progress."""
+    __tablename__ = "ai_summary_batch_items"
+    __table_args__ = (
+        UniqueConstraint("batch_id", "student_id", name="uq_ai_summary_batch_items_batch_student"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    batch_id = Column(String(32), ForeignKey("ai_summary_batches.id", ondelete="CASCADE"), nullable=False, index=True)
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
+    # Student.student_id (e.g. "STU2025001"), as TherapyAISummaryRequest expects
+    student_code = Column(String, nullable=False)
+    # pending / running / done / skipped (no matching reports) / failed
+    status = Column(String, nullable=False, default="pending")
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 
@@ -26,3 +26,23 @@ class Notification(Base):
     is_read = Column(Boolean, default=False)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class NotificationTranslation(Base):
+    """Pre-translated report_summary for a notification, produced in the background at send time."""
+    __tablename__ = "notification_translations"
+    __table_args__ = (
+        UniqueConstraint("notification_id", "language", name="uq_notification_translations_notification_language"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    notification_id = Column(Integer, ForeignKey("notifications.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Target language code as sent to /translate (e.g., "mal_Mlym")
+    language = Column(String, nullable=False)
+    # pending / done / failed
+    status = Column(String, nullable=False, default="pending")
+    translated_summary = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -39,6 +39,8 @@ class Student(Base):
     guardian_name = Column(String)
     guardian_relationship = Column(String)
     guardian_contact = Column(String)
+    # Comma-separated translation language codes for parent reports (e.g., "mal_Mlym")
+    preferred_languages = Column(String, nullable=True)
     # Special Needs Information
     disability_type = Column(String, nullable=True) 
     disability_percentage = Column(Float, nullable=True) 
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Text, DateTime, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Text, DateTime, JSON, Index, Float, UniqueConstraint
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 
 
 class TherapyReport(Base):
     __tablename__ = "therapy_reports"
+    __table_args__ = (
+        # AI summaries: one student's reports, optionally of one therapy type, by date
+        Index("ix_therapy_reports_student_type_date", "student_id", "therapy_type", "report_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -26,3 +30,38 @@ class TherapyReport(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class TherapyProgressStats(Base):
+    """
+    Running progress statistics of one student's reports (app/utils/progress_stats.py),
+    per therapy type plus one row over all types (therapy_type = "").
+    Updated as reports are created; rebuilt from the reports when one is edited.
+    """
+    __tablename__ = "therapy_progress_stats"
+    __table_args__ = (
+        UniqueConstraint("student_id", "therapy_type", name="uq_therapy_progress_stats_student_type"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
+    therapy_type = Column(String, nullable=False, default="")
+
+    report_count = Column(Integer, nullable=False, default=0)
+    first_date = Column(Date, nullable=True)
+    last_date = Column(Date, nullable=True)
+    # Days between consecutive sessions: Welford running mean and sum of squared deviations
+    interval_mean = Column(Float, nullable=False, default=0.0)
+    interval_m2 = Column(Float, nullable=False, default=0.0)
+    # {progress_level: count} and {therapy_type: count}, in order of first appearance
+    level_counts = Column(JSON, nullable=False, default=dict)
+    therapy_counts = Column(JSON, nullable=False, default=dict)
+    first_level = Column(String, nullable=True)
+    last_level = Column(String, nullable=True)
+    # [[report_date, score 1-6], ...] for reports with a rated progress level, oldest first
+    level_timeline = Column(JSON, nullable=False, default=list)
+
+    # Newest report folded in; used to tell whether the row still matches the reports
+    last_report_id = Column(Integer, nullable=True)
+    last_report_updated_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -11,6 +11,8 @@ class NotificationCreate(BaseModel):
     report_from_date: Optional[str] = None
     report_to_date: Optional[str] = None
     therapy_type: Optional[str] = None
+    # Languages to pre-translate report_summary into; defaults to the student's preferred_languages
+    target_languages: Optional[List[str]] = None
 
 
 class NotificationResponse(BaseModel):
@@ -27,6 +29,10 @@ class NotificationResponse(BaseModel):
     therapy_type: Optional[str] = None
     is_read: bool
     created_at: datetime
+    # Filled when /my-notifications is called with ?language=
+    translated_summary: Optional[str] = None
+    translation_language: Optional[str] = None
+    translation_status: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -53,6 +53,8 @@ class StudentBase(BaseModel):
     guardian_relationship: Optional[str] = None
     guardian_contact: Optional[str] = None
     total_family_income: Optional[str] = None
+    # Comma-separated translation language codes for parent reports (e.g., "mal_Mlym")
+    preferred_languages: Optional[str] = None
 
     # Bank Details
     bank_name: Optional[str] = None
@@ -0,0 +1,306 @@
+"""
+Canonical therapy section schema and a normalized view of `goals_achieved`.
+
+Reports store section notes in `goals_achieved` as {key: {"label", "notes", ...}}
+(or {key: "notes"}), as a JSON string of that, or as free text with
+"Section Title:" headings. `report_goals(report)` parses a report once into a
+`ReportGoals` (entries, section -> notes lookup, readable text) and caches it on
+the report object, so every prompt builder and fallback working on the same
+loaded reports shares one parse. `collect_section_notes` resolves notes to the
+canonical sections (labels, label/key aliases, keyword overlap) in one pass
+over the reports; the matching itself is memoized per (key, label, section).
+"""
+import functools
+import json
+import logging
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THERAPY_TYPE = "Speech Therapy"
+
+# The 5 sections of each therapy type (matching the frontend report forms)
+THERAPY_SECTIONS: Dict[str, List[str]] = {
+    "Speech Therapy": [
+        "Receptive Language Skills (Comprehension)",
+        "Expressive Language Skills",
+        "Oral Motor & Oral Placement Therapy (OPT) Goals",
+        "Pragmatic Language Skills (Social Communication)",
+        "Narrative Skills",
+    ],
+    "Behavioral Therapy": [
+        "Behavior Regulation & Self-Control",
+        "Attention, Compliance & Task Engagement",
+        "Emotional Regulation Skills",
+        "Social Behavior & Interaction Skills",
+        "Adaptive Behavior & Functional Skills",
+    ],
+    "Cognitive Therapy": [
+        "Attention & Concentration Skills",
+        "Memory & Recall Skills",
+        "Problem Solving & Reasoning Skills",
+        "Executive Functioning Skills",
+        "Cognitive Flexibility & Processing Skills",
+    ],
+    "Occupational Therapy": [
+        "Fine Motor Skills",
+        "Sensory Processing & Integration",
+        "Visual-Motor Integration Skills",
+        "Activities of Daily Living (ADL)",
+        "Handwriting & Pre-Academic Skills",
+    ],
+    "Physical Therapy": [
+        "Gross Motor Skills",
+        "Balance & Postural Control",
+        "Strength & Endurance",
+        "Coordination & Motor Planning",
+        "Functional Mobility Skills",
+    ],
+}
+
+# Old/alternate labels (reports saved with getGoalsForTherapyType()) -> canonical section
+LABEL_ALIASES: Dict[str, str] = {
+    # Behavioral Therapy
+    "Behavioral Management": "Behavior Regulation & Self-Control",
+    "Emotional Regulation": "Emotional Regulation Skills",
+    "Social Skills": "Social Behavior & Interaction Skills",
+    "Coping Strategies": "Adaptive Behavior & Functional Skills",
+    # Occupational Therapy
+    "Fine Motor Skills": "Fine Motor Skills",
+    "Gross Motor Skills": "Gross Motor Skills",
+    "Daily Living Activities": "Activities of Daily Living (ADL)",
+    "Sensory Integration": "Sensory Processing & Integration",
+    # Physical Therapy
+    "Strength & Endurance": "Strength & Endurance",
+    "Flexibility & Range of Motion": "Coordination & Motor Planning",
+    "Balance & Coordination": "Balance & Postural Control",
+    "Mobility & Gait": "Functional Mobility Skills",
+}
+
+# JSON keys -> canonical section
+KEY_ALIASES: Dict[str, str] = {
+    # Behavioral Therapy
+    "behavior_regulation": "Behavior Regulation & Self-Control",
+    "behavioral_management": "Behavior Regulation & Self-Control",
+    "attention_compliance": "Attention, Compliance & Task Engagement",
+    "emotional_regulation": "Emotional Regulation Skills",
+    "social_behavior": "Social Behavior & Interaction Skills",
+    "social_skills": "Social Behavior & Interaction Skills",
+    "adaptive_behavior": "Adaptive Behavior & Functional Skills",
+    "coping_strategies": "Adaptive Behavior & Functional Skills",
+}
+
+_RAW_HEADING = re.compile(r'^([A-Z][A-Za-z\s&(),]+(?:\s+and\s+[A-Z]+)?[A-Za-z\s]*):', re.MULTILINE)
+_NON_WORD = re.compile(r'[^a-z0-9\s]')
+_STOPWORDS = frozenset({'and', 'the', 'of', 'for', 'in', 'skills', 'a', ''})
+
+
+def therapy_sections_for(therapy_type: Optional[str]) -> List[str]:
+    """Canonical sections of a therapy type (Speech Therapy's for unknown types)."""
+    return THERAPY_SECTIONS.get(therapy_type, THERAPY_SECTIONS[DEFAULT_THERAPY_TYPE])
+
+
+def parse_goals_achieved(goals_achieved):
+    """Parse goals_achieved field which may be a JSON string, dict, or None.
+    Returns a dict or None."""
+    if goals_achieved is None:
+        return None
+    if isinstance(goals_achieved, dict):
+        return goals_achieved
+    if isinstance(goals_achieved, str):
+        try:
+            parsed = json.loads(goals_achieved)
+            if isinstance(parsed, dict):
+                return parsed
+        except (json.JSONDecodeError, TypeError):
+            logger.warning(f"Could not parse goals_achieved JSON string: {goals_achieved[:100]}")
+    return None
+
+
+class GoalEntry(NamedTuple):
+    key: str
+    label: str    # as stored ('' when missing); plain-string entries have none
+    notes: str    # stripped ('' when missing)
+    kind: str     # "dict" ({label, notes, ...}), "text" (plain string) or "other"
+    display: str  # name shown in readable text
+
+
+class ReportGoals:
+    """One report's goals_achieved, parsed once."""
+
+    def __init__(self, goals_achieved):
+        self.present = bool(goals_achieved)
+        self.parsed = parse_goals_achieved(goals_achieved)
+        # Free text with "Section:" headings (not JSON)
+        self.raw = goals_achieved if self.parsed is None and isinstance(goals_achieved, str) else None
+        self.entries: List[GoalEntry] = []
+        self._by_name: Dict[str, str] = {}
+        self._raw_sections: Dict[str, str] = {}
+        for key, value in (self.parsed or {}).items():
+            if isinstance(value, dict):
+                label = value.get('label') or ''
+                notes = (value.get('notes') or '').strip()
+                entry = GoalEntry(key, label, notes, "dict", value.get('label', key))
+                if notes:
+                    # Label first (new format), then key; first non-empty note wins
+                    self._by_name.setdefault(label, notes)
+                    self._by_name.setdefault(key, notes)
+            elif isinstance(value, str):
+                entry = GoalEntry(key, '', value.strip(), "text", key)
+                if entry.notes:
+                    self._by_name.setdefault(key, entry.notes)
+            else:
+                entry = GoalEntry(key, '', '', "other", key)
+            self.entries.append(entry)
+
+    def titles(self) -> List[str]:
+        """Section titles used by this report (labels, else keys; headings of free text)."""
+        if not self.present:
+            return []
+        if self.parsed is not None:
+            return [e.label if e.kind == "dict" and e.label else e.key for e in self.entries]
+        if self.raw is not None:
+            return [m.strip() for m in _RAW_HEADING.findall(self.raw) if m.strip()]
+        return []
+
+    def section_content(self, section_name: str) -> str:
+        """Full note of one section, matched by exact label or key ('' when absent)."""
+        if not self.present:
+            return ""
+        if self.parsed is not None:
+            return self._by_name.get(section_name, "")
+        if self.raw is None:
+            return ""
+        if section_name not in self._raw_sections:
+            pattern = rf"^{re.escape(section_name)}:\s*(.*?)(?=\n[A-Z][A-Za-z\s&(),]+(?:\s+and\s+[A-Z]+)?[A-Za-z\s]*:|$)"
+            match = re.search(pattern, self.raw, re.DOTALL | re.MULTILINE)
+            self._raw_sections[section_name] = match.group(1).strip() if match else ""
+        return self._raw_sections[section_name]
+
+    def readable_text(self) -> str:
+        """'Label: notes; Label: notes' (or the free text itself), untrimmed."""
+        if self.parsed is None:
+            return self.raw.strip() if self.raw else ""
+        return "; ".join(f"{e.display}: {e.notes}" for e in self.entries if e.kind != "other" and e.notes)
+
+    def has_section_notes(self) -> bool:
+        return any(e.kind == "dict" and e.notes for e in self.entries)
+
+
+def report_goals(report) -> ReportGoals:
+    """The report's parsed goals, cached on the report object while goals_achieved is unchanged."""
+    goals = report.goals_achieved
+    cached = getattr(report, "_report_goals", None)
+    if cached is not None and cached[0] is goals:
+        return cached[1]
+    parsed = ReportGoals(goals)
+    try:
+        report._report_goals = (goals, parsed)
+    except AttributeError:
+        pass
+    return parsed
+
+
+def section_titles(reports: Iterable) -> List[str]:
+    """Unique section titles across reports, sorted."""
+    titles = set()
+    for report in reports:
+        titles.update(report_goals(report).titles())
+    return sorted(titles)
+
+
+def _keywords(text: str) -> frozenset:
+    return frozenset(_NON_WORD.sub(' ', text.lower()).split()) - _STOPWORDS
+
+
+@functools.lru_cache(maxsize=256)
+def section_aliases(title: str, canonical: bool) -> Tuple[frozenset, frozenset]:
+    """(label aliases, key aliases) of a section; only canonical sections have alias entries."""
+    labels = {title, title.lower()}
+    keys = set()
+    if canonical:
+        for old_label, section in LABEL_ALIASES.items():
+            if section == title:
+                labels.update((old_label, old_label.lower()))
+        for key, section in KEY_ALIASES.items():
+            if section == title:
+                keys.update((key, key.lower()))
+    return frozenset(labels), frozenset(keys)
+
+
+@functools.lru_cache(maxsize=8192)
+def match_reason(key: str, label: str, title: str, canonical: bool) -> Optional[str]:
+    """Why a {label, notes} entry belongs to section `title`, or None when it does not."""
+    label = label.strip()
+    title_lower = title.lower().strip()
+    aliases, key_aliases = section_aliases(title, canonical)
+    key_words = _keywords(key.replace('_', ' '))
+    title_keywords = _keywords(title_lower)
+
+    if label == title:
+        return "exact label match"
+    if label in aliases or label.lower() in aliases:
+        return "alias match"
+    if label and label.lower() == title_lower:
+        return "case-insensitive exact match"
+    if key.lower().strip() in key_aliases:
+        return "explicit key alias"
+    if key_words:
+        matching_words = key_words & title_keywords
+        if len(matching_words) >= 2:
+            return f"keyword match (2+ words): {set(matching_words)}"
+        if len(key_words) == 1 and key_words <= title_keywords:
+            return f"single keyword match: {set(key_words)}"
+        for alias in aliases:
+            alias_keywords = _keywords(alias)
+            if alias_keywords:
+                matching = key_words & alias_keywords
+                if len(matching) >= 2 or (len(key_words) == 1 and key_words <= alias_keywords):
+                    return f"alias keyword match via '{alias}': {set(matching)}"
+    if label:
+        label_words = _keywords(label)
+        if label_words and title_keywords:
+            overlap = label_words & title_keywords
+            min_words = min(len(label_words), len(title_keywords))
+            if len(overlap) >= max(2, int(0.8 * min_words)):
+                return f"substring/overlap match ({len(overlap)}/{min_words} words): {set(overlap)}"
+    return None
+
+
+@functools.lru_cache(maxsize=8192)
+def _text_key_matches(key: str, title: str) -> bool:
+    return title.lower().replace(' ', '_').startswith(key.lower().replace(' ', '_')[:10])
+
+
+def collect_section_notes(
+    reports: Sequence, titles: Sequence[str], canonical_titles: Iterable[str] = ()
+) -> Dict[str, List[Tuple[int, str, str]]]:
+    """
+    {title: [(report position, note, goal key), ...]} in report order, in one
+    pass over the reports. Titles in `canonical_titles` also match their label
+    and key aliases. A note may match several sections.
+    """
+    canonical = set(canonical_titles)
+    notes_by_title: Dict[str, List[Tuple[int, str, str]]] = {title: [] for title in titles}
+    for r_pos, report in enumerate(reports):
+        goals = report_goals(report)
+        if goals.parsed is None:
+            logger.warning(f"Report ID={getattr(report, 'id', None)}: goals_achieved could not be parsed "
+                           f"(type={type(report.goals_achieved)})")
+            continue
+        for entry in goals.entries:
+            if not entry.notes:
+                continue
+            for title in titles:
+                if entry.kind == "dict":
+                    reason = match_reason(entry.key, entry.label, title, title in canonical)
+                    if reason:
+                        logger.debug(f"  ✓ MATCH - Key='{entry.key}', Label='{entry.label}', "
+                                     f"Section='{title}', Reason={reason}")
+                        notes_by_title[title].append((r_pos, entry.notes, entry.key))
+                elif entry.kind == "text" and _text_key_matches(entry.key, title):
+                    notes_by_title[title].append((r_pos, entry.notes, entry.key))
+    for title in titles:
+        logger.info(f"Section '{title}': Found {len(notes_by_title[title])} notes")
+    return notes_by_title
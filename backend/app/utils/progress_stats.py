@@ -0,0 +1,188 @@
+"""
+Progress statistics for the AI summary metrics, kept as a running summary.
+
+The improvement metrics (session frequency, attendance consistency, progress
+trend and journey) only need counts, the first/last dates and levels, the
+mean and variance of the days between sessions and the sequence of rated
+levels. All of these can be folded in one report at a time (`add_report`,
+Welford's algorithm for the intervals), so they are stored per student and
+therapy type in therapy_progress_stats and read without loading reports.
+`from_reports` builds the same statistics in memory for a filtered report set.
+"""
+from collections import Counter
+from typing import Optional, Sequence
+
+from app.models.therapy_report import TherapyProgressStats
+
+# Row over all therapy types
+ALL_THERAPY_TYPES = ""
+
+LEVEL_SCORES = {"Poor": 1, "Below Average": 2, "Average": 3, "Good": 4, "Very Good": 5, "Excellent": 6}
+
+# Std-dev thresholds compare a running (floating point) variance
+_EPSILON = 1e-9
+
+
+def new_stats(student_id: Optional[int] = None, therapy_type: str = ALL_THERAPY_TYPES) -> TherapyProgressStats:
+    return TherapyProgressStats(
+        student_id=student_id,
+        therapy_type=therapy_type,
+        report_count=0,
+        interval_mean=0.0,
+        interval_m2=0.0,
+        level_counts={},
+        therapy_counts={},
+        level_timeline=[],
+    )
+
+
+def can_append(stats: TherapyProgressStats, report) -> bool:
+    """Whether `report` sorts after every report in `stats` (report_date, then id)."""
+    if not stats.report_count:
+        return True
+    return report.report_date >= stats.last_date and report.id > (stats.last_report_id or 0)
+
+
+def add_report(stats: TherapyProgressStats, report) -> None:
+    """Fold the next report (oldest first, see `can_append`) into `stats`."""
+    count = stats.report_count or 0
+    if count:
+        # Welford update over the count intervals seen so far
+        interval = (report.report_date - stats.last_date).days
+        delta = interval - stats.interval_mean
+        stats.interval_mean += delta / count
+        stats.interval_m2 += delta * (interval - stats.interval_mean)
+    else:
+        stats.first_date = report.report_date
+    stats.report_count = count + 1
+    stats.last_date = report.report_date
+    stats.last_report_id = max(report.id, stats.last_report_id or 0)
+    if report.updated_at and (stats.last_report_updated_at is None or report.updated_at > stats.last_report_updated_at):
+        stats.last_report_updated_at = report.updated_at
+
+    # JSON columns: assign new objects so the change is flushed
+    if report.therapy_type:
+        counts = dict(stats.therapy_counts or {})
+        counts[report.therapy_type] = counts.get(report.therapy_type, 0) + 1
+        stats.therapy_counts = counts
+    level = report.progress_level
+    if level:
+        counts = dict(stats.level_counts or {})
+        counts[level] = counts.get(level, 0) + 1
+        stats.level_counts = counts
+        if stats.first_level is None:
+            stats.first_level = level
+        stats.last_level = level
+        if level in LEVEL_SCORES:
+            stats.level_timeline = list(stats.level_timeline or []) + [[report.report_date.isoformat(), LEVEL_SCORES[level]]]
+
+
+def from_reports(reports: Sequence, student_id: Optional[int] = None, therapy_type: str = ALL_THERAPY_TYPES):
+    """Statistics of `reports` (ordered oldest first), not attached to a session."""
+    stats = new_stats(student_id, therapy_type)
+    for report in reports:
+        add_report(stats, report)
+    return stats
+
+
+def covers(stats: TherapyProgressStats, reports: Sequence) -> bool:
+    """Whether stored `stats` describe exactly `reports` (none added, removed or edited since)."""
+    if not reports or stats.report_count != len(reports):
+        return False
+    updated_ats = [r.updated_at for r in reports if r.updated_at]
+    return stats.last_report_id == max(r.id for r in reports) and stats.last_report_updated_at == (
+        max(updated_ats) if updated_ats else None
+    )
+
+
+def _scores(stats: TherapyProgressStats):
+    return [score for _, score in stats.level_timeline or []]
+
+
+def improvement_trend(stats: TherapyProgressStats) -> str:
+    if stats.report_count < 2:
+        return "Insufficient data for trend analysis"
+    scores = _scores(stats)
+    if len(scores) < 2:
+        return "No progress levels available for comparison"
+
+    start_avg = sum(scores[:len(scores)//3]) / len(scores[:len(scores)//3]) if len(scores) >= 3 else scores[0]
+    end_avg = sum(scores[-len(scores)//3:]) / len(scores[-len(scores)//3:]) if len(scores) >= 3 else scores[-1]
+    improvement = end_avg - start_avg
+
+    if improvement > 1.5:
+        return "Significant improvement demonstrated"
+    elif improvement > 0.5:
+        return "Moderate improvement shown"
+    elif improvement > 0:
+        return "Slight improvement noted"
+    elif improvement == 0:
+        return "Stable performance maintained"
+    else:
+        return "Performance decline noted - needs attention"
+
+
+def interval_variance(stats: TherapyProgressStats) -> Optional[float]:
+    """Population variance of the days between sessions (None below two sessions)."""
+    if stats.report_count < 2:
+        return None
+    return max(0.0, stats.interval_m2 / (stats.report_count - 1))
+
+
+def consistency(stats: TherapyProgressStats) -> str:
+    if stats.report_count < 3:
+        return "Need more sessions for consistency analysis"
+    variance = interval_variance(stats)
+    if variance <= 3 ** 2 + _EPSILON:
+        return "Highly consistent attendance"
+    elif variance <= 7 ** 2 + _EPSILON:
+        return "Moderately consistent attendance"
+    else:
+        return "Variable attendance pattern"
+
+
+def progress_journey(stats: TherapyProgressStats) -> str:
+    if not stats.report_count:
+        return "No progress data available"
+    rated = sum((stats.level_counts or {}).values())
+    if not rated:
+        return "No progress levels recorded"
+    if rated == 1:
+        return f"Single assessment: {stats.first_level}"
+
+    scores = _scores(stats)
+    if len(scores) >= 2:
+        start_avg = sum(scores[:2]) / 2
+        end_avg = sum(scores[-2:]) / 2
+        if end_avg > start_avg + 0.5:
+            return f"Improving journey: from {stats.first_level} to {stats.last_level}"
+        elif end_avg < start_avg - 0.5:
+            return f"Declining trend: from {stats.first_level} to {stats.last_level}"
+        else:
+            return f"Stable performance: maintained around {stats.last_level} level"
+
+    return f"Progress tracked from {stats.first_level} to {stats.last_level}"
+
+
+def improvement_metrics(stats: TherapyProgressStats) -> dict:
+    """The `improvement_metrics` block of an AI summary."""
+    if not stats.report_count:
+        return {"error": "No reports available for analysis"}
+
+    therapy_counter = Counter(stats.therapy_counts or {})
+    span_days = (stats.last_date - stats.first_date).days if stats.report_count > 1 else 0
+    if stats.report_count > 1:
+        frequency_desc = f"{span_days / (stats.report_count - 1):.1f} days between sessions"
+    else:
+        frequency_desc = "Single session only"
+
+    return {
+        "total_sessions": stats.report_count,
+        "therapy_types_count": len(therapy_counter),
+        "most_common_therapy": therapy_counter.most_common(1)[0] if therapy_counter else ("None", 0),
+        "progress_distribution": dict(stats.level_counts or {}),
+        "session_frequency": frequency_desc,
+        "consistency_score": consistency(stats),
+        "improvement_trend": improvement_trend(stats),
+        "date_span_days": span_days,
+    }
@@ -0,0 +1,186 @@
+"""
+Token-budgeted prompt assembly for the AI summary prompts.
+
+A prompt is a fixed head (instructions, few-shot examples), a fixed tail and a
+list of candidate content items (session notes). Items are added in priority
+order until the model's token budget is used up, then rendered in document
+order under their group headers. Duplicate notes are skipped, oversized notes
+are trimmed, and the result records honestly whether any report content was
+left out (`AssembledPrompt.truncated`).
+
+Tokens are counted with the tokenizer named by AI_PROMPT_TOKENIZER (a local
+tokenizer.json file or a Hugging Face tokenizer already in the local cache);
+without one, a word/punctuation estimate calibrated for Llama-style BPE is used.
+"""
+import functools
+import logging
+import math
+import re
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_PIECES = re.compile(r"\w+|[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+# BPE vocabularies split a share of English words into several pieces
+_TOKENS_PER_PIECE = 1.25
+
+
+class PromptItem(NamedTuple):
+    """One piece of optional prompt content."""
+    text: str                 # rendered text, including its trailing newline
+    group: str = ""           # header group (e.g. section title)
+    order: Tuple = ()         # position in the rendered prompt (sorted within the whole prompt)
+    rank: Tuple = ()          # selection priority, lower first
+    key: Optional[str] = None  # dedupe key; an item whose key was already included is skipped
+
+
+class AssembledPrompt(str):
+    """Prompt text (a plain str for callers) plus how it was assembled."""
+
+    def __new__(cls, text: str, truncated: bool = False, tokens: int = 0, omitted: int = 0, trimmed: int = 0):
+        obj = super().__new__(cls, text)
+        obj.truncated = truncated
+        obj.tokens = tokens
+        obj.omitted = omitted
+        obj.trimmed = trimmed
+        return obj
+
+
+@functools.lru_cache(maxsize=1)
+def _tokenizer() -> Optional[Callable[[str], int]]:
+    name = settings.AI_PROMPT_TOKENIZER
+    if not name:
+        return None
+    try:
+        if name.endswith(".json"):
+            from tokenizers import Tokenizer
+
+            tok = Tokenizer.from_file(name)
+            return lambda text: len(tok.encode(text, add_special_tokens=False).ids)
+        from transformers import AutoTokenizer
+
+        tok = AutoTokenizer.from_pretrained(name, local_files_only=True)
+        return lambda text: len(tok.encode(text, add_special_tokens=False))
+    except Exception as e:
+        logger.warning(f"Prompt tokenizer {name!r} unavailable ({e}); estimating token counts")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    tokenize = _tokenizer()
+    if tokenize is not None:
+        return tokenize(text)
+    return math.ceil(len(_PIECES.findall(text)) * _TOKENS_PER_PIECE)
+
+
+@functools.lru_cache(maxsize=1)
+def _model_budgets() -> Dict[str, int]:
+    budgets = {}
+    for entry in (settings.AI_PROMPT_TOKEN_BUDGETS or "").split(","):
+        model, sep, value = entry.strip().rpartition("=")
+        if sep and model and value.strip().isdigit():
+            budgets[model.strip()] = int(value)
+    return budgets
+
+
+def prompt_token_budget(model: Optional[str] = None) -> int:
+    """Prompt token budget for `model` (AI_PROMPT_TOKEN_BUDGETS override, else AI_PROMPT_TOKEN_BUDGET)."""
+    return _model_budgets().get(model or "", settings.AI_PROMPT_TOKEN_BUDGET)
+
+
+def dedupe_key(text: str) -> str:
+    """Case/whitespace/punctuation-insensitive key for spotting repeated notes."""
+    return _WHITESPACE.sub(" ", re.sub(r"[^\w\s]", " ", text.lower())).strip()
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` at a word boundary so it fits in `max_tokens` (adds an ellipsis)."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    words = text.split(" ")
+    lo, hi = 0, len(words)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(" ".join(words[:mid]) + "…") <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return (" ".join(words[:lo]).rstrip(" ,;:") + "…") if lo else ""
+
+
+def recency_rank(position: int, count: int, tiebreak: int = 0) -> Tuple:
+    """
+    Rank for a note from report `position` of `count` (chronological): the most
+    recent report first, then the earliest (baseline), then the rest from
+    newest to oldest. `tiebreak` (e.g. section index) makes groups take turns.
+    """
+    if position == count - 1:
+        return (0, 0, tiebreak)
+    if position == 0:
+        return (1, 0, tiebreak)
+    return (2, count - 1 - position, tiebreak)
+
+
+def assemble_prompt(
+    head: str,
+    items: Iterable[PromptItem],
+    tail: str = "",
+    *,
+    budget: int,
+    group_headers: Optional[Dict[str, str]] = None,
+    max_item_tokens: Optional[int] = None,
+) -> AssembledPrompt:
+    """
+    Fill `head` + items + `tail` up to `budget` tokens.
+
+    The head and tail are always kept, even when they alone exceed the budget.
+    A group's header is emitted before its first included item and costs tokens
+    only then. Items larger than `max_item_tokens` (default: a quarter of the
+    budget) are trimmed.
+    """
+    group_headers = group_headers or {}
+    max_item_tokens = max_item_tokens or max(32, budget // 4)
+    used = count_tokens(head) + count_tokens(tail)
+    selected: List[PromptItem] = []
+    opened = set()
+    seen_keys = set()
+    omitted = 0
+    trimmed = 0
+
+    for item in sorted(items, key=lambda i: i.rank):
+        if item.key is not None and item.key in seen_keys:
+            continue  # same note already included: nothing is lost
+        text = item.text
+        if count_tokens(text) > max_item_tokens:
+            text = trim_to_tokens(text.rstrip("\n"), max_item_tokens) + "\n"
+            trimmed += 1
+        cost = count_tokens(text)
+        if item.group not in opened:
+            cost += count_tokens(group_headers.get(item.group, ""))
+        if used + cost > budget:
+            omitted += 1
+            continue
+        used += cost
+        opened.add(item.group)
+        if item.key is not None:
+            seen_keys.add(item.key)
+        selected.append(item._replace(text=text))
+
+    parts = [head]
+    emitted_groups = set()
+    for item in sorted(selected, key=lambda i: i.order):
+        if item.group not in emitted_groups:
+            emitted_groups.add(item.group)
+            parts.append(group_headers.get(item.group, ""))
+        parts.append(item.text)
+    parts.append(tail)
+    text = "".join(parts)
+
+    if omitted or trimmed:
+        logger.info(f"Prompt budget {budget}: {omitted} item(s) omitted, {trimmed} trimmed, ~{used} tokens")
+    return AssembledPrompt(text, truncated=bool(omitted or trimmed), tokens=used, omitted=omitted, trimmed=trimmed)
@@ -0,0 +1,112 @@
+"""
+Generate AI summaries for a whole class (or a list of students) in one run.
+
+    python batch_ai_summaries.py --class-name "Class 3" --from-date 2025-06-01 --to-date 2025-12-31
+    python batch_ai_summaries.py --students STU2025001 STU2025004 --therapy-type "Speech Therapy"
+    python batch_ai_summaries.py --resume <batch_id>
+    python batch_ai_summaries.py --status <batch_id>
+
+Uses the same tables, concurrency (AI_BATCH_CONCURRENCY) and router rate limit
+(AI_BATCH_ROUTER_CALLS_PER_MINUTE / AI_BATCH_ROUTER_BURST) as
+POST /api/v1/therapy-reports/summary/ai/batches, but runs in this process.
+Progress is stored per student: Ctrl-C lets the students in flight finish and
+leaves the rest pending for --resume (or for the API server's next start).
+Results are written to the AI summary cache as well, so later requests for the
+same student and range are served without calling the model.
+"""
+import argparse
+import sys
+import threading
+from datetime import date
+
+from app.core import ai_summary_batches
+from app.core.config import settings
+from app.db.session import SessionLocal
+
+
+def print_status(batch_id: str) -> bool:
+    from app import crud
+
+    db = SessionLocal()
+    try:
+        batch = crud.ai_summary.get_batch(db, batch_id)
+        if batch is None:
+            print(f"Batch {batch_id} not found")
+            return False
+        print(
+            f"Batch {batch.id} [{batch.status}] class={batch.class_name or '-'} "
+            f"{batch.completed + batch.failed}/{batch.total} finished, {batch.failed} failed"
+        )
+        for item in crud.ai_summary.get_batch_items(db, batch_id):
+            error = f"  {item.error}" if item.error else ""
+            print(f"  {item.student_code:14s} {item.status:8s}{error}")
+        return True
+    finally:
+        db.close()
+
+
+def create_batch(args) -> str:
+    from app import crud
+
+    db = SessionLocal()
+    try:
+        students, missing = ai_summary_batches.resolve_students(
+            db, class_name=args.class_name, student_codes=args.students or ()
+        )
+        if missing:
+            sys.exit(f"Students not found: {', '.join(missing)}")
+        if not students:
+            sys.exit(f"No students found in class {args.class_name}")
+        request = {
+            "from_date": args.from_date.isoformat() if args.from_date else None,
+            "to_date": args.to_date.isoformat() if args.to_date else None,
+            "therapy_type": args.therapy_type,
+            "model": args.model,
+            "text_gen_model": args.model,
+        }
+        batch = crud.ai_summary.create_batch(db, students=students, request=request, class_name=args.class_name)
+        print(f"Created batch {batch.id} with {batch.total} student(s)")
+        return batch.id
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--class-name", help="generate for every student with this class_name")
+    parser.add_argument("--students", nargs="+", help="student ids, e.g. STU2025001")
+    parser.add_argument("--from-date", type=date.fromisoformat)
+    parser.add_argument("--to-date", type=date.fromisoformat)
+    parser.add_argument("--therapy-type")
+    parser.add_argument("--model", default="meta-llama/Llama-3.3-70B-Instruct")
+    parser.add_argument("--resume", metavar="BATCH_ID", help="continue an interrupted batch")
+    parser.add_argument("--status", metavar="BATCH_ID", help="print a batch's progress and exit")
+    args = parser.parse_args()
+
+    if args.status:
+        sys.exit(0 if print_status(args.status) else 1)
+    if not args.resume and not args.class_name and not args.students:
+        parser.error("give --class-name and/or --students, or --resume BATCH_ID")
+    if not settings.HUGGINGFACE_API_TOKEN:
+        sys.exit("HUGGINGFACE_API_TOKEN is not set")
+
+    batch_id = args.resume or create_batch(args)
+    lock = threading.Lock()
+    finished = [0]
+
+    def on_item(item):
+        with lock:
+            finished[0] += 1
+            error = f" ({item.error})" if item.error else ""
+            print(f"[{finished[0]}] {item.student_code}: {item.status}{error}", flush=True)
+
+    try:
+        ai_summary_batches.run_batch(batch_id, on_item=on_item)
+    except KeyboardInterrupt:
+        print("Interrupted: finishing students in flight; resume with --resume " + batch_id)
+        ai_summary_batches.stop_batch_runners()
+    print_status(batch_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Translation latency/throughput benchmark with BLEU.
+
+Replays a corpus of summary texts through each backend configuration and writes
+p50/p95 latency, sentences/s, tokens/s, peak RSS and BLEU side by side as JSON,
+so the deployed CTranslate2 settings can be picked per core count:
+
+    python benchmark_translation.py --corpus summaries.jsonl --language ml \\
+        --inter-threads 1 2 --intra-threads 1 2 4 --beam-sizes 1 2 \\
+        --max-batch-sizes 1024 16 --batch-types tokens examples --output results.json
+
+    python benchmark_translation.py --corpus summaries.jsonl --language hi \\
+        --backends ct2_marian marian_eager
+
+Corpus formats:
+- JSONL, one summary per line: {"source": "...", "reference": "..."}
+  (reference is optional; BLEU needs references and `pip install sacrebleu`)
+- Plain text, summaries separated by a line containing only ---
+
+Each configuration runs in a fresh process so peak RSS belongs to that
+configuration alone. Models must already be converted
+(python convert_translation_models.py). CTranslate2 configurations run the
+same code as /translate (_translate_lines_ct2: markup plan, sentence
+segmentation, length-sorted token batches), with only the decoding options
+swept, so latency covers that whole path; BLEU is computed on the
+post-processed text /translate would return. Section titles are cached after
+the warm-up pass, as in a running server.
+"""
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Used when no corpus is given: a short therapy summary in the usual report layout
+SAMPLE_CORPUS = [
+    {
+        "source": (
+            "**Brief Overview**\n"
+            "• The student attended 12 speech therapy sessions between March and May.\n"
+            "• Participation improved steadily and the student followed two-step instructions.\n"
+            "\n"
+            "**Recommendations**\n"
+            "- Continue daily articulation practice at home for 10 minutes.\n"
+            "- Use visual schedules to reduce anxiety during transitions."
+        ),
+    },
+    {
+        "source": (
+            "The child showed better attention during occupational therapy.\n"
+            "Fine motor skills such as buttoning and cutting with scissors have improved.\n"
+            "Parents are encouraged to provide sensory breaks between homework tasks."
+        ),
+    },
+]
+
+
+def _load_corpus(path):
+    if not path:
+        return SAMPLE_CORPUS
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        blocks = re.split(r"^---\s*$", f.read(), flags=re.MULTILINE)
+    return [{"source": block.strip()} for block in blocks if block.strip()]
+
+
+def _percentile(values, pct):
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # ru_maxrss is KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1)
+
+
+def _corpus_bleu(hypotheses, references):
+    if not references or any(ref is None for ref in references):
+        return None
+    try:
+        import sacrebleu
+    except ImportError:
+        return None
+    return round(sacrebleu.corpus_bleu(hypotheses, [references]).score, 2)
+
+
+def _load_ct2(config):
+    import ctranslate2
+    from app.ml.translation_models import (
+        CT2_MODEL_PATH,
+        NLLB_LANGUAGE_CODES,
+        NLLB_MODEL_NAME,
+        marian_ct2_path,
+        marian_model_name,
+    )
+
+    language = config["language"]
+    if config["backend"] == "nllb":
+        from transformers import NllbTokenizerFast
+
+        model_path = CT2_MODEL_PATH
+        tokenizer = NllbTokenizerFast.from_pretrained(NLLB_MODEL_NAME, use_fast=True)
+        tokenizer.src_lang = "eng_Latn"
+        target_prefix = NLLB_LANGUAGE_CODES[language]
+    else:
+        from transformers import MarianTokenizer
+
+        model_path = marian_ct2_path(language)
+        tokenizer = MarianTokenizer.from_pretrained(marian_model_name(language))
+        target_prefix = None
+
+    if not os.path.exists(model_path):
+        raise RuntimeError(f"{model_path} not found; run convert_translation_models.py first")
+
+    translator = ctranslate2.Translator(
+        model_path,
+        device="cpu",
+        compute_type=config["compute_type"],
+        inter_threads=config["inter_threads"],
+        intra_threads=config["intra_threads"],
+    )
+    return translator, tokenizer, target_prefix
+
+
+def _make_ct2_runner(config):
+    from app.api.endpoints.translation import SEGMENT_BATCH_TOKENS, _translate_lines_ct2
+
+    translator, tokenizer, target_prefix = _load_ct2(config)
+    decode_options = {
+        "beam_size": config["beam_size"],
+        "max_batch_size": SEGMENT_BATCH_TOKENS if config["max_batch_size"] is None else config["max_batch_size"],
+        "batch_type": config["batch_type"],
+    }
+
+    def run(text):
+        # The /translate path: markup plan, sentence segmentation, length-sorted batches
+        stats = {}
+        translated = _translate_lines_ct2(
+            translator, tokenizer, text.strip(), config["language"], target_prefix, stats=stats, **decode_options
+        )
+        return translated, stats.get("segments", 0), stats.get("output_tokens", 0)
+
+    return run
+
+
+def _make_eager_runner(config):
+    import torch
+    from app.api.endpoints.translation import _split_lines_for_translation
+    from app.ml.translation_models import get_model_for_language
+
+    torch.set_num_threads(config["intra_threads"])
+    model, tokenizer, device = get_model_for_language(config["language"])
+
+    def run(text):
+        # Same single generate() call as the /translate eager fallback
+        _, line_map = _split_lines_for_translation(text)
+        if not line_map:
+            return "", 0, 0
+        inputs = tokenizer(text, return_tensors="pt", truncation=True, max_length=512).to(device)
+        with torch.no_grad():
+            outputs = model.generate(
+                **inputs,
+                max_length=512,
+                num_beams=config["beam_size"],
+                do_sample=False,
+                use_cache=True,
+            )
+        return tokenizer.decode(outputs[0], skip_special_tokens=True), len(line_map), int(outputs.shape[1])
+
+    return run
+
+
+def _postprocess(config, source, translated):
+    # translate_plain_text_local post-processes NLLB Malayalam output only
+    if config["backend"] != "nllb" or config["language"] != "ml" or not translated:
+        return translated
+    from app.api.endpoints.translation import _postprocess_malayalam_clinical_text
+
+    return _postprocess_malayalam_clinical_text(source, translated)
+
+
+def _run_config(config, corpus, repeat, concurrency):
+    """Benchmark one configuration. Runs inside its own process."""
+    load_start = time.perf_counter()
+    if config["backend"] == "marian_eager":
+        run = _make_eager_runner(config)
+    else:
+        run = _make_ct2_runner(config)
+    load_s = time.perf_counter() - load_start
+
+    sources = [doc["source"] for doc in corpus]
+    # Warm-up pass (first inference allocates buffers); its output is used for BLEU
+    outputs = [run(text)[0] for text in sources]
+
+    latencies = []
+    segments = 0
+    output_tokens = 0
+
+    def timed(text):
+        start = time.perf_counter()
+        _, n_segments, n_tokens = run(text)
+        return time.perf_counter() - start, n_segments, n_tokens
+
+    workers = concurrency or (config["inter_threads"] if config["backend"] != "marian_eager" else 1)
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _ in range(repeat):
+            for elapsed, n_segments, n_tokens in pool.map(timed, sources):
+                latencies.append(elapsed)
+                segments += n_segments
+                output_tokens += n_tokens
+    wall_s = time.perf_counter() - wall_start
+
+    hypotheses = [_postprocess(config, src, out) for src, out in zip(sources, outputs)]
+    references = [doc.get("reference") for doc in corpus]
+
+    return {
+        **config,
+        "concurrency": workers,
+        "load_s": round(load_s, 2),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 1),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 1),
+        "sentences_per_s": round(segments / wall_s, 2),
+        "tokens_per_s": round(output_tokens / wall_s, 1),
+        "peak_rss_mb": _peak_rss_mb(),
+        "bleu": _corpus_bleu(hypotheses, references),
+    }
+
+
+def _build_configs(args):
+    configs = []
+    for backend in args.backends:
+        if backend == "marian_eager":
+            # Threads/compute type/batching are CTranslate2 options; only beam size applies
+            for intra_threads, beam_size in itertools.product(args.intra_threads, args.beam_sizes):
+                configs.append({
+                    "backend": backend, "language": args.language, "compute_type": "float32",
+                    "inter_threads": 1, "intra_threads": intra_threads, "beam_size": beam_size,
+                    "max_batch_size": None, "batch_type": None,
+                })
+            continue
+        for inter, intra, compute_type, beam, max_batch, batch_type in itertools.product(
+            args.inter_threads, args.intra_threads, args.compute_types,
+            args.beam_sizes, args.max_batch_sizes, args.batch_types,
+        ):
+            configs.append({
+                "backend": backend, "language": args.language, "compute_type": compute_type,
+                "inter_threads": inter, "intra_threads": intra, "beam_size": beam,
+                "max_batch_size": max_batch, "batch_type": batch_type,
+            })
+    return configs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark translation latency, throughput and BLEU")
+    parser.add_argument("--corpus", help="JSONL ({source, reference}) or text file with summaries separated by ---")
+    parser.add_argument("--language", default="ml", help="ISO target language (default: ml)")
+    parser.add_argument("--backends", nargs="+", choices=["nllb", "ct2_marian", "marian_eager"],
+                        help="Default: nllb for ml, otherwise ct2_marian and marian_eager")
+    parser.add_argument("--inter-threads", nargs="+", type=int, default=[1])
+    parser.add_argument("--intra-threads", nargs="+", type=int, default=[2])
+    parser.add_argument("--compute-types", nargs="+", default=["int8"],
+                        help="e.g. int8 int8_float32 float32")
+    parser.add_argument("--beam-sizes", nargs="+", type=int, default=[1])
+    parser.add_argument("--max-batch-sizes", nargs="+", type=int, default=[None],
+                        help="Default: SEGMENT_BATCH_TOKENS, as /translate uses")
+    parser.add_argument("--batch-types", nargs="+", choices=["tokens", "examples"], default=["tokens"])
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes over the corpus")
+    parser.add_argument("--concurrency", type=int, default=0,
+                        help="Concurrent documents (default: inter_threads)")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run every configuration in this process (peak RSS becomes cumulative)")
+    parser.add_argument("--output", default="translation_benchmark.json")
+    args = parser.parse_args()
+
+    if not args.backends:
+        args.backends = ["nllb"] if args.language == "ml" else ["ct2_marian", "marian_eager"]
+
+    corpus = _load_corpus(args.corpus)
+    configs = _build_configs(args)
+    print(f"Corpus: {len(corpus)} summaries; {len(configs)} configurations; "
+          f"{multiprocessing.cpu_count()} CPU cores")
+
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    for i, config in enumerate(configs, 1):
+        label = ", ".join(f"{k}={v}" for k, v in config.items() if v is not None and k != "language")
+        print(f"[{i}/{len(configs)}] {label}")
+        try:
+            if args.in_process:
+                result = _run_config(config, corpus, args.repeat, args.concurrency)
+            else:
+                with ctx.Pool(1) as pool:
+                    result = pool.apply(_run_config, (config, corpus, args.repeat, args.concurrency))
+        except Exception as e:
+            print(f"  ✗ {e}")
+            results.append({**config, "error": str(e)})
+            continue
+        print(f"  p50 {result['p50_ms']} ms | p95 {result['p95_ms']} ms | "
+              f"{result['sentences_per_s']} sent/s | {result['tokens_per_s']} tok/s | "
+              f"RSS {result['peak_rss_mb']} MB | BLEU {result['bleu']}")
+        results.append(result)
+
+    report = {
+        "corpus": args.corpus or "built-in sample",
+        "documents": len(corpus),
+        "language": args.language,
+        "cpu_count": multiprocessing.cpu_count(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"✓ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark the compiled glossary post-processor against the previous
+sorted-replace-loop implementation on large Malayalam summaries, and check
+that both produce identical output.
+
+    python benchmark_translation_postprocess.py --lines 2000 --repeat 20
+"""
+import argparse
+import json
+import re
+import time
+
+from app.ml.translation_postprocess import GlossaryPostprocessor, _glossary_path, get_postprocessor
+
+
+def _legacy_postprocess(text, terms, phrase_fixes):
+    """Previous behaviour: whitespace collapse, one replace per term, then each fix."""
+    normalized = re.sub(r"[ \t]+", " ", text)
+    for source_term, target_term in sorted(terms.items(), key=lambda kv: len(kv[0]), reverse=True):
+        normalized = normalized.replace(source_term, target_term)
+    for fix in phrase_fixes:
+        if fix.get("regex"):
+            normalized = re.sub(fix["pattern"], fix["replacement"], normalized)
+        else:
+            normalized = normalized.replace(fix["pattern"], fix["replacement"])
+    return normalized
+
+
+def _build_corpus(terms, phrase_fixes, lines):
+    """Synthetic summary mixing glossary terms, fix phrases and filler text."""
+    filler = "കുട്ടി സെഷനിൽ  പങ്കെടുത്തു\tകൂടാതെ നിർദ്ദേശങ്ങൾ പാലിച്ചു."
+    samples = list(terms.keys()) + [f["pattern"] for f in phrase_fixes if not f.get("regex")]
+    samples.append("അല്പം കുറച്ച ആവർത്തിക്കേണ്ടിവരുമ്പോൾ അവൾ മെച്ചപ്പെട്ട ധാരണ കാണിച്ചു")
+    corpus = []
+    for i in range(lines):
+        term = samples[i % len(samples)]
+        corpus.append(f"• {filler} {term} {filler}")
+    return "\n".join(corpus)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark translation post-processing")
+    parser.add_argument("--language", default="ml")
+    parser.add_argument("--lines", type=int, default=2000, help="Lines in the synthetic summary")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--extra-terms", type=int, default=0,
+                        help="Pad the glossary with synthetic terms to measure scaling")
+    args = parser.parse_args()
+
+    with open(_glossary_path(args.language), encoding="utf-8") as f:
+        data = json.load(f)
+    terms = data.get("terms", {})
+    phrase_fixes = data.get("phrase_fixes", [])
+
+    processor = get_postprocessor(args.language)
+    if args.extra_terms:
+        terms = dict(terms)
+        for i in range(args.extra_terms):
+            terms[f"പദം{i:05d} സൂചിക"] = f"പദം{i:05d}"
+        processor = GlossaryPostprocessor(args.language, terms, phrase_fixes)
+    text = _build_corpus(terms, phrase_fixes, args.lines)
+
+    legacy_output = _legacy_postprocess(text, terms, phrase_fixes)
+    compiled_output = processor.apply(text)
+    print(f"Corpus: {args.lines} lines, {len(text)} chars, {len(terms)} terms")
+    print(f"Outputs identical: {legacy_output == compiled_output}")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        _legacy_postprocess(text, terms, phrase_fixes)
+    legacy_ms = (time.perf_counter() - start) * 1000 / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        processor.apply(text)
+    compiled_ms = (time.perf_counter() - start) * 1000 / args.repeat
+
+    print(f"Legacy replace loop: {legacy_ms:.2f} ms/summary")
+    print(f"Compiled single pass: {compiled_ms:.2f} ms/summary")
+    if compiled_ms > 0:
+        print(f"Speedup: {legacy_ms / compiled_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
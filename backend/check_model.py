@@ -4,7 +4,7 @@ Check which translation model is currently loaded
 import sys
 sys.path.insert(0, 'C:\\Users\\renis\\OneDrive\\Desktop\\malu\\SSM-System\\backend')
 
-from app.api.endpoints.translation import _translation_model, _tokenizer
+from app.ml.translation_models import _translation_model, _tokenizer
 
 print("="*60)
 print("CURRENT TRANSLATION MODEL STATUS")
@@ -0,0 +1,60 @@
+"""
+Offline conversion of translation models to CTranslate2 INT8.
+
+Run once per deployment (or at image build time) so that /translate never has
+to fall back to eager PyTorch or convert a model inside a request:
+
+    python convert_translation_models.py                 # NLLB + every Marian model
+    python convert_translation_models.py --nllb-only     # single multilingual NLLB route
+    python convert_translation_models.py --languages hi ta --force
+"""
+import argparse
+import logging
+import os
+
+from app.ml.translation_models import (
+    CT2_MODEL_PATH,
+    MARIAN_MODEL_MAP,
+    convert_marian_to_ct2,
+    convert_nllb_to_ct2,
+    marian_ct2_path,
+)
+
+
+def main() -> None:
+    marian_languages = [lang for lang in MARIAN_MODEL_MAP if lang != "default"]
+
+    parser = argparse.ArgumentParser(description="Convert translation models to CTranslate2")
+    parser.add_argument("--languages", nargs="+", choices=marian_languages + ["default"], default=None,
+                        help="Marian target languages to convert (default: all)")
+    parser.add_argument("--nllb-only", action="store_true",
+                        help="Only convert NLLB (use with TRANSLATION_ROUTE=nllb)")
+    parser.add_argument("--skip-nllb", action="store_true", help="Do not convert the NLLB model")
+    parser.add_argument("--quantization", default="int8", help="CTranslate2 quantization (default: int8)")
+    parser.add_argument("--force", action="store_true", help="Re-convert models that already exist")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if not args.skip_nllb:
+        if os.path.exists(CT2_MODEL_PATH) and not args.force:
+            print(f"✓ NLLB already converted: {CT2_MODEL_PATH}")
+        else:
+            convert_nllb_to_ct2(quantization=args.quantization, force=True)
+
+    if args.nllb_only:
+        return
+
+    for lang in args.languages or marian_languages + ["default"]:
+        output_dir = marian_ct2_path(lang)
+        if os.path.exists(output_dir) and not args.force:
+            print(f"✓ {lang} already converted: {output_dir}")
+            continue
+        try:
+            convert_marian_to_ct2(lang, quantization=args.quantization, force=True)
+        except Exception as e:
+            print(f"✗ Failed to convert {lang}: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Offline stand-in for the Hugging Face router's OpenAI-compatible chat API.
+
+Point the backend at it to load-test the AI summary pipeline without the real
+router (no token costs, no rate limits, reproducible latency):
+
+    python fake_llm_server.py --port 8090 --latency-ms 800 --latency-dist lognormal \\
+        --tokens-per-second 40 --error-rate 0.02
+
+    HUGGINGFACE_BASE_URL=http://127.0.0.1:8090 HUGGINGFACE_API_TOKEN=fake uvicorn app.main:app
+
+Endpoints:
+    POST /v1/chat/completions   non-streaming JSON or SSE deltas ("stream": true)
+    GET  /v1/models
+    GET  /stats                 request counts and in-flight concurrency
+    POST /stats/reset
+
+Latency = time to first token (sampled from --latency-dist) + one token every
+1/--tokens-per-second seconds. Error injection returns 500 (--error-rate) or
+429 (--rate-limit-rate), or holds the request for --hang-seconds (--hang-rate),
+which exercises client timeouts and per-section deadlines.
+
+Uses only the standard library.
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Canned output in the progress-summary layout, so the backend's quality checks
+# accept it. Repeated/truncated to the requested max_tokens.
+SUMMARY_TEXT = (
+    "Speech Therapy – Progress Summary\n\n"
+    "**Receptive Language Skills (Comprehension)**\n"
+    "• The student followed two-step instructions during structured activities with occasional visual cues. "
+    "Understanding of spatial concepts such as in, on and under was demonstrated with support.\n"
+    "• Comprehension of longer instructions remained inconsistent and required repetition on some occasions.\n\n"
+    "**Expressive Language Skills**\n"
+    "• The student used three- to four-word utterances to request items and describe actions. "
+    "Sentence length varied across activities and was shorter when the student was tired.\n\n"
+    "**Pragmatic Language Skills (Social Communication)**\n"
+    "• Turn-taking was observed in familiar games with adult prompting. "
+    "Initiating interaction with peers was emerging and occurred mainly in small groups.\n"
+)
+
+
+class FakeLLMState:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.time()
+            self.counts = {"requests": 0, "streaming": 0, "errors_500": 0, "errors_429": 0, "hangs": 0}
+            self.in_flight = 0
+            self.peak_in_flight = 0
+            self.completion_tokens = 0
+
+    def enter(self, streaming: bool):
+        with self.lock:
+            self.counts["requests"] += 1
+            if streaming:
+                self.counts["streaming"] += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def leave(self, tokens: int = 0):
+        with self.lock:
+            self.in_flight -= 1
+            self.completion_tokens += tokens
+
+    def count(self, name: str):
+        with self.lock:
+            self.counts[name] += 1
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                **self.counts,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "completion_tokens": self.completion_tokens,
+                "uptime_seconds": round(time.time() - self.started, 1),
+            }
+
+    def first_token_delay(self) -> float:
+        """Seconds before the first token, from the configured distribution."""
+        mean = self.args.latency_ms / 1000.0
+        jitter = self.args.latency_jitter_ms / 1000.0
+        dist = self.args.latency_dist
+        with self.lock:
+            if dist == "fixed":
+                value = mean
+            elif dist == "uniform":
+                value = self.rng.uniform(mean - jitter, mean + jitter)
+            elif dist == "normal":
+                value = self.rng.gauss(mean, jitter)
+            else:  # lognormal: long right tail like a shared inference endpoint
+                sigma = math.sqrt(math.log(1 + (jitter / mean) ** 2)) if mean > 0 and jitter > 0 else 0.0
+                value = self.rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma) if mean > 0 else 0.0
+        return max(0.0, value)
+
+    def pick_failure(self):
+        with self.lock:
+            roll = self.rng.random()
+        a = self.args
+        if roll < a.error_rate:
+            return "errors_500"
+        if roll < a.error_rate + a.rate_limit_rate:
+            return "errors_429"
+        if roll < a.error_rate + a.rate_limit_rate + a.hang_rate:
+            return "hangs"
+        return None
+
+
+def _completion_tokens(max_tokens: int):
+    """Whitespace-preserving word tokens of the canned text, up to max_tokens."""
+    words = SUMMARY_TEXT.replace("\n", " \n").split(" ")
+    tokens = []
+    while len(tokens) < max_tokens:
+        for word in words:
+            tokens.append(word if word.startswith("\n") or not tokens else " " + word)
+            if len(tokens) >= max_tokens:
+                break
+    return tokens
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: FakeLLMState = None  # set in main()
+
+    def log_message(self, format, *args):
+        if self.state.args.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, body: dict, extra_headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (extra_headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("/v1/models", "/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": self.state.args.model, "object": "model"}]})
+        elif self.path.rstrip("/") == "/stats":
+            self._send_json(200, self.state.snapshot())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if self.path.rstrip("/") == "/stats/reset":
+            self.state.reset()
+            self._send_json(200, {"ok": True})
+            return
+        if self.path.rstrip("/") not in ("/v1/chat/completions", "/chat/completions"):
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            body = json.loads(raw or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": "invalid JSON"})
+            return
+
+        streaming = bool(body.get("stream"))
+        max_tokens = max(1, int(body.get("max_tokens") or 256))
+        model = body.get("model") or self.state.args.model
+        self.state.enter(streaming)
+        emitted = 0
+        try:
+            failure = self.state.pick_failure()
+            if failure:
+                self.state.count(failure)
+            if failure == "hangs":
+                time.sleep(self.state.args.hang_seconds)
+            if failure == "errors_500":
+                time.sleep(self.state.first_token_delay())
+                self._send_json(500, {"error": "injected server error"})
+                return
+            if failure == "errors_429":
+                self._send_json(429, {"error": "injected rate limit"}, {"Retry-After": "1"})
+                return
+
+            tokens = _completion_tokens(max_tokens)
+            time.sleep(self.state.first_token_delay())
+            per_token = 1.0 / self.state.args.tokens_per_second if self.state.args.tokens_per_second > 0 else 0.0
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+            if streaming:
+                emitted = self._stream(completion_id, model, tokens, per_token)
+            else:
+                if per_token:
+                    time.sleep(per_token * len(tokens))
+                emitted = len(tokens)
+                self._send_json(200, {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "".join(tokens)},
+                        "finish_reason": "length" if len(tokens) >= max_tokens else "stop",
+                    }],
+                    "usage": {"prompt_tokens": len(raw) // 4, "completion_tokens": emitted,
+                              "total_tokens": len(raw) // 4 + emitted},
+                })
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client gave up (deadline)
+        finally:
+            self.state.leave(emitted)
+
+    def _stream(self, completion_id, model, tokens, per_token) -> int:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send(data: str):
+            payload = f"data: {data}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(payload):X}\r\n".encode("ascii") + payload + b"\r\n")
+            self.wfile.flush()
+
+        emitted = 0
+        for token in tokens:
+            send(json.dumps({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+            }))
+            emitted += 1
+            if per_token:
+                time.sleep(per_token)
+        send(json.dumps({
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        }))
+        send("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+        return emitted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--model", default="meta-llama/Llama-3.3-70B-Instruct")
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="mean time to first token")
+    parser.add_argument("--latency-jitter-ms", type=float, default=200.0,
+                        help="spread: half-width (uniform) or standard deviation (normal/lognormal)")
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "normal", "lognormal"], default="lognormal")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="0 = whole completion at once")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share answered with HTTP 429")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="share held for --hang-seconds first")
+    parser.add_argument("--hang-seconds", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible runs")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    Handler.state = FakeLLMState(args)
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    server.daemon_threads = True
+    print(f"Fake LLM server on http://{args.host}:{args.port} "
+          f"(first token {args.latency_dist} ~{args.latency_ms:.0f}ms, {args.tokens_per_second:g} tok/s, "
+          f"500s {args.error_rate:.1%}, 429s {args.rate_limit_rate:.1%}, hangs {args.hang_rate:.1%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
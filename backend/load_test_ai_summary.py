@@ -0,0 +1,294 @@
+"""
+Load test for the AI summary, summary stream and translation endpoints.
+
+Run entirely offline against fake_llm_server.py:
+
+    python fake_llm_server.py --port 8090 --latency-ms 800 --tokens-per-second 40
+    HUGGINGFACE_BASE_URL=http://127.0.0.1:8090 HUGGINGFACE_API_TOKEN=fake uvicorn app.main:app --port 8000
+
+    python load_test_ai_summary.py --seed-students 5 --reports-per-student 30      # once
+    python load_test_ai_summary.py --username admin --password ... \\
+        --endpoints summary stream translate --concurrency 1 4 16 --requests 40 \\
+        --fake-llm-url http://127.0.0.1:8090 --output load_results.json
+
+--seed-students writes LOADTEST### students and therapy reports straight into
+the configured database (idempotent). Each (endpoint, concurrency) level
+reports latency p50/p95/p99, time to first byte (stream), throughput and error
+counts, plus saturation figures:
+
+- concurrency_in_server: throughput x mean latency (Little's law). Well below
+  the client concurrency means requests are queueing in front of the API
+  workers/threadpool rather than being processed.
+- llm_peak_in_flight / llm_mean_in_flight: concurrent calls seen by the fake
+  LLM (sampled from its /stats), i.e. how much of the load reaches the model.
+
+Summary results are cached server-side (AI_SUMMARY_CACHE_TTL_SECONDS); set it
+to 0 on the server, or pass --vary-requests, to measure generation rather than
+cache hits.
+"""
+import argparse
+import json
+import math
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import httpx
+
+LOADTEST_PREFIX = "LOADTEST"
+
+SAMPLE_NOTES = [
+    "Followed two-step instructions with visual cues; needed repetition for longer directions.",
+    "Used three-word phrases to request items; sentence length dropped when tired.",
+    "Turn-taking observed in a board game with adult prompting.",
+    "Attention span around ten minutes; redirected twice during the table task.",
+    "Practised lip closure and tongue elevation; fatigue after five repetitions.",
+]
+
+TRANSLATE_TEXT = (
+    "**Brief Overview**\n"
+    "• The student attended regular speech therapy sessions and followed two-step instructions.\n"
+    "• Participation improved and the student used short phrases to request items."
+)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile (pct in 0..100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def seed_data(students: int, reports_per_student: int, therapy_type: str):
+    """Create LOADTEST students and reports directly in the configured database."""
+    from app.db.session import SessionLocal
+    from app.models.student import Student
+    from app.models.therapy_report import TherapyReport
+
+    db = SessionLocal()
+    try:
+        for n in range(1, students + 1):
+            student_code = f"{LOADTEST_PREFIX}{n:03d}"
+            student = db.query(Student).filter(Student.student_id == student_code).first()
+            if student is None:
+                student = Student(student_id=student_code, name=f"Load Test Student {n}", age=8)
+                db.add(student)
+                db.flush()
+            existing = db.query(TherapyReport).filter(TherapyReport.student_id == student.id).count()
+            start = date.today() - timedelta(days=7 * reports_per_student)
+            for i in range(existing, reports_per_student):
+                goals = {
+                    f"goal_{g}": {"label": label, "checked": (i + g) % 2 == 0, "notes": SAMPLE_NOTES[(i + g) % len(SAMPLE_NOTES)]}
+                    for g, label in enumerate([
+                        "Receptive Language Skills (Comprehension)",
+                        "Expressive Language Skills",
+                        "Pragmatic Language Skills (Social Communication)",
+                    ])
+                }
+                db.add(TherapyReport(
+                    student_id=student.id,
+                    report_date=start + timedelta(days=7 * i),
+                    therapy_type=therapy_type,
+                    progress_notes=SAMPLE_NOTES[i % len(SAMPLE_NOTES)],
+                    goals_achieved=goals,
+                    progress_level=["emerging", "developing", "consistent"][i % 3],
+                ))
+            db.commit()
+            print(f"Seeded {student_code}: {reports_per_student} reports")
+    finally:
+        db.close()
+
+
+def login(client: httpx.Client, base_url: str, username: str, password: str) -> str:
+    resp = client.post(f"{base_url}/auth/login", data={"username": username, "password": password})
+    resp.raise_for_status()
+    return resp.json()["access_token"]
+
+
+class FakeLLMSampler:
+    """Polls the fake LLM's /stats while a level runs."""
+
+    def __init__(self, url: str, interval: float = 0.25):
+        self.url = url.rstrip("/") if url else None
+        self.interval = interval
+        self.samples = []
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        if self.url:
+            try:
+                httpx.post(f"{self.url}/stats/reset", timeout=5)
+            except httpx.HTTPError:
+                self.url = None
+                return self
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        with httpx.Client(timeout=5) as client:
+            while not self._stop.is_set():
+                try:
+                    stats = client.get(f"{self.url}/stats").json()
+                    self.samples.append(stats["in_flight"])
+                    self.peak = max(self.peak, stats["peak_in_flight"])
+                except httpx.HTTPError:
+                    pass
+                self._stop.wait(self.interval)
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def summary(self):
+        if not self.url:
+            return {}
+        return {
+            "llm_peak_in_flight": self.peak,
+            "llm_mean_in_flight": round(statistics.mean(self.samples), 2) if self.samples else None,
+        }
+
+
+def _summary_payload(args, request_no: int) -> dict:
+    student_id = args.student_ids[request_no % len(args.student_ids)]
+    payload = {"student_id": student_id}
+    if args.therapy_type:
+        payload["therapy_type"] = args.therapy_type
+    if args.vary_requests:
+        # A different date window per request defeats the server-side summary cache
+        payload["to_date"] = str(date.today() - timedelta(days=request_no))
+    return payload
+
+
+def run_request(client: httpx.Client, args, endpoint: str, request_no: int) -> dict:
+    started = time.perf_counter()
+    first_byte = None
+    try:
+        if endpoint == "summary":
+            resp = client.post(f"{args.base_url}/therapy-reports/summary/ai", json=_summary_payload(args, request_no))
+            ok = resp.status_code == 200
+            status = resp.status_code
+        elif endpoint == "stream":
+            ok = False
+            with client.stream("POST", f"{args.base_url}/therapy-reports/summary/ai/stream",
+                               json=_summary_payload(args, request_no)) as resp:
+                status = resp.status_code
+                for line in resp.iter_lines():
+                    if first_byte is None and line:
+                        first_byte = time.perf_counter() - started
+                    if line.startswith("event: complete"):
+                        ok = status == 200
+                    elif line.startswith("event: error"):
+                        break
+        else:  # translate
+            resp = client.post(f"{args.base_url}/translate",
+                               json={"text": TRANSLATE_TEXT, "target_language": args.translate_language})
+            ok = resp.status_code == 200
+            status = resp.status_code
+    except httpx.HTTPError as e:
+        ok = False
+        status = e.__class__.__name__
+    return {"ok": ok, "status": status, "latency": time.perf_counter() - started, "ttfb": first_byte}
+
+
+def run_level(args, token: str, endpoint: str, concurrency: int) -> dict:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    offset = random.randrange(10_000) if args.vary_requests else 0
+    with httpx.Client(headers=headers, timeout=args.timeout, limits=limits) as client, \
+            FakeLLMSampler(args.fake_llm_url) as sampler, \
+            ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        results = list(pool.map(lambda n: run_request(client, args, endpoint, offset + n), range(args.requests)))
+        wall = time.perf_counter() - started
+
+    latencies = [r["latency"] for r in results if r["ok"]]
+    ttfbs = [r["ttfb"] for r in results if r["ok"] and r["ttfb"] is not None]
+    errors = {}
+    for r in results:
+        if not r["ok"]:
+            errors[str(r["status"])] = errors.get(str(r["status"]), 0) + 1
+    throughput = len(latencies) / wall if wall else 0.0
+    mean_latency = statistics.mean(latencies) if latencies else 0.0
+    row = {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": args.requests,
+        "ok": len(latencies),
+        "errors": errors,
+        "wall_seconds": round(wall, 2),
+        "throughput_rps": round(throughput, 3),
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+        "latency_p99": percentile(latencies, 99),
+        "ttfb_p50": percentile(ttfbs, 50),
+        "ttfb_p95": percentile(ttfbs, 95),
+        "concurrency_in_server": round(throughput * mean_latency, 2),
+        **sampler.summary(),
+    }
+    for key in ("latency_p50", "latency_p95", "latency_p99", "ttfb_p50", "ttfb_p95"):
+        if row[key] is not None:
+            row[key] = round(row[key], 3)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the AI summary and translation endpoints")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000/api/v1")
+    parser.add_argument("--token", help="bearer token (or use --username/--password)")
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("--endpoints", nargs="+", choices=["summary", "stream", "translate"], default=["summary", "stream"])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=32, help="requests per (endpoint, concurrency) level")
+    parser.add_argument("--student-ids", nargs="+", help=f"default: the seeded {LOADTEST_PREFIX}### students")
+    parser.add_argument("--therapy-type", default=None)
+    parser.add_argument("--translate-language", default="mal_Mlym")
+    parser.add_argument("--vary-requests", action="store_true", help="give every summary request a distinct cache key")
+    parser.add_argument("--fake-llm-url", help="fake_llm_server.py base URL, for LLM concurrency sampling")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--seed-students", type=int, default=0, help="create this many LOADTEST students, then exit")
+    parser.add_argument("--reports-per-student", type=int, default=30)
+    parser.add_argument("--seed-therapy-type", default="Speech Therapy")
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    if args.seed_students:
+        seed_data(args.seed_students, args.reports_per_student, args.seed_therapy_type)
+        return
+    if not args.student_ids:
+        args.student_ids = [f"{LOADTEST_PREFIX}{n:03d}" for n in range(1, 6)]
+
+    token = args.token
+    if not token and args.username:
+        with httpx.Client(timeout=30) as client:
+            token = login(client, args.base_url, args.username, args.password)
+
+    rows = []
+    for endpoint in args.endpoints:
+        for concurrency in args.concurrency:
+            row = run_level(args, token, endpoint, concurrency)
+            rows.append(row)
+            print(
+                f"{endpoint:9s} c={concurrency:<3d} ok={row['ok']}/{row['requests']} "
+                f"rps={row['throughput_rps']:.2f} p50={row['latency_p50']} p95={row['latency_p95']} "
+                f"p99={row['latency_p99']} ttfb_p50={row['ttfb_p50']} in_server={row['concurrency_in_server']} "
+                f"llm_peak={row.get('llm_peak_in_flight')} errors={row['errors']}"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"base_url": args.base_url, "results": rows}, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
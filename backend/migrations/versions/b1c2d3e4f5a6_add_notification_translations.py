@@ -0,0 +1,42 @@
+"""add notification translations and student preferred languages
+
+Revision ID: b1c2d3e4f5a6
+Revises: 7ab58a691691
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1c2d3e4f5a6'
+down_revision: Union[str, None] = '7ab58a691691'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('students', sa.Column('preferred_languages', sa.String(), nullable=True))
+
+    op.create_table(
+        "notification_translations",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("notification_id", sa.Integer(), sa.ForeignKey("notifications.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("language", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False, server_default="pending"),
+        sa.Column("translated_summary", sa.Text(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.UniqueConstraint("notification_id", "language", name="uq_notification_translations_notification_language"),
+    )
+    op.create_index(op.f('ix_notification_translations_notification_id'), 'notification_translations', ['notification_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_notification_translations_notification_id'), table_name='notification_translations')
+    op.drop_table('notification_translations')
+    op.drop_column('students', 'preferred_languages')
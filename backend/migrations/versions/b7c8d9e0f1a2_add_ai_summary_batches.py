@@ -0,0 +1,60 @@
+"""add ai_summary_batches and ai_summary_batch_items tables
+
+Revision ID: b7c8d9e0f1a2
+Revises: a6b7c8d9e0f1
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c8d9e0f1a2'
+down_revision: Union[str, None] = 'a6b7c8d9e0f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_summary_batches",
+        sa.Column("id", sa.String(length=32), primary_key=True, nullable=False),
+        sa.Column("class_name", sa.String(), nullable=True),
+        sa.Column("request", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False, server_default="queued"),
+        sa.Column("total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("completed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("failed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("requested_by_user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_table(
+        "ai_summary_batch_items",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column(
+            "batch_id", sa.String(length=32), sa.ForeignKey("ai_summary_batches.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("student_code", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False, server_default="pending"),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint("batch_id", "student_id", name="uq_ai_summary_batch_items_batch_student"),
+    )
+    op.create_index(op.f('ix_ai_summary_batch_items_id'), 'ai_summary_batch_items', ['id'], unique=False)
+    op.create_index(op.f('ix_ai_summary_batch_items_batch_id'), 'ai_summary_batch_items', ['batch_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_ai_summary_batch_items_batch_id'), table_name='ai_summary_batch_items')
+    op.drop_index(op.f('ix_ai_summary_batch_items_id'), table_name='ai_summary_batch_items')
+    op.drop_table('ai_summary_batch_items')
+    op.drop_table('ai_summary_batches')
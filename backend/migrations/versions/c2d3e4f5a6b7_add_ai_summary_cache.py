@@ -0,0 +1,44 @@
+"""add ai summary cache
+
+Revision ID: c2d3e4f5a6b7
+Revises: b1c2d3e4f5a6
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d3e4f5a6b7'
+down_revision: Union[str, None] = 'b1c2d3e4f5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_summary_cache",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("model", sa.String(), nullable=True),
+        sa.Column("prompt_version", sa.String(), nullable=True),
+        sa.Column("response", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(op.f('ix_ai_summary_cache_id'), 'ai_summary_cache', ['id'], unique=False)
+    op.create_index(op.f('ix_ai_summary_cache_student_id'), 'ai_summary_cache', ['student_id'], unique=False)
+    op.create_index(op.f('ix_ai_summary_cache_cache_key'), 'ai_summary_cache', ['cache_key'], unique=True)
+    op.create_index(op.f('ix_ai_summary_cache_expires_at'), 'ai_summary_cache', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_ai_summary_cache_expires_at'), table_name='ai_summary_cache')
+    op.drop_index(op.f('ix_ai_summary_cache_cache_key'), table_name='ai_summary_cache')
+    op.drop_index(op.f('ix_ai_summary_cache_student_id'), table_name='ai_summary_cache')
+    op.drop_index(op.f('ix_ai_summary_cache_id'), table_name='ai_summary_cache')
+    op.drop_table('ai_summary_cache')
@@ -0,0 +1,52 @@
+"""add therapy_progress_stats table
+
+Revision ID: c8d9e0f1a2b3
+Revises: b7c8d9e0f1a2
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d9e0f1a2b3'
+down_revision: Union[str, None] = 'b7c8d9e0f1a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows are filled lazily from existing reports on first read
+    op.create_table(
+        "therapy_progress_stats",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("therapy_type", sa.String(), nullable=False, server_default=""),
+        sa.Column("report_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("first_date", sa.Date(), nullable=True),
+        sa.Column("last_date", sa.Date(), nullable=True),
+        sa.Column("interval_mean", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("interval_m2", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("level_counts", sa.JSON(), nullable=False),
+        sa.Column("therapy_counts", sa.JSON(), nullable=False),
+        sa.Column("first_level", sa.String(), nullable=True),
+        sa.Column("last_level", sa.String(), nullable=True),
+        sa.Column("level_timeline", sa.JSON(), nullable=False),
+        sa.Column("last_report_id", sa.Integer(), nullable=True),
+        sa.Column("last_report_updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.UniqueConstraint("student_id", "therapy_type", name="uq_therapy_progress_stats_student_type"),
+    )
+    op.create_index(op.f('ix_therapy_progress_stats_id'), 'therapy_progress_stats', ['id'], unique=False)
+    op.create_index(
+        op.f('ix_therapy_progress_stats_student_id'), 'therapy_progress_stats', ['student_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_therapy_progress_stats_student_id'), table_name='therapy_progress_stats')
+    op.drop_index(op.f('ix_therapy_progress_stats_id'), table_name='therapy_progress_stats')
+    op.drop_table('therapy_progress_stats')
@@ -0,0 +1,41 @@
+"""add ai section cache
+
+Revision ID: d3e4f5a6b7c8
+Revises: c2d3e4f5a6b7
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3e4f5a6b7c8'
+down_revision: Union[str, None] = 'c2d3e4f5a6b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_section_cache",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("prompt_hash", sa.String(length=64), nullable=False),
+        sa.Column("section", sa.String(), nullable=False),
+        sa.Column("model", sa.String(), nullable=True),
+        sa.Column("output", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(op.f('ix_ai_section_cache_id'), 'ai_section_cache', ['id'], unique=False)
+    op.create_index(op.f('ix_ai_section_cache_prompt_hash'), 'ai_section_cache', ['prompt_hash'], unique=True)
+    op.create_index(op.f('ix_ai_section_cache_expires_at'), 'ai_section_cache', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_ai_section_cache_expires_at'), table_name='ai_section_cache')
+    op.drop_index(op.f('ix_ai_section_cache_prompt_hash'), table_name='ai_section_cache')
+    op.drop_index(op.f('ix_ai_section_cache_id'), table_name='ai_section_cache')
+    op.drop_table('ai_section_cache')
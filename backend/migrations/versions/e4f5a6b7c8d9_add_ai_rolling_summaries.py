@@ -0,0 +1,44 @@
+"""add ai rolling summaries
+
+Revision ID: e4f5a6b7c8d9
+Revises: d3e4f5a6b7c8
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4f5a6b7c8d9'
+down_revision: Union[str, None] = 'd3e4f5a6b7c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_rolling_summaries",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("therapy_type", sa.String(), nullable=False, server_default=""),
+        sa.Column("summary", sa.Text(), nullable=False),
+        sa.Column("last_report_id", sa.Integer(), nullable=False),
+        sa.Column("report_count", sa.Integer(), nullable=False),
+        sa.Column("last_report_updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("model", sa.String(), nullable=True),
+        sa.Column("prompt_version", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.UniqueConstraint("student_id", "therapy_type", name="uq_ai_rolling_summaries_student_therapy_type"),
+    )
+    op.create_index(op.f('ix_ai_rolling_summaries_id'), 'ai_rolling_summaries', ['id'], unique=False)
+    op.create_index(op.f('ix_ai_rolling_summaries_student_id'), 'ai_rolling_summaries', ['student_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_ai_rolling_summaries_student_id'), table_name='ai_rolling_summaries')
+    op.drop_index(op.f('ix_ai_rolling_summaries_id'), table_name='ai_rolling_summaries')
+    op.drop_table('ai_rolling_summaries')
@@ -0,0 +1,52 @@
+"""add ai summary jobs
+
+Revision ID: f5a6b7c8d9e0
+Revises: e4f5a6b7c8d9
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a6b7c8d9e0'
+down_revision: Union[str, None] = 'e4f5a6b7c8d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_summary_jobs",
+        sa.Column("id", sa.String(length=32), primary_key=True, nullable=False),
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("request", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False, server_default="queued"),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("requested_by_user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(op.f('ix_ai_summary_jobs_student_id'), 'ai_summary_jobs', ['student_id'], unique=False)
+    op.create_index(op.f('ix_ai_summary_jobs_cache_key'), 'ai_summary_jobs', ['cache_key'], unique=False)
+    op.create_index(
+        'uq_ai_summary_jobs_active_cache_key',
+        'ai_summary_jobs',
+        ['cache_key'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_ai_summary_jobs_active_cache_key', table_name='ai_summary_jobs')
+    op.drop_index(op.f('ix_ai_summary_jobs_cache_key'), table_name='ai_summary_jobs')
+    op.drop_index(op.f('ix_ai_summary_jobs_student_id'), table_name='ai_summary_jobs')
+    op.drop_table('ai_summary_jobs')
@@ -0,0 +1,13 @@
+"""
+Unit tests for the model-free helpers (run from backend/: python -m pytest tests).
+
+The test_*.py scripts in backend/ are manual checks against a running server
+and are not collected from here.
+"""
+import sys
+from pathlib import Path
+
+# Same as app/main.py: make "from app..." importable
+backend_dir = Path(__file__).resolve().parents[1]
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
@@ -0,0 +1,114 @@
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("pydantic_settings")
+
+from app.core import circuit_breaker  # noqa: E402
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+def _breaker(**kwargs):
+    options = dict(
+        window=4, min_calls=4, failure_rate=0.5, slow_call_seconds=10, slow_call_rate=0.5, open_seconds=30
+    )
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+def _call(breaker, clock=None, fail=False, seconds=0.0):
+    with breaker.guard():
+        if clock is not None:
+            clock.now += seconds
+        if fail:
+            raise ValueError("router down")
+
+
+def _fail(breaker):
+    with pytest.raises(ValueError):
+        _call(breaker, fail=True)
+
+
+def test_opens_at_failure_rate(clock):
+    breaker = _breaker()
+    _call(breaker)
+    _fail(breaker)
+    _call(breaker)
+    assert breaker.state == CLOSED
+    _fail(breaker)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        _call(breaker)
+
+
+def test_stays_closed_below_min_calls(clock):
+    breaker = _breaker()
+    for _ in range(3):
+        _fail(breaker)
+    assert breaker.state == CLOSED
+
+
+def test_opens_on_slow_calls(clock):
+    breaker = _breaker()
+    _call(breaker, clock, seconds=1)
+    _call(breaker, clock, seconds=1)
+    _call(breaker, clock, seconds=12)
+    _call(breaker, clock, seconds=12)
+    assert breaker.state == OPEN
+
+
+def test_responded_bounds_latency(clock):
+    breaker = _breaker(min_calls=1, window=1)
+    with breaker.guard() as call:
+        clock.now += 1
+        call.responded()
+        clock.now += 60  # streaming the rest of the response
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_success_closes(clock):
+    breaker = _breaker(min_calls=1, window=1)
+    _fail(breaker)
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    with breaker.guard():
+        # Only the probe is admitted
+        with pytest.raises(CircuitOpenError):
+            _call(breaker)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_failure_reopens(clock):
+    breaker = _breaker(min_calls=1, window=1)
+    _fail(breaker)
+    clock.now += 30
+    _fail(breaker)
+    assert breaker.state == OPEN
+
+
+def test_caller_failures_do_not_count(clock):
+    breaker = _breaker(min_calls=1, window=1, is_failure=lambda exc: False)
+    _fail(breaker)
+    assert breaker.snapshot() == {"state": CLOSED, "calls": 1, "failures": 0, "slow_calls": 0}
+
+
+def test_cancelled_calls_are_not_recorded(clock):
+    breaker = _breaker(min_calls=1, window=1)
+    with pytest.raises(KeyboardInterrupt):
+        with breaker.guard():
+            raise KeyboardInterrupt
+    assert breaker.snapshot()["calls"] == 0
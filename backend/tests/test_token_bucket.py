@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("sqlalchemy")
+
+from app.core import ai_summary_batches  # noqa: E402
+from app.core.ai_summary_batches import TokenBucket  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ai_summary_batches.time, "monotonic", clock)
+    return clock
+
+
+def _stopped():
+    stop = threading.Event()
+    stop.set()
+    return stop
+
+
+def test_starts_full_and_drains(clock):
+    bucket = TokenBucket(rate=1.0, capacity=5)
+    assert bucket.acquire(5)
+    assert not bucket.acquire(1, stop=_stopped())
+
+
+def test_refills_at_rate_up_to_capacity(clock):
+    bucket = TokenBucket(rate=2.0, capacity=5)
+    assert bucket.acquire(5)
+    clock.now += 1
+    assert bucket.acquire(2, stop=_stopped())
+    assert not bucket.acquire(1, stop=_stopped())
+    clock.now += 3600
+    assert bucket.acquire(5, stop=_stopped())
+    assert not bucket.acquire(1, stop=_stopped())
+
+
+def test_requests_larger_than_capacity_are_capped(clock):
+    bucket = TokenBucket(rate=1.0, capacity=3)
+    assert bucket.acquire(10, stop=_stopped())
+
+
+def test_waits_for_refill(clock, monkeypatch):
+    bucket = TokenBucket(rate=0.5, capacity=1)
+    assert bucket.acquire()
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(ai_summary_batches.time, "sleep", sleep)
+    assert bucket.acquire()
+    assert waits == [pytest.approx(2.0)]
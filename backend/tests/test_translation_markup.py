@@ -0,0 +1,63 @@
+from app.ml.translation_markup import (
+    BOLD_CLOSE,
+    BOLD_OPEN,
+    MarkupPlan,
+    extract_markup,
+    normalize_title,
+    restore_bold,
+)
+
+LINES = [
+    "**Progress Summary**",
+    "**Goals:** improve articulation",
+    "# Recommendations",
+    "• Practice **daily** at home",
+    "1. Use picture cards",
+    "Overall attention has improved.",
+    "---",
+]
+
+
+def _no_lookup(title):
+    return None
+
+
+def test_identity_translation_round_trips_title_list_and_bold():
+    plan = MarkupPlan(LINES, _no_lookup)
+    rebuilt = [plan.rebuild(idx, plan.inputs) for idx in range(len(plan))]
+    assert rebuilt == LINES
+
+
+def test_markup_stays_out_of_model_inputs():
+    plan = MarkupPlan(LINES, _no_lookup)
+    assert "Progress Summary" in plan.inputs
+    assert f"Practice {BOLD_OPEN}daily{BOLD_CLOSE} at home" in plan.inputs
+    assert not any("**" in text or "•" in text or text.startswith("#") for text in plan.inputs)
+
+
+def test_glossary_titles_skip_the_model():
+    titles = {"progress summary": "പുരോഗതി സംഗ്രഹം"}
+    plan = MarkupPlan(LINES[:1], lambda title: titles.get(normalize_title(title)))
+    assert plan.inputs == []
+    assert plan.rebuild(0, []) == "**പുരോഗതി സംഗ്രഹം**"
+
+
+def test_translated_bold_is_restored():
+    plan = MarkupPlan(["- Practice **daily** at home"], _no_lookup)
+    assert plan.rebuild(0, [f"വീട്ടിൽ {BOLD_OPEN} ദിവസവും {BOLD_CLOSE} പരിശീലിക്കുക"]) == "- വീട്ടിൽ **ദിവസവും** പരിശീലിക്കുക"
+
+
+def test_lost_sentinel_drops_bold():
+    assert restore_bold(f"{BOLD_OPEN}daily practice") == "daily practice"
+    assert restore_bold(f"{BOLD_CLOSE}daily{BOLD_OPEN} practice") == "daily practice"
+
+
+def test_guillemets_in_source_are_not_used_as_sentinels():
+    assert extract_markup("He said «stop» **now**") == [("text", "He said «stop» now")]
+
+
+def test_translated_titles_are_reported_for_caching():
+    plan = MarkupPlan(["## Home Program", "Keep going."], _no_lookup)
+    translated = [f"<{text}>" for text in plan.inputs]
+    assert plan.translated_titles(translated) == {"Home Program": "<Home Program>"}
+    assert plan.rebuild(0, translated) == "## <Home Program>"
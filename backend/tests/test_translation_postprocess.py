@@ -0,0 +1,66 @@
+import json
+import os
+
+from app.ml import translation_postprocess
+from app.ml.translation_postprocess import GlossaryPostprocessor, get_postprocessor
+
+
+def _processor(**kwargs):
+    return GlossaryPostprocessor(
+        "xx",
+        terms=kwargs.get("terms", {}),
+        phrase_fixes=kwargs.get("phrase_fixes", []),
+        section_titles=kwargs.get("section_titles"),
+    )
+
+
+def test_longest_term_wins():
+    processor = _processor(terms={"speech": "S", "speech therapy": "ST"})
+    assert processor.apply("speech therapy and speech") == "ST and S"
+
+
+def test_whitespace_is_collapsed_inside_and_between_terms():
+    processor = _processor(terms={"speech therapy": "ST"})
+    assert processor.apply("a  speech \t therapy\tb") == "a ST b"
+
+
+def test_regex_fix_takes_priority_over_terms():
+    processor = _processor(
+        terms={"good": "fine"},
+        phrase_fixes=[
+            {"name": "very", "pattern": "very (?:good|fine)", "replacement": "excellent", "regex": True},
+            {"name": "literal", "pattern": "okay", "replacement": "fine"},
+        ],
+    )
+    assert processor.apply("very good, good, okay") == "excellent, fine, fine"
+    assert processor.fix_count == 2
+
+
+def test_lookup_title_is_normalized():
+    processor = _processor(section_titles={"Progress Summary": "പുരോഗതി"})
+    assert processor.lookup_title("  progress   SUMMARY:") == "പുരോഗതി"
+    assert processor.lookup_title("Other") is None
+
+
+def test_empty_text_is_returned_unchanged():
+    assert _processor(terms={"a": "b"}).apply("") == ""
+
+
+def test_get_postprocessor_reloads_changed_glossary(tmp_path, monkeypatch):
+    monkeypatch.setattr(translation_postprocess, "GLOSSARY_DIR", str(tmp_path))
+    monkeypatch.setattr(translation_postprocess, "_cache", {})
+    path = tmp_path / "xx.json"
+    path.write_text(json.dumps({"terms": {"cat": "dog"}}), encoding="utf-8")
+    assert get_postprocessor("xx").apply("cat") == "dog"
+    assert get_postprocessor("xx") is get_postprocessor("xx")
+
+    path.write_text(json.dumps({"terms": {"cat": "cow"}}), encoding="utf-8")
+    mtime = os.path.getmtime(path) + 10
+    os.utime(path, (mtime, mtime))
+    assert get_postprocessor("xx").apply("cat") == "cow"
+    assert get_postprocessor("missing") is None
+
+
+def test_shipped_glossaries_compile():
+    for language, term_count in translation_postprocess.reload_glossaries().items():
+        assert term_count > 0, language
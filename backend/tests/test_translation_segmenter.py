@@ -0,0 +1,64 @@
+from app.ml.translation_segmenter import (
+    SEGMENT_MIN_CHARS,
+    length_sorted_order,
+    rejoin_line,
+    restore_terminal_punctuation,
+    segment_lines,
+    split_sentences,
+)
+
+PADDING = " The session continued with turn-taking games and picture naming tasks."
+
+
+def _long(text):
+    # Lines shorter than SEGMENT_MIN_CHARS are never split
+    while len(text) < SEGMENT_MIN_CHARS:
+        text += PADDING
+    return text
+
+
+def _sentences(line):
+    return [sentence for sentence, _ in split_sentences(line)]
+
+
+def test_short_line_is_one_segment():
+    assert split_sentences("Good progress. Continue practice.") == [("Good progress. Continue practice.", "")]
+
+
+def test_split_round_trips_original_spacing():
+    line = _long("First sentence here.  Second one follows!\tThird?")
+    pieces = split_sentences(line)
+    assert len(pieces) > 2
+    assert "".join(sentence + separator for sentence, separator in pieces) == line
+
+
+def test_sentences_ending_in_numbers_are_split():
+    line = _long("Reached level 3. Score improved to 4.5. Next session focuses on articulation.")
+    sentences = _sentences(line)
+    assert sentences[0] == "Reached level 3."
+    assert sentences[1] == "Score improved to 4.5."
+    assert sentences[2].startswith("Next session")
+
+
+def test_abbreviations_and_initials_do_not_split():
+    line = _long("Seen by Dr. Rao for approx. 20 mins, e.g. naming tasks. Reviewed by J.K. Menon today.")
+    sentences = _sentences(line)
+    assert sentences[0] == "Seen by Dr. Rao for approx. 20 mins, e.g. naming tasks."
+    assert sentences[1] == "Reviewed by J.K. Menon today."
+
+
+def test_segment_lines_layout_rebuilds_each_line():
+    contents = ["Short line.", _long("One. Two.")]
+    segments, layout = segment_lines(contents)
+    assert [segments[idx] for idx, _ in layout[0]] == ["Short line."]
+    assert rejoin_line(layout[1], segments, segments) == contents[1]
+
+
+def test_restore_terminal_punctuation():
+    assert restore_terminal_punctuation("Well done.", "നന്നായി") == "നന്നായി."
+    assert restore_terminal_punctuation("Well done.", "बहुत अच्छा।") == "बहुत अच्छा।"
+    assert restore_terminal_punctuation("No ending", "text") == "text"
+
+
+def test_length_sorted_order():
+    assert length_sorted_order([["a", "b", "c"], ["a"], ["a", "b"]]) == [1, 2, 0]
@@ -2,6 +2,10 @@ import React, { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 import axios from "axios";
 
+// Language parent reports are read in. The backend pre-translates sent reports
+// into NOTIFICATION_TRANSLATION_LANGUAGES; keep the default in sync with it.
+const REPORT_TRANSLATION_LANGUAGE = process.env.REACT_APP_REPORT_TRANSLATION_LANGUAGE || "mal_Mlym";
+
 const StudentViewPage = () => {
   const navigate = useNavigate();
   const [student, setStudent] = useState(null);
@@ -59,12 +63,18 @@ const StudentViewPage = () => {
     }
   };
 
-  const handleTranslateReport = async (reportId, summaryText) => {
+  const handleTranslateReport = async (reportId, summaryText, pretranslated) => {
     if (!summaryText || summaryText.trim() === "") {
       alert("No summary text to translate");
       return;
     }
 
+    // Reports are pre-translated in the background when they are sent
+    if (pretranslated) {
+      setTranslatedReports(prev => ({ ...prev, [reportId]: pretranslated }));
+      return;
+    }
+
     try {
       setTranslatingReports(prev => ({ ...prev, [reportId]: true }));
 
@@ -82,7 +92,7 @@ const StudentViewPage = () => {
         },
         body: JSON.stringify({
           text: summaryText,
-          target_language: "mal_Mlym",
+          target_language: REPORT_TRANSLATION_LANGUAGE,
           source_language: "eng_Latn",
         }),
       });
@@ -187,6 +197,7 @@ const StudentViewPage = () => {
 
       const baseUrl = process.env.REACT_APP_API_BASE_URL || "http://localhost:8000";
       const response = await axios.get(`${baseUrl}/api/v1/notifications/my-notifications`, {
+        params: { language: REPORT_TRANSLATION_LANGUAGE },
         headers: {
           Authorization: `Bearer ${token}`,
         },
@@ -1416,7 +1427,7 @@ const StudentViewPage = () => {
                                     </button>
                                   )}
                                   <button
-                                    onClick={() => handleTranslateReport(notification.id, notification.report_summary)}
+                                    onClick={() => handleTranslateReport(notification.id, notification.report_summary, notification.translated_summary)}
                                     disabled={translatingReports[notification.id]}
                                     className="px-3 py-1 text-xs font-medium text-white bg-[#E38B52] rounded-lg hover:bg-[#D67A3F] disabled:opacity-50 disabled:cursor-not-allowed transition-all duration-200 flex items-center gap-1.5 shadow-sm hover:shadow-md"
                                     title="Translate to Malayalam"